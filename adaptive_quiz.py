@@ -0,0 +1,127 @@
+import math
+import random
+from quiz_engine import QuizSession, OPTION_ORDERS
+from quiz_data import fetch_all
+
+# --- Configuration ---
+MAX_DIFFICULTY = 4.0 # Difficulties and abilities are logits, clipped to +/- this
+BUCKET_WIDTH = 0.25 # Logit width of one difficulty bucket
+ABILITY_STEP = 0.6 # Elo K-factor: how far one answer moves the taker's ability estimate
+RANDOM_PROBES = 4 # Random picks tried in a bucket before scanning it for an unused question
+
+
+def difficulty_from_stats(responses, correct):
+    """ Rasch difficulty (logit of answering wrong) from recorded counts, smoothed so new questions start near 0 """
+    difficulty = math.log((responses - correct + 1) / (correct + 1))
+    return max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, difficulty))
+
+
+def success_probability(ability, difficulty):
+    """ Rasch model: chance that a taker of `ability` answers a question of `difficulty` correctly """
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+# --- Difficulty Index ---
+class DifficultyIndex:
+    """
+    A topic's questions grouped into fixed-width difficulty buckets, built once per quiz start.
+    pick() looks at the bucket matching the taker's ability and then at its neighbours, trying a few random
+    members of each, so its cost depends on the quiz length, not on the topic size.
+    """
+    def __init__(self, questions, difficulties):
+        self.questions = list(questions); self.difficulties = list(difficulties)
+        self.buckets = [[] for _ in range(self._bucket_of(MAX_DIFFICULTY) + 1)] # Question positions per bucket
+        for position, difficulty in enumerate(self.difficulties): self.buckets[self._bucket_of(difficulty)].append(position)
+
+    @staticmethod
+    def _bucket_of(value):
+        return int(round((max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, value)) + MAX_DIFFICULTY) / BUCKET_WIDTH))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def pick(self, ability, used, rng=random):
+        """
+        Position of an unused question whose difficulty is closest to `ability` (random within a bucket).
+        :param used: set of positions already served in this session
+        :return: position, or None if every question has been used
+        """
+        start = self._bucket_of(ability)
+        for offset in range(len(self.buckets)):
+            for bucket_number in ((start,) if offset == 0 else (start + offset, start - offset)):
+                if not 0 <= bucket_number < len(self.buckets): continue
+                bucket = self.buckets[bucket_number]
+                if len(bucket) <= len(used) + RANDOM_PROBES: # Small bucket: scanning it is as cheap as probing
+                    for position in bucket:
+                        if position not in used: return position
+                    continue
+                for _ in range(RANDOM_PROBES):
+                    position = bucket[rng.randrange(len(bucket))]
+                    if position not in used: return position
+                for position in bucket:
+                    if position not in used: return position
+        return None
+
+
+def load_difficulty_index(db, topic_id):
+    """
+    Difficulty index of a topic: questions from db.question_cache, difficulties from ItemStats.
+    Questions nobody has answered yet get difficulty 0 (average).
+    """
+    questions = db.question_cache.get_topic(topic_id)
+    with db.reader() as conn:
+        stats = {row[0]: (row[1], row[2]) for row in fetch_all(conn, 'topic_item_stats', (topic_id,))}
+    return DifficultyIndex(questions, (difficulty_from_stats(*stats.get(question.id, (0, 0))) for question in questions))
+
+
+# --- Adaptive Session ---
+class AdaptiveQuizSession(QuizSession):
+    """
+    One-question-at-a-time quiz that chooses each next question as it goes: the taker's ability is an
+    Elo-style running estimate, and the next question is the unused one whose difficulty is closest to it
+    (where a correct answer is about 50% likely). Answers and grading behave like QuizSession;
+    session.questions holds the questions served so far. Only one-at-a-time answering (check_answer) is
+    supported: select_answer() raises RuntimeError, since later questions depend on earlier answers.
+    replay() returns a plain, non-adaptive QuizSession over the questions served in this session, in the
+    same order and with the same option orders, so a retake asks exactly the same quiz.
+    """
+    def __init__(self, index, length=None, topic_name="", ability=0.0, rng=None, shuffle_options=False, seed=None):
+        """
+        :param index: DifficultyIndex of the topic
+        :param length: number of questions to ask (None or more than the topic: all of them)
+        :param ability: starting ability estimate in logits (0 = average)
+        """
+        super().__init__([], topic_name, shuffle_options=shuffle_options, seed=seed)
+        self.index = index; self.ability = ability; self.rng = rng or random.Random()
+        self.length = len(index) if length is None else min(length, len(index))
+        self._used = set() # Index positions served so far
+        self.difficulties = [] # Difficulty of each served question
+        if self.seed is not None: # Orders are drawn as questions are served, in the order QuizSession would draw them
+            self.option_orders = bytearray(); self._order_rng = random.Random(self.seed)
+        self._serve_next()
+
+    def __len__(self):
+        return self.length
+
+    def _serve_next(self):
+        position = self.index.pick(self.ability, self._used, self.rng) if len(self.questions) < self.length else None
+        if position is None: self.length = len(self.questions); return # Topic exhausted
+        self._used.add(position); self.difficulties.append(self.index.difficulties[position])
+        self.questions.append(self.index.questions[position]); self.answers.append(""); self.answered_at.append(None)
+        if self.option_orders is not None: self.option_orders.append(self._order_rng.randrange(len(OPTION_ORDERS)))
+
+    def check_answer(self, letter):
+        """ As QuizSession.check_answer, and moves the ability estimate towards the result """
+        expected = success_probability(self.ability, self.difficulties[self.current_index])
+        is_correct, correct_letter = super().check_answer(letter)
+        self.ability = max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, self.ability + ABILITY_STEP * (is_correct - expected)))
+        return is_correct, correct_letter
+
+    def next_question(self):
+        """ Move on, choosing the next question from the updated ability estimate """
+        self.current_index += 1
+        if self.current_index >= len(self.questions) and not self.finished: self._serve_next()
+        return not self.finished
+
+    def select_answer(self, index, letter):
+        raise RuntimeError("Adaptive quizzes are answered one question at a time (check_answer), not all at once.")
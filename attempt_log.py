@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+import time
+from item_stats import apply_item_stats
+from quiz_data import execute, execute_many
+
+# --- Configuration ---
+FLUSH_INTERVAL_SECONDS = 2.0 # Pending attempts are written at least this often
+FLUSH_BATCH_RESPONSES = 5000 # ...or as soon as this many responses are waiting
+
+
+# --- Attempt Log ---
+class AttemptLog:
+    """
+    Records finished quizzes (Attempts) and every question shown in them (Responses).
+    submit() only copies the session's results into an in-memory buffer, so finishing a quiz never
+    waits on the database. A background thread writes the buffer through DatabaseManager.write():
+    every attempt waiting at that moment, with all its responses and their ItemStats updates, in a single transaction.
+    It flushes every FLUSH_INTERVAL_SECONDS, early once FLUSH_BATCH_RESPONSES are waiting, and on close().
+    """
+    def __init__(self, db, flush_interval=FLUSH_INTERVAL_SECONDS, batch_responses=FLUSH_BATCH_RESPONSES):
+        self.db = db; self.flush_interval = flush_interval; self.batch_responses = batch_responses
+        self._pending = [] # (attempt row, [response rows without attempt_id])
+        self._pending_responses = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # One flush at a time (timer thread vs. close())
+        self._wake = threading.Event()
+        self._thread = None # Started by the first submit(), so scripts that never record pay nothing
+        self._closed = False
+        self.attempts_written = 0; self.responses_written = 0; self.flushes = 0; self.attempts_dropped = 0
+
+    def submit(self, session, topic_id=None):
+        """
+        Queue a finished quiz_engine.QuizSession for writing. Unanswered questions are recorded with answer NULL.
+        :param topic_id: topic of the quiz (defaults to the first question's topic)
+        """
+        if not session.questions: return
+        if topic_id is None: topic_id = session.questions[0].topic_id
+        attempt = (topic_id, session.started_at, time.time(), len(session), session.score, session.seed)
+        responses = [(position, question.id, answer or None, question.is_correct(answer), answered_at)
+                     for position, (question, answer, answered_at)
+                     in enumerate(zip(session.questions, session.answers, session.answered_at))]
+        with self._lock:
+            if self._closed: raise RuntimeError("AttemptLog is closed.")
+            self._pending.append((attempt, responses)); self._pending_responses += len(responses)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="attempt-log", daemon=True)
+                self._thread.start()
+            if self._pending_responses >= self.batch_responses: self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval); self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything pending in one transaction.
+        If the database is busy or unavailable (OperationalError) the batch stays queued for the next flush.
+        If the batch violates a constraint, its attempts are written one at a time and the bad ones are dropped,
+        so one broken attempt never holds up the others.
+        :return: number of attempts written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending; self._pending = []; self._pending_responses = 0
+            if not batch: return 0
+            try:
+                response_count = self._write(batch)
+            except sqlite3.OperationalError as e:
+                print(f"Error saving {len(batch)} quiz attempts (will retry): {e}")
+                self._requeue(batch)
+                return 0
+            except sqlite3.Error as e:
+                print(f"Error saving {len(batch)} quiz attempts ({e}); saving them one at a time.")
+                return self._write_one_by_one(batch)
+            self.attempts_written += len(batch); self.responses_written += response_count; self.flushes += 1
+            return len(batch)
+
+    def _write(self, batch):
+        """ Insert a batch of attempts, their responses and ItemStats updates in one transaction; returns the response count """
+        with self.db.write() as conn:
+            cursor = conn.cursor(); response_rows = []
+            for attempt, responses in batch:
+                attempt_id = execute(cursor, 'insert_attempt', attempt).lastrowid
+                response_rows.extend((attempt_id, *response) for response in responses)
+            execute_many(cursor, 'insert_response', response_rows)
+            apply_item_stats(cursor, batch) # One upsert per distinct question in the batch
+        return len(response_rows)
+
+    def _write_one_by_one(self, batch):
+        written = 0
+        for position, item in enumerate(batch):
+            try:
+                self.responses_written += self._write([item])
+            except sqlite3.OperationalError as e:
+                print(f"Error saving quiz attempts (will retry): {e}")
+                self._requeue(batch[position:])
+                break
+            except sqlite3.Error as e:
+                print(f"Dropping quiz attempt (topic {item[0][0]}, {len(item[1])} responses): {e}")
+                self.attempts_dropped += 1
+                continue
+            written += 1
+        self.attempts_written += written; self.flushes += 1
+        return written
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._pending[:0] = batch; self._pending_responses += sum(len(responses) for _, responses in batch)
+
+    @property
+    def pending(self):
+        """ Number of attempts waiting to be written """
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """ Stop the flush thread and write whatever is still pending """
+        with self._lock:
+            self._closed = True; thread = self._thread
+        self._wake.set()
+        if thread is not None: thread.join()
+        self.flush()
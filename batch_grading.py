@@ -0,0 +1,165 @@
+import sqlite3
+import os
+import argparse
+import csv
+import time
+from array import array
+from db_connection import connect
+from question import OPTION_LETTERS
+from quiz_data import fetch_all
+from quiz_engine import PASS_THRESHOLD
+
+try:
+    import numpy as np # Optional: grades with array operations when installed
+except ImportError:
+    np = None
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+BLANK = 255 # Code of an unanswered (or unreadable) response; never equal to a key entry
+# bytes.translate() table: 'A'-'E' / 'a'-'e' -> 0-4, anything else (' ', '-', '*', '?') -> BLANK
+LETTER_CODES = bytes(OPTION_LETTERS.index(chr(c).upper()) if chr(c).upper() in OPTION_LETTERS else BLANK for c in range(256))
+
+# Answer sheets are graded as one (takers x questions) matrix of option codes, kept as a single bytes
+# object (row-major). With numpy the matrix is compared with the key in one operation; without it, each
+# taker's row is XOR-ed with the key as one big integer (matching positions become zero bytes) and each
+# question's column is a strided slice, so the Python-level work is one step per taker and per question
+# instead of one per response.
+
+
+# --- Answer Key ---
+def load_answer_key(conn, topic_id):
+    """
+    Answer key of a topic in question id order (the column order of an answer sheet).
+    :return: (list of question ids, key) where key holds option indexes 0-4:
+             a numpy uint8 array when numpy is installed, else bytes
+    """
+    rows = fetch_all(conn, 'topic_answer_key', (topic_id,))
+    key = bytes(OPTION_LETTERS.index(row[1]) for row in rows)
+    return [row[0] for row in rows], (np.frombuffer(key, dtype=np.uint8) if np is not None else key)
+
+
+def encode_sheets(sheets, question_count):
+    """
+    Pack answer sheets into a row-major bytes matrix of option codes.
+    :param sheets: iterable of answer strings, one character per question ('A'-'E'; anything else is blank).
+                   Short sheets are padded with blanks; extra characters are ignored.
+    :return: (bytes matrix, number of sheets)
+    """
+    rows = [sheet.encode('ascii', 'replace')[:question_count].ljust(question_count, b' ').translate(LETTER_CODES) for sheet in sheets]
+    return b''.join(rows), len(rows)
+
+
+# --- Grading ---
+class GradeReport:
+    """ Results of grading a batch of answer sheets against one key """
+    __slots__ = ('question_ids', 'scores', 'question_count', 'question_correct')
+
+    def __init__(self, question_ids, scores, question_count, question_correct):
+        self.question_ids = question_ids
+        self.scores = scores # Correct answers per taker (numpy array or array('H'))
+        self.question_count = question_count
+        self.question_correct = question_correct # Takers answering each question correctly
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def percentages(self):
+        if not self.question_count: return [0.0] * len(self.scores) # Empty key: nothing to score
+        if np is not None and isinstance(self.scores, np.ndarray): return self.scores * (100.0 / self.question_count)
+        return [score * 100.0 / self.question_count for score in self.scores]
+
+    @property
+    def passed(self):
+        """ Pass/fail per taker, against quiz_engine.PASS_THRESHOLD (as QuizSession.passed) """
+        if np is not None and isinstance(self.scores, np.ndarray): return self.percentages >= PASS_THRESHOLD
+        return [percentage >= PASS_THRESHOLD for percentage in self.percentages]
+
+    @property
+    def question_rates(self):
+        """ Share of takers answering each question correctly (classical p-value), in key order """
+        takers = len(self.scores)
+        return [correct / takers if takers else None for correct in self.question_correct]
+
+
+def grade_sheets(key, sheets, question_ids=None, use_numpy=None):
+    """
+    Grade a whole batch of answer sheets at once.
+    :param key: answer key from load_answer_key() (numpy array, bytes, or a sequence of option indexes 0-4)
+    :param sheets: answer strings (see encode_sheets()), or a numpy (takers x questions) array of option codes
+    :param use_numpy: force (True) or avoid (False) numpy; default: use it if installed
+    :return: GradeReport
+    :raises ValueError: if the key is empty (the topic has no questions)
+    """
+    question_count = len(key)
+    if question_count == 0: raise ValueError("The answer key is empty; the topic has no questions.")
+    if use_numpy is None: use_numpy = np is not None
+    elif use_numpy and np is None: raise RuntimeError("numpy is not installed.")
+    if use_numpy:
+        key = np.frombuffer(key, dtype=np.uint8) if isinstance(key, (bytes, bytearray)) else np.asarray(key, dtype=np.uint8)
+        if not isinstance(sheets, np.ndarray):
+            matrix, takers = encode_sheets(sheets, question_count)
+            sheets = np.frombuffer(matrix, dtype=np.uint8).reshape(takers, question_count)
+        correct = sheets == key # (takers x questions) booleans
+        return GradeReport(question_ids, correct.sum(axis=1), question_count, correct.sum(axis=0).tolist())
+
+    key = bytes(key)
+    if np is not None and isinstance(sheets, np.ndarray):
+        matrix, takers = sheets.astype(np.uint8).tobytes(), len(sheets)
+    else:
+        matrix, takers = encode_sheets(sheets, question_count)
+    key_bits = int.from_bytes(key, 'big')
+    scores = array('H', ((int.from_bytes(matrix[start:start + question_count], 'big') ^ key_bits).to_bytes(question_count, 'big').count(0)
+                         for start in range(0, takers * question_count, question_count)))
+    question_correct = [matrix[i::question_count].count(key[i]) for i in range(question_count)] if takers else [0] * question_count
+    return GradeReport(question_ids, scores, question_count, question_correct)
+
+
+def grade_topic(conn, topic_id, sheets, use_numpy=None):
+    """ load_answer_key() and grade_sheets() in one call """
+    question_ids, key = load_answer_key(conn, topic_id)
+    return grade_sheets(key, sheets, question_ids, use_numpy)
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Grade scanned answer sheets against a topic's answer key.")
+    parser.add_argument('sheets', help="CSV file of 'taker,answers' rows; answers has one letter per question, in question id order.")
+    parser.add_argument('--topic-id', type=int, required=True)
+    parser.add_argument('--db', default=DATABASE_FILE, help=f"SQLite database file (default: {DATABASE_FILE}).")
+    parser.add_argument('--out', help="Write 'taker,score,percentage,passed' rows to this CSV file.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database file '{args.db}' not found.")
+    else:
+        conn = None
+        try:
+            conn = connect(args.db, read_only=True)
+            question_ids, key = load_answer_key(conn, args.topic_id)
+            if not question_ids:
+                raise ValueError(f"Topic {args.topic_id} has no questions.")
+            with open(args.sheets, newline='', encoding='utf-8') as f:
+                rows = [row for row in csv.reader(f) if row]
+            start = time.perf_counter()
+            report = grade_sheets(key, [row[1] if len(row) > 1 else "" for row in rows], question_ids)
+            elapsed = time.perf_counter() - start
+            passed = sum(bool(value) for value in report.passed)
+            print(f"Graded {len(report)} sheets x {report.question_count} questions in {elapsed * 1000:.1f} ms "
+                  f"({'numpy' if np is not None else 'pure Python'}).")
+            if len(report):
+                print(f"Mean score: {sum(report.percentages) / len(report):.1f}%. Passed: {passed} ({passed / len(report):.0%}).")
+                hardest = sorted(zip(report.question_rates, report.question_ids))[:5]
+                print("Hardest questions: " + ", ".join(f"ID {question_id} ({rate:.0%})" for rate, question_id in hardest))
+            if args.out:
+                with open(args.out, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['taker', 'score', 'percentage', 'passed'])
+                    writer.writerows((row[0], int(score), f"{percentage:.1f}", bool(passed_flag))
+                                     for row, score, percentage, passed_flag in zip(rows, report.scores, report.percentages, report.passed))
+                print(f"Results written to '{args.out}'.")
+        except (sqlite3.Error, OSError, ValueError) as e:
+            print(f"Error grading sheets: {e}")
+        finally:
+            if conn: conn.close()
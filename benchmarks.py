@@ -0,0 +1,691 @@
+import sqlite3
+import os
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from schema_migrations import SQL_CREATE_TOPICS_TABLE, SQL_CREATE_QUESTIONS_TABLE, apply_schema
+
+# --- Configuration ---
+BENCH_TOPICS = 100 # Many courses; the index matters most when a topic is a small slice of the bank
+DEFAULT_SIZES = [1000, 10000, 100000]
+REPEATS = 20 # Timed runs per measurement (median is reported)
+VOCABULARY_SIZE = 5000 # Distinct words used for synthetic question text
+
+# Queries as they are run by the apps
+SQL_TOPIC_QUESTIONS = """SELECT id, topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer
+                         FROM Questions WHERE topic_id = ? ORDER BY id"""
+SQL_TOPIC_LIST = "SELECT id, question_text FROM Questions WHERE topic_id = ? ORDER BY id"
+
+
+# --- Helpers ---
+def build_bench_database(db_file, question_count, topic_count=BENCH_TOPICS, seed=1):
+    """
+    Create a database with the app schema and question_count synthetic questions,
+    spread randomly over topic_count topics (so a topic's rows are interleaved, as after years of edits).
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice('bcdfghklmnprstvw')}{rng.choice('aeiou')}{rng.choice('lmnrst')}{i}" for i in range(VOCABULARY_SIZE)]
+    conn = sqlite3.connect(db_file)
+    conn.execute(SQL_CREATE_TOPICS_TABLE)
+    conn.execute(SQL_CREATE_QUESTIONS_TABLE)
+    apply_schema(conn, verbose=False)
+    conn.executemany("INSERT INTO Topics(name) VALUES(?)", [(f"Topic {i + 1}",) for i in range(topic_count)])
+    def words(count):
+        return " ".join(rng.choice(vocabulary) for _ in range(count))
+    rows = ((rng.randint(1, topic_count), f"Question {i}: {words(rng.randint(6, 20))}?",
+             words(3), words(3), words(3), words(3), words(3), "ABCDE"[i % 5])
+            for i in range(question_count))
+    conn.executemany("""INSERT INTO Questions(topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer)
+                        VALUES(?,?,?,?,?,?,?,?)""", rows)
+    conn.commit()
+    return conn
+
+def time_call(func, repeats=REPEATS):
+    """ Median wall time of func() in milliseconds """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+# --- Benchmarks ---
+def bench_topic_load(sizes, topic_count=BENCH_TOPICS):
+    """ Topic-load latency vs. bank size, with and without the (topic_id, id) index """
+    print(f"Bank spread over {topic_count} topics; timing one topic (median of {REPEATS} runs).")
+    print(f"{'questions':>10} | {'query':<14} | {'indexed ms':>10} | {'no index ms':>11} | {'speedup':>7}")
+    print("-" * 66)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size, topic_count)
+            for label, sql in (("full questions", SQL_TOPIC_QUESTIONS), ("admin list", SQL_TOPIC_LIST)):
+                indexed = time_call(lambda: conn.execute(sql, (1,)).fetchall())
+                conn.execute("DROP INDEX idx_questions_topic_id")
+                unindexed = time_call(lambda: conn.execute(sql, (1,)).fetchall())
+                conn.execute("CREATE INDEX idx_questions_topic_id ON Questions(topic_id, id)")
+                print(f"{size:>10} | {label:<14} | {indexed:>10.2f} | {unindexed:>11.2f} | {unindexed / indexed:>6.1f}x")
+            conn.close()
+
+
+def bench_admin_list(sizes, topic_count=1):
+    """ Opening a topic in the admin list: full fetch (old behaviour) vs. the first keyset page """
+    from main_quiz_admin import fetch_question_page, ADMIN_PAGE_SIZE # Imports tkinter, so only when needed
+    print(f"One topic holding the whole bank; page size {ADMIN_PAGE_SIZE} (median of {REPEATS} runs).")
+    print(f"{'questions':>10} | {'full list ms':>12} | {'first page ms':>13} | {'page deep in topic ms':>21}")
+    print("-" * 66)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size, topic_count)
+            conn.row_factory = sqlite3.Row
+            full = time_call(lambda: conn.execute(SQL_TOPIC_LIST, (1,)).fetchall())
+            first_page = time_call(lambda: fetch_question_page(conn, 1))
+            deep_page = time_call(lambda: fetch_question_page(conn, 1, after_id=size * 9 // 10))
+            print(f"{size:>10} | {full:>12.2f} | {first_page:>13.3f} | {deep_page:>21.3f}")
+            conn.close()
+
+
+def bench_admin_save(sizes, topic_count=1):
+    """ Per-save cost in the admin panel: re-reading the whole list (old) vs. patching the id model """
+    from types import SimpleNamespace
+    from main_quiz_admin import AdminPanel, QuestionListModel
+    sql_update = "UPDATE Questions SET question_text=? WHERE id=?"
+    print(f"One topic holding the whole bank; UPDATE + list refresh per save (median of {REPEATS} runs).")
+    print(f"{'questions':>10} | {'full reload ms':>14} | {'patched row ms':>14}")
+    print("-" * 46)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size, topic_count)
+            model = QuestionListModel(); model.extend(row[0] for row in conn.execute(SQL_TOPIC_LIST, (1,)))
+            model.complete = True
+            target_id = model.ids[len(model.ids) // 2]
+            rows = [AdminPanel._list_row_text(q_id, "Question") for q_id in model.ids]
+            # The admin panel's own patch step, with a list standing in for the Tk listbox
+            panel = SimpleNamespace(list_model=model, _page_loading=False, _list_row_text=AdminPanel._list_row_text,
+                                    question_listbox=SimpleNamespace(insert=rows.insert, delete=rows.pop))
+
+            def save_and_reload():
+                with conn: conn.execute(sql_update, ("Edited question", target_id))
+                [f"{q_id}: {text[:60]}" for q_id, text in conn.execute(SQL_TOPIC_LIST, (1,)).fetchall()]
+
+            def save_and_patch():
+                with conn: conn.execute(sql_update, ("Edited question", target_id))
+                AdminPanel._patch_saved_row(panel, target_id, "Edited question", 1, target_id)
+
+            print(f"{size:>10} | {time_call(save_and_reload):>14.2f} | {time_call(save_and_patch):>14.3f}")
+            conn.close()
+
+
+def bench_search(sizes):
+    """ Ranked full-text search latency vs. bank size (common word, rare word, two-word prefix query) """
+    from question_search import search_questions
+    print(f"Ranked FTS5 search, top 50 with snippets (median of {REPEATS} runs).")
+    print(f"{'questions':>10} | {'common word ms':>14} | {'rare word ms':>12} | {'two words ms':>12}")
+    print("-" * 58)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size)
+            conn.row_factory = sqlite3.Row
+            # Pick terms from the data itself: the most and least frequent words of a sample
+            counts = {}
+            for (text,) in conn.execute("SELECT question_text FROM Questions LIMIT 5000"):
+                for word in text.rstrip("?").split()[2:]: counts[word] = counts.get(word, 0) + 1
+            common = max(counts, key=counts.get); rare = min(counts, key=counts.get)
+            timings = [time_call(lambda q=q: search_questions(conn, q)) for q in (common, rare, f"{common} {rare[:3]}")]
+            print(f"{size:>10} | {timings[0]:>14.2f} | {timings[1]:>12.2f} | {timings[2]:>12.2f}")
+            conn.close()
+
+
+def bench_dedup(sizes):
+    """ Near-duplicate check before one insert: LSH lookup vs. comparing against every signature, plus full report time """
+    from question_dedup import find_duplicate_pairs, question_signature, estimated_similarity
+    print(f"Pre-insert near-duplicate check (median of {REPEATS} runs) and whole-table report.")
+    print(f"{'questions':>10} | {'LSH check ms':>12} | {'linear scan ms':>14} | {'report s':>8}")
+    print("-" * 54)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size)
+            start = time.perf_counter()
+            _, index = find_duplicate_pairs(conn)
+            report_seconds = time.perf_counter() - start
+            row = conn.execute("SELECT question_text, option_a, option_b, option_c, option_d, option_e FROM Questions WHERE id = 1").fetchone()
+            new_text = row[0] + " (revised)"
+            def lsh_check():
+                index.find_duplicates(question_signature(new_text, row[1:]))
+            def linear_check():
+                signature = question_signature(new_text, row[1:])
+                [key for key, other in index.signatures.items() if estimated_similarity(signature, other) >= index.threshold]
+            print(f"{size:>10} | {time_call(lsh_check):>12.3f} | {time_call(linear_check, repeats=3):>14.1f} | {report_seconds:>8.1f}")
+            conn.close()
+
+
+def bench_sessions(session_counts, questions_per_quiz=50, shuffle_options=False):
+    """ Headless QuizSession throughput: many sessions open at once, answered round-robin, then graded """
+    from quiz_engine import QuizSession
+    from question import Question, OPTION_LETTERS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), questions_per_quiz, topic_count=1)
+        questions = [Question.from_row(row) for row in conn.execute(SQL_TOPIC_QUESTIONS, (1,))]
+        conn.close()
+    rng = random.Random(1)
+    print(f"{len(questions)} questions per quiz, answers chosen at random, options {'shuffled' if shuffle_options else 'in A-E order'} (one run per row).")
+    print(f"{'sessions':>10} | {'one-by-one sessions/s':>21} | {'all-at-once sessions/s':>22} | {'answers/s':>10}")
+    print("-" * 74)
+    for count in session_counts:
+        start = time.perf_counter()
+        sessions = [QuizSession(questions, shuffle=True, rng=rng, shuffle_options=shuffle_options) for _ in range(count)]
+        for _ in range(len(questions)): # Every open session answers its current question, then moves on
+            for session in sessions:
+                session.check_answer(rng.choice(OPTION_LETTERS)); session.next_question()
+        one_by_one = time.perf_counter() - start
+        start = time.perf_counter()
+        sessions = [QuizSession(questions, shuffle=True, rng=rng, shuffle_options=shuffle_options) for _ in range(count)]
+        for index in range(len(questions)):
+            for session in sessions: session.select_answer(index, rng.choice(OPTION_LETTERS))
+        for session in sessions: session.grade()
+        all_at_once = time.perf_counter() - start
+        answers = count * len(questions)
+        print(f"{count:>10} | {count / one_by_one:>21,.0f} | {count / all_at_once:>22,.0f} | {answers / one_by_one:>10,.0f}")
+
+
+def bench_cache(sizes, topic_count=BENCH_TOPICS):
+    """ Quiz start (one topic's questions): uncached read vs. cache hit, including the data_version check """
+    from db_connection import DatabaseManager
+    print(f"Bank spread over {topic_count} topics; median of {REPEATS} runs.")
+    print(f"{'questions':>10} | {'topic rows':>10} | {'disk read ms':>12} | {'cache hit ms':>12} | {'cached MiB':>10}")
+    print("-" * 66)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db")
+            build_bench_database(db_file, size, topic_count).close()
+            db = DatabaseManager(db_file)
+            cache = db.question_cache
+            def cold():
+                cache.invalidate(1); cache.get_topic(1)
+            cold_ms = time_call(cold)
+            rows = len(cache.get_topic(1))
+            print(f"{size:>10} | {rows:>10} | {cold_ms:>12.2f} | {time_call(lambda: cache.get_topic(1)):>12.4f} | {cache.size_bytes / 2**20:>10.2f}")
+            db.close()
+
+
+def bench_sample(sizes, count=20):
+    """ Quiz start of `count` random questions: full topic read vs. sampling the id index (cold and warm) """
+    from db_connection import DatabaseManager
+    print(f"Whole bank in one topic, {count} questions per quiz; median of {REPEATS} runs.")
+    print(f"{'questions':>10} | {'full read ms':>12} | {'cold sample ms':>14} | {'warm sample ms':>14} | {'id index KiB':>12}")
+    print("-" * 74)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db")
+            build_bench_database(db_file, size, topic_count=1).close()
+            db = DatabaseManager(db_file)
+            cache = db.question_cache
+            def full_read():
+                cache.invalidate(1); random.sample(cache.get_topic(1), count)
+            def cold_sample():
+                cache.invalidate(1); cache.sample_topic(1, count)
+            full_ms = time_call(full_read); cold_ms = time_call(cold_sample)
+            cache.invalidate(1); cache.get_topic_ids(1) # Warm: only the id list is cached, not the questions
+            warm_ms = time_call(lambda: cache.sample_topic(1, count))
+            print(f"{size:>10} | {full_ms:>12.2f} | {cold_ms:>14.2f} | {warm_ms:>14.3f} | {cache.size_bytes / 1024:>12.0f}")
+            db.close()
+
+
+def bench_attempts(session_counts, questions_per_quiz=20):
+    """ Sustained responses/sec recorded while many sessions are answered: a commit per response vs. AttemptLog batches """
+    from db_connection import DatabaseManager
+    from quiz_engine import QuizSession
+    from question import Question, OPTION_LETTERS
+    from quiz_data import STATEMENTS
+    print(f"{questions_per_quiz} questions per quiz, sessions answered round-robin (one run per row).")
+    print(f"{'sessions':>10} | {'responses':>10} | {'commit per response/s':>21} | {'batched responses/s':>19} | {'flushes':>7}")
+    print("-" * 80)
+    for count in session_counts:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db")
+            build_bench_database(db_file, questions_per_quiz, topic_count=1).close()
+            db = DatabaseManager(db_file)
+            questions = db.question_cache.get_topic(1)
+            rng = random.Random(1)
+            def run(record_answer, record_attempt):
+                sessions = [QuizSession(questions, shuffle=True, rng=rng) for _ in range(count)]
+                start = time.perf_counter()
+                for _ in range(len(questions)):
+                    for session in sessions:
+                        session.check_answer(rng.choice(OPTION_LETTERS)); record_answer(session)
+                        if not session.next_question(): record_attempt(session)
+                return time.perf_counter() - start
+            # Baseline: the attempt row is created up front and every answer is its own transaction
+            attempt_ids = {}
+            def insert_response(session):
+                index = session.current_index; question = session.questions[index]
+                with db.write() as conn:
+                    if index == 0:
+                        attempt_ids[id(session)] = conn.execute(STATEMENTS['insert_attempt'], (1, session.started_at, session.started_at, len(session), 0, None)).lastrowid
+                    conn.execute(STATEMENTS['insert_response'], (attempt_ids[id(session)], index, question.id, session.answers[index],
+                                                       question.is_correct(session.answers[index]), session.answered_at[index]))
+            per_response = run(insert_response, lambda session: None)
+            batched = run(lambda session: None, db.attempt_log.submit)
+            start = time.perf_counter(); db.attempt_log.flush(); batched += time.perf_counter() - start # Last batch counts too
+            responses = count * len(questions)
+            print(f"{count:>10} | {responses:>10} | {responses / per_response:>21,.0f} | {responses / batched:>19,.0f} | {db.attempt_log.flushes:>7}")
+            db.close()
+
+
+def bench_item_stats(response_counts, question_count=100, questions_per_quiz=20):
+    """ One question's statistics: recomputed from Responses vs. read from the incrementally maintained ItemStats """
+    from db_connection import DatabaseManager
+    from quiz_engine import QuizSession
+    from question import OPTION_LETTERS
+    from item_stats import fetch_item_stats, ItemStatistics
+    recompute_sql = """SELECT COUNT(*), SUM(is_correct), SUM(answer IS NULL), SUM(answer = 'A'), SUM(answer = 'B'), SUM(answer = 'C'),
+                              SUM(answer = 'D'), SUM(answer = 'E'), SUM(rest), SUM(rest * rest), SUM(is_correct * rest)
+                       FROM (SELECT r.answer, r.is_correct, (a.score - r.is_correct) * 1.0 / (a.question_count - 1) AS rest
+                             FROM Responses r JOIN Attempts a ON a.id = r.attempt_id WHERE r.question_id = ?)"""
+    print(f"Responses spread over {question_count} questions, {questions_per_quiz} per attempt; median of {REPEATS} runs.")
+    print(f"{'responses':>10} | {'per question':>12} | {'recompute ms':>12} | {'ItemStats ms':>12} | {'flush ms/1k attempts':>20}")
+    print("-" * 78)
+    for count in response_counts:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db")
+            build_bench_database(db_file, question_count, topic_count=1).close()
+            db = DatabaseManager(db_file)
+            questions = db.question_cache.get_topic(1); rng = random.Random(1)
+            log = db.attempt_log; log.flush_interval = 3600; log.batch_responses = float('inf') # Flush only when told to
+            def submit_attempts(attempt_count):
+                for _ in range(attempt_count):
+                    session = QuizSession(rng.sample(questions, questions_per_quiz))
+                    for index in range(len(session)): session.select_answer(index, rng.choice(OPTION_LETTERS))
+                    session.grade(); log.submit(session)
+            submit_attempts(count // questions_per_quiz); log.flush() # Fill Responses and ItemStats through the normal write path
+            question_id = questions[0].id
+            with db.reader() as conn:
+                recompute_ms = time_call(lambda: ItemStatistics(*conn.execute(recompute_sql, (question_id,)).fetchone()).discrimination)
+                lookup_ms = time_call(lambda: fetch_item_stats(conn, question_id).discrimination)
+            flush_samples = []
+            for _ in range(3):
+                submit_attempts(1000)
+                start = time.perf_counter(); log.flush(); flush_samples.append((time.perf_counter() - start) * 1000)
+            flush_ms = statistics.median(flush_samples)
+            print(f"{count:>10} | {count // question_count:>12} | {recompute_ms:>12.3f} | {lookup_ms:>12.4f} | {flush_ms:>20.1f}")
+            db.close()
+
+
+def bench_adaptive(sizes, quiz_length=50):
+    """ Adaptive next-question pick: difficulty-bucket index vs. a linear scan for the closest unused difficulty """
+    from question import Question
+    from adaptive_quiz import DifficultyIndex, MAX_DIFFICULTY
+    rng = random.Random(1)
+    print(f"Simulated takers answer {quiz_length} questions each; pick times are medians over 20 quizzes (linear scan: 1 above 10000 questions).")
+    print(f"{'questions':>10} | {'build ms':>8} | {'bucket pick us':>14} | {'linear pick us':>14}")
+    print("-" * 56)
+    for size in sizes:
+        questions = [Question(i, 1, f"Question {i}", ("a", "b", "c", "d", "e"), 0) for i in range(size)]
+        difficulties = [max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, rng.gauss(0, 1.5))) for _ in range(size)]
+        start = time.perf_counter(); index = DifficultyIndex(questions, difficulties); build_ms = (time.perf_counter() - start) * 1000
+        def linear_pick(ability, used):
+            return min((position for position in range(size) if position not in used), key=lambda p: abs(difficulties[p] - ability), default=None)
+        def run_quizzes(pick, quizzes):
+            samples = []
+            for _ in range(quizzes):
+                used = set(); ability = rng.gauss(0, 1)
+                for _ in range(min(quiz_length, size)):
+                    start = time.perf_counter(); position = pick(ability, used); samples.append((time.perf_counter() - start) * 1e6)
+                    used.add(position); ability += 0.3 if rng.random() < 0.5 else -0.3
+            return statistics.median(samples)
+        bucket_us = run_quizzes(lambda ability, used: index.pick(ability, used, rng), 20)
+        linear_us = run_quizzes(linear_pick, 20 if size <= 10000 else 1)
+        print(f"{size:>10} | {build_ms:>8.1f} | {bucket_us:>14.2f} | {linear_us:>14.0f}")
+
+
+def bench_statements(lookups=20000, size=10000):
+    """ Hot single-row lookups with the prepared-statement cache off vs. on, then quiz_data's per-statement counters """
+    import quiz_data
+    from db_connection import connect, STATEMENT_CACHE_SIZE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "bench.db")
+        build_bench_database(db_file, size, topic_count=1).close()
+        rng = random.Random(1); ids = [rng.randint(1, size) for _ in range(lookups)]
+        print(f"{lookups} lookups of random questions by id in a {size}-question bank, plus a mixed quiz workload.")
+        print(f"{'cached_statements':>17} | {'us per lookup':>13}")
+        print("-" * 33)
+        for cache_size in (0, STATEMENT_CACHE_SIZE):
+            conn = connect(db_file, read_only=True, cached_statements=cache_size)
+            start = time.perf_counter()
+            for question_id in ids: quiz_data.fetch_one(conn, 'question', (question_id,))
+            print(f"{cache_size:>17} | {(time.perf_counter() - start) * 1e6 / lookups:>13.2f}")
+            conn.close()
+        quiz_data.reset_statement_stats()
+        conn = connect(db_file, read_only=True)
+        for question_id in ids[:2000]:
+            quiz_data.fetch_all(conn, 'topics'); quiz_data.fetch_one(conn, 'question', (question_id,))
+            quiz_data.fetch_one(conn, 'item_stats', (question_id,))
+        for after_id in range(0, size, 200): quiz_data.fetch_all(conn, 'question_page', (61, 1, after_id, 200))
+        quiz_data.fetch_all(conn, 'topic_questions', (1,))
+        conn.close()
+        print()
+        quiz_data.print_statement_stats()
+
+
+def bench_snapshot(sizes, topic_count=BENCH_TOPICS):
+    """
+    Quiz start in a fresh process: open the bank and load one topic, from the live database (DatabaseManager,
+    migration check, reader pool, question cache) vs. from a memory-mapped snapshot. Timed inside a new
+    interpreter, imports included, so it is what a starting app pays.
+    """
+    import subprocess
+    from db_connection import connect
+    from question_snapshot import export_snapshot
+    child = {
+        'database': "from db_connection import DatabaseManager\ndb = DatabaseManager(path)\nrows = len(db.question_cache.get_topic(1))\ndb.close()",
+        'snapshot': "from question_snapshot import QuestionSnapshot\nbank = QuestionSnapshot(path)\nrows = len(bank.get_topic(1))\nbank.close()",
+    }
+    def first_topic_ms(source, path):
+        code = f"import time\nstart = time.perf_counter()\npath = {path!r}\n{child[source]}\nprint((time.perf_counter() - start) * 1000)"
+        samples = [float(subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         capture_output=True, text=True, check=True).stdout) for _ in range(5)]
+        return statistics.median(samples)
+    print(f"Bank spread over {topic_count} topics; median of 5 fresh processes (warm OS page cache).")
+    print(f"{'questions':>10} | {'db MiB':>7} | {'snapshot MiB':>12} | {'export s':>8} | {'db first topic ms':>17} | {'snapshot first topic ms':>23}")
+    print("-" * 94)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db"); snapshot_file = os.path.join(tmp_dir, "bench.qbs")
+            build_bench_database(db_file, size, topic_count).close()
+            conn = connect(db_file, read_only=True)
+            start = time.perf_counter(); export_snapshot(conn, snapshot_file); export_s = time.perf_counter() - start
+            conn.close()
+            print(f"{size:>10} | {os.path.getsize(db_file) / 2**20:>7.1f} | {os.path.getsize(snapshot_file) / 2**20:>12.1f} | {export_s:>8.2f}"
+                  f" | {first_topic_ms('database', db_file):>17.1f} | {first_topic_ms('snapshot', snapshot_file):>23.1f}")
+
+
+def bench_startup(size=10000, runs=5):
+    """
+    Time to first window of main_quiz_admin.py in fresh processes, measured from process launch: interpreter
+    start and imports, the start screen built, and the database opened (the first idle callback).
+    Cold runs start from an empty bytecode cache (as after an install or upgrade); warm runs reuse it.
+    Ends with an `-X importtime` breakdown of what startup still imports.
+    """
+    import subprocess
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    child = ("import sys, time\n"
+             "launched = float(sys.argv[1]); marks = []\n"
+             "import tkinter as tk\nimport main_quiz_admin\nmarks.append(time.time() - launched)\n"
+             "try: root = tk.Tk()\nexcept tk.TclError: print(*marks, 'nan', 'nan'); raise SystemExit\n"
+             "app = main_quiz_admin.MainApp(root, db_file=sys.argv[2]); marks.append(time.time() - launched)\n"
+             "root.update(); marks.append(time.time() - launched)\n"
+             "app._on_app_closing(); print(*marks)")
+    def run(db_file, pycache_dir, extra_flags=()):
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache_dir); env.pop('PYTHONDONTWRITEBYTECODE', None)
+        result = subprocess.run([sys.executable, *extra_flags, '-c', child, repr(time.time()), db_file], cwd=repo_dir,
+                                env=env, capture_output=True, text=True, check=True)
+        return result
+    def milestones(result):
+        return [float(value) * 1000 for value in result.stdout.split()[-3:]]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "bench.db")
+        build_bench_database(db_file, size).close()
+        print(f"main_quiz_admin.py startup, {size}-question database; median of {runs} fresh processes. Times from process launch.")
+        print(f"{'run':>5} | {'imports ms':>10} | {'first window ms':>15} | {'ready ms':>8}")
+        print("-" * 48)
+        samples = {'cold': [], 'warm': []}
+        for i in range(runs):
+            pycache_dir = os.path.join(tmp_dir, f"pycache{i}")
+            samples['cold'].append(milestones(run(db_file, pycache_dir))) # Empty cache: every module is compiled
+            samples['warm'].append(milestones(run(db_file, pycache_dir))) # Same cache, now filled
+        for label, rows in samples.items():
+            imports_ms, window_ms, ready_ms = (statistics.median(column) for column in zip(*rows))
+            print(f"{label:>5} | {imports_ms:>10.1f} | {window_ms:>15.1f} | {ready_ms:>8.1f}")
+        if any(value != value for value in samples['warm'][0]): print("(No display here: only the import phase could be timed.)")
+
+        # Warm -X importtime breakdown: interpreter start-up plus main_quiz_admin's own imports
+        lines = run(db_file, os.path.join(tmp_dir, "pycache0"), ('-X', 'importtime')).stderr.splitlines()
+        entries = []
+        for line in lines:
+            fields = line[len("import time:"):].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit(): continue # Header line, or not importtime output
+            self_us, cumulative_us, name = fields[0], fields[1], fields[2][1:] # Two spaces of indent per nesting level
+            depth = (len(name) - len(name.lstrip())) // 2
+            if depth <= 1: entries.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.strip(), depth))
+        print()
+        print(f"{'module':<24} | {'cumulative ms':>13} | {'self ms':>7}")
+        print("-" * 50)
+        for cumulative_ms, self_ms, name, depth in sorted(entries, reverse=True)[:12]:
+            print(f"{'  ' * depth + name:<24} | {cumulative_ms:>13.1f} | {self_ms:>7.1f}")
+
+
+def bench_import(record_count=200000, file_count=8, worker_counts=(1, 2, 4)):
+    """ Importing JSONL files: the in-process importer vs. parallel_import_questions() with N worker processes """
+    import json
+    import populate_database
+    from db_connection import connect
+    rng = random.Random(1)
+    vocabulary = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    def words(count):
+        return " ".join(rng.choice(vocabulary) for _ in range(count))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = [os.path.join(tmp_dir, f"course{i}.jsonl") for i in range(file_count)]
+        for i, path in enumerate(files):
+            with open(path, 'w', encoding='utf-8') as f:
+                for j in range(record_count // file_count):
+                    record = {'topic': populate_database.TOPICS[j % len(populate_database.TOPICS)], 'question': f"Q{i}-{j}: {words(rng.randint(6, 20))}?",
+                              **{letter: words(3) for letter in "ABCDE"}, 'correct': "ABCDE"[j % 5]}
+                    f.write(json.dumps(record) + "\n")
+        def fresh_database(name):
+            db_file = os.path.join(tmp_dir, name)
+            conn = build_bench_database(db_file, 0, topic_count=0)
+            conn.executemany("INSERT INTO Topics(name) VALUES(?)", [(topic,) for topic in populate_database.TOPICS]); conn.commit()
+            return conn
+        print(f"{record_count} records in {file_count} JSONL files ({sum(os.path.getsize(path) for path in files) / 2**20:.0f} MiB); {os.cpu_count()} CPUs.")
+        print(f"{'importer':>12} | {'wall s':>7} | {'records/s':>10} | {'parse worker-s':>14} | {'insert s':>8}")
+        print("-" * 64)
+        conn = fresh_database("sequential.db")
+        start = time.perf_counter()
+        for path in files:
+            populate_database.bulk_import_questions(conn, populate_database.iter_question_records(path), progress_every=0)
+        elapsed = time.perf_counter() - start
+        conn.close()
+        print(f"{'in-process':>12} | {elapsed:>7.2f} | {record_count / elapsed:>10,.0f} | {'-':>14} | {'-':>8}")
+        for workers in worker_counts:
+            conn = fresh_database(f"parallel{workers}.db")
+            added, _, elapsed, stages = populate_database.parallel_import_questions(conn, files, workers=workers)
+            conn.close()
+            print(f"{f'{workers} workers':>12} | {elapsed:>7.2f} | {added / elapsed:>10,.0f} | {stages['parse_seconds']:>14.2f} | {stages['write_seconds']:>8.2f}")
+
+
+def bench_grading(taker_counts, question_count=100):
+    """ Grading answer sheets: one QuizSession.grade() per taker vs. batch_grading.grade_sheets() on the whole batch """
+    import batch_grading
+    from question import Question
+    from quiz_engine import QuizSession
+    rng = random.Random(1)
+    questions = [Question(i + 1, 1, f"Question {i + 1}", tuple(f"Option {letter}" for letter in "ABCDE"), rng.randrange(5)) for i in range(question_count)]
+    key = bytes(question.correct_index for question in questions)
+    backends = [False] + ([True] if batch_grading.np is not None else [])
+    print(f"{question_count} questions per sheet; numpy {'installed' if batch_grading.np is not None else 'not installed'}.")
+    print(f"{'takers':>8} | {'per-session ms':>14} | " + " | ".join(f"{'numpy ms' if use_numpy else 'batch ms':>9}" for use_numpy in backends))
+    print("-" * (30 + 12 * len(backends)))
+    for takers in taker_counts:
+        sheets = ["".join(rng.choice("ABCDE ") for _ in range(question_count)) for _ in range(takers)]
+        def per_session():
+            for sheet in sheets:
+                session = QuizSession(questions); session.answers = [letter.strip() for letter in sheet]; session.grade()
+        timings = [time_call(per_session, repeats=3)]
+        timings += [time_call(lambda: batch_grading.grade_sheets(key, sheets, use_numpy=use_numpy), repeats=3) for use_numpy in backends]
+        print(f"{takers:>8} | {timings[0]:>14.1f} | " + " | ".join(f"{timing:>9.1f}" for timing in timings[1:]))
+
+
+def bench_instrumentation(calls=1000000):
+    """ Per-call cost of instrumentation.timed() and timer(): undecorated vs. recording off vs. recording on """
+    import instrumentation
+    def plain(x):
+        return x
+    decorated = instrumentation.timed('bench.call')(plain)
+    def with_timer(x):
+        with instrumentation.timer('bench.block'):
+            return x
+    print(f"{calls} calls; ns per call.")
+    print(f"{'variant':>22} | {'recording off':>13} | {'recording on':>12}")
+    print("-" * 54)
+    for label, func in (("plain function", plain), ("@timed", decorated), ("with timer()", with_timer)):
+        timings = []
+        for enabled in (False, True):
+            instrumentation.enable(enabled)
+            start = time.perf_counter()
+            for i in range(calls): func(i)
+            timings.append((time.perf_counter() - start) * 1e9 / calls)
+        print(f"{label:>22} | {timings[0]:>13.0f} | {timings[1]:>12.0f}")
+    instrumentation.enable(False)
+    histogram = instrumentation.histograms()[0]
+    print(f"\nRecorded '{histogram.name}': {histogram.count} calls, p50 {histogram.percentile_ms(0.5)} ms, max {histogram.max_seconds * 1000:.3f} ms.")
+
+
+def bench_question_memory(sizes):
+    """ Bytes per question held in memory, and render-style field access: sqlite3.Row vs. Question (__slots__) """
+    import gc
+    import tracemalloc
+    from question import Question
+    print("Traced Python memory after loading the whole bank; 'fields' excludes the text/option strings themselves.")
+    print(f"{'questions':>10} | {'Row B/q':>7} | {'Question B/q':>12} | {'Row fields B/q':>14} | {'Question fields B/q':>19} | {'Row access ns':>13} | {'Question access ns':>18}")
+    print("-" * 112)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = build_bench_database(os.path.join(tmp_dir, "bench.db"), size)
+            sql = SQL_TOPIC_QUESTIONS.replace("WHERE topic_id = ? ", "")
+            traced = []; banks = []
+            for row_factory, convert in ((sqlite3.Row, None), (None, Question.from_row)):
+                conn.row_factory = row_factory
+                gc.collect(); tracemalloc.start()
+                rows = conn.execute(sql).fetchall()
+                if convert: rows = [convert(row) for row in rows]
+                traced.append(tracemalloc.get_traced_memory()[0])
+                tracemalloc.stop(); banks.append(rows)
+            conn.close()
+        row_bank, question_bank = banks
+        string_bytes = sum(sys.getsizeof(q.text) + sum(sys.getsizeof(o) for o in q.options) for q in question_bank)
+        # What the quiz UI reads per question: the text and the five options
+        start = time.perf_counter()
+        for row in row_bank: row['question_text']; row['option_a']; row['option_b']; row['option_c']; row['option_d']; row['option_e']
+        row_ns = (time.perf_counter() - start) * 1e9 / size
+        start = time.perf_counter()
+        for question in question_bank: question.text; question.options
+        question_ns = (time.perf_counter() - start) * 1e9 / size
+        row_bytes, question_bytes = traced
+        print(f"{size:>10} | {row_bytes / size:>7.0f} | {question_bytes / size:>12.0f} | {(row_bytes - string_bytes) / size:>14.0f} | "
+              f"{(question_bytes - string_bytes) / size:>19.0f} | {row_ns:>13.0f} | {question_ns:>18.0f}")
+        del row_bank, question_bank, banks
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Quiz Bowl performance benchmarks.")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    topic_load = subparsers.add_parser('topic-load', help="Topic-load latency vs. bank size.")
+    topic_load.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bank sizes to test.")
+    topic_load.add_argument('--topics', type=int, default=BENCH_TOPICS, help="Number of topics the bank is spread over.")
+
+    admin_list = subparsers.add_parser('admin-list', help="Admin question list: full load vs. keyset page.")
+    admin_list.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Topic sizes to test.")
+
+    admin_save = subparsers.add_parser('admin-save', help="Admin save: full list reload vs. patching one row.")
+    admin_save.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Topic sizes to test.")
+
+    search = subparsers.add_parser('search', help="Full-text search latency vs. bank size.")
+    search.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bank sizes to test (try 1000000).")
+
+    dedup = subparsers.add_parser('dedup', help="Near-duplicate check: LSH index vs. linear scan.")
+    dedup.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bank sizes to test.")
+
+    sessions = subparsers.add_parser('sessions', help="Headless quiz engine throughput (sessions/sec).")
+    sessions.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 10000], help="Concurrent session counts to test.")
+    sessions.add_argument('--questions', type=int, default=50, help="Questions per quiz.")
+    sessions.add_argument('--shuffle-options', action='store_true', help="Shuffle each session's answer options.")
+
+    cache = subparsers.add_parser('cache', help="Quiz start: disk read vs. question cache hit.")
+    cache.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bank sizes to test.")
+    cache.add_argument('--topics', type=int, default=BENCH_TOPICS, help="Number of topics the bank is spread over.")
+
+    sample = subparsers.add_parser('sample', help="Quiz start of N random questions: full topic read vs. id-index sample.")
+    sample.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Topic sizes to test.")
+    sample.add_argument('--count', type=int, default=20, help="Questions per quiz.")
+
+    attempts = subparsers.add_parser('attempts', help="Recording quiz responses: commit per response vs. batched AttemptLog.")
+    attempts.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 10000], help="Concurrent session counts to test.")
+    attempts.add_argument('--questions', type=int, default=20, help="Questions per quiz.")
+
+    item_stats = subparsers.add_parser('item-stats', help="Per-question statistics: recompute from Responses vs. ItemStats lookup.")
+    item_stats.add_argument('--responses', type=int, nargs='+', default=[10000, 100000, 1000000], help="Recorded response counts to test.")
+    item_stats.add_argument('--questions', type=int, default=100, help="Questions the responses are spread over.")
+
+    adaptive = subparsers.add_parser('adaptive', help="Adaptive next-question pick: difficulty buckets vs. linear scan.")
+    adaptive.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Topic sizes to test.")
+    adaptive.add_argument('--length', type=int, default=50, help="Questions per adaptive quiz.")
+
+    statements = subparsers.add_parser('statements', help="Prepared-statement cache off vs. on, and per-statement timing counters.")
+    statements.add_argument('--lookups', type=int, default=20000, help="Questions looked up by id.")
+
+    snapshot = subparsers.add_parser('snapshot', help="Quiz start in a fresh process: live database vs. memory-mapped snapshot.")
+    snapshot.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bank sizes to test.")
+    snapshot.add_argument('--topics', type=int, default=BENCH_TOPICS, help="Number of topics the bank is spread over.")
+
+    startup = subparsers.add_parser('startup', help="main_quiz_admin.py time to first window, cold and warm, with an -X importtime breakdown.")
+    startup.add_argument('--size', type=int, default=10000, help="Questions in the database opened at startup.")
+    startup.add_argument('--runs', type=int, default=5, help="Fresh processes per measurement.")
+
+    bulk_import = subparsers.add_parser('import', help="JSONL import: in-process vs. parallel parse/validate workers.")
+    bulk_import.add_argument('--records', type=int, default=200000, help="Records to import.")
+    bulk_import.add_argument('--files', type=int, default=8, help="Files the records are spread over.")
+    bulk_import.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="Worker process counts to test.")
+
+    grading = subparsers.add_parser('grading', help="Answer-sheet grading: per-taker QuizSession vs. batch grading.")
+    grading.add_argument('--takers', type=int, nargs='+', default=[1000, 10000, 50000], help="Numbers of answer sheets to test.")
+    grading.add_argument('--questions', type=int, default=100, help="Questions per sheet.")
+
+    instrumentation_parser = subparsers.add_parser('instrumentation', help="Overhead of the timing decorators with recording off and on.")
+    instrumentation_parser.add_argument('--calls', type=int, default=1000000, help="Calls per variant.")
+
+    question_memory = subparsers.add_parser('question-memory', help="Bytes per question and field access: sqlite3.Row vs. Question.")
+    question_memory.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000], help="Bank sizes to test.")
+
+    args = parser.parse_args()
+    if args.benchmark == 'topic-load':
+        bench_topic_load(args.sizes, args.topics)
+    elif args.benchmark == 'admin-list':
+        bench_admin_list(args.sizes)
+    elif args.benchmark == 'admin-save':
+        bench_admin_save(args.sizes)
+    elif args.benchmark == 'search':
+        bench_search(args.sizes)
+    elif args.benchmark == 'dedup':
+        bench_dedup(args.sizes)
+    elif args.benchmark == 'sessions':
+        bench_sessions(args.counts, args.questions, args.shuffle_options)
+    elif args.benchmark == 'cache':
+        bench_cache(args.sizes, args.topics)
+    elif args.benchmark == 'sample':
+        bench_sample(args.sizes, args.count)
+    elif args.benchmark == 'attempts':
+        bench_attempts(args.counts, args.questions)
+    elif args.benchmark == 'item-stats':
+        bench_item_stats(args.responses, args.questions)
+    elif args.benchmark == 'adaptive':
+        bench_adaptive(args.sizes, args.length)
+    elif args.benchmark == 'statements':
+        bench_statements(args.lookups)
+    elif args.benchmark == 'snapshot':
+        bench_snapshot(args.sizes, args.topics)
+    elif args.benchmark == 'startup':
+        bench_startup(args.size, args.runs)
+    elif args.benchmark == 'import':
+        bench_import(args.records, args.files, args.workers)
+    elif args.benchmark == 'grading':
+        bench_grading(args.takers, args.questions)
+    elif args.benchmark == 'instrumentation':
+        bench_instrumentation(args.calls)
+    elif args.benchmark == 'question-memory':
+        bench_question_memory(args.sizes)
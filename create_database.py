@@ -1,5 +1,7 @@
 import sqlite3
 import os
+from db_connection import connect
+from schema_migrations import SQL_CREATE_TOPICS_TABLE, SQL_CREATE_QUESTIONS_TABLE, migrate
 
 # --- Configuration ---
 DATABASE_FILE = 'quiz_bowl_app.db'
@@ -17,10 +19,9 @@ def create_connection(db_file):
     """ Create a database connection to the SQLite database specified by db_file """
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file, create=True)
         print(f"SQLite connection established to {db_file} (Version: {sqlite3.sqlite_version})")
-        # Enable foreign key constraint enforcement (important for relational integrity)
-        conn.execute("PRAGMA foreign_keys = ON;")
+        # Foreign keys, WAL and the busy timeout are enabled by the shared connection factory
         return conn
     except sqlite3.Error as e:
         print(f"Error connecting to database: {e}")
@@ -71,23 +72,6 @@ def add_topic(conn, topic_name):
 
 # --- Main Execution ---
 if __name__ == '__main__':
-    # Define SQL statements for creating tables
-    # Using IF NOT EXISTS prevents errors if the script is run multiple times
-    sql_create_topics_table = """ CREATE TABLE IF NOT EXISTS Topics (
-                                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                        name TEXT NOT NULL UNIQUE
-                                    ); """
-
-    # The Questions table links to the Topics table using topic_id
-    # ON DELETE CASCADE means if a topic is deleted, all its questions are also deleted.
-    sql_create_questions_table = """CREATE TABLE IF NOT EXISTS Questions (
-                                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                        topic_id INTEGER NOT NULL,
-                                        question_text TEXT NOT NULL,
-                                        answer_text TEXT NOT NULL,
-                                        FOREIGN KEY (topic_id) REFERENCES Topics (id) ON DELETE CASCADE
-                                    );"""
-
     # --- Create database and tables ---
     print(f"Creating database file: {DATABASE_FILE}")
     conn = create_connection(DATABASE_FILE)
@@ -95,8 +79,15 @@ if __name__ == '__main__':
     if conn is not None:
         # Create tables
         print("\nCreating tables...")
-        create_table(conn, sql_create_topics_table)
-        create_table(conn, sql_create_questions_table)
+        create_table(conn, SQL_CREATE_TOPICS_TABLE)
+        create_table(conn, SQL_CREATE_QUESTIONS_TABLE)
+
+        # Apply indexes and any other versioned schema changes
+        print("\nApplying schema migrations...")
+        try:
+            print(f"Schema version: {migrate(conn)}")
+        except sqlite3.Error as e:
+            print(f"Error applying schema migrations: {e}")
 
         # Add initial topics
         print("\nAdding initial topics...")
@@ -0,0 +1,132 @@
+import sqlite3
+import os
+import queue
+import threading
+from contextlib import contextmanager
+if os.name == 'nt': from nturl2path import pathname2url
+else: from urllib.parse import quote as pathname2url # What urllib.request uses on POSIX, without importing http.client/email/ssl (~50 ms)
+from schema_migrations import migrate
+from question_cache import QuestionCache, DEFAULT_CACHE_BYTES
+from attempt_log import AttemptLog
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+BUSY_TIMEOUT_MS = 5000 # Wait this long for a lock instead of failing with "database is locked"
+SYNCHRONOUS = "NORMAL" # Safe with WAL; FULL would fsync on every commit
+CACHE_SIZE_KIB = 16384 # Page cache per connection (16 MiB)
+MMAP_SIZE = 128 * 1024 * 1024 # Memory-map up to 128 MiB of the database file
+READER_POOL_SIZE = 4 # Max idle read-only connections kept for quiz takers
+STATEMENT_CACHE_SIZE = 256 # Prepared statements kept per connection (sqlite3 default: 128); see quiz_data.py
+
+
+# --- Connection Factory ---
+def connect(db_file=DATABASE_FILE, read_only=False, create=False, row_factory=None, cached_statements=STATEMENT_CACHE_SIZE):
+    """
+    Opens a tuned SQLite connection. Every script and app should get connections from here.
+    - read_only: open with mode=ro (quiz takers); writes raise sqlite3.OperationalError
+    - create: allow creating a missing database file (create_database.py only)
+    - row_factory: e.g. sqlite3.Row for access to columns by name
+    - cached_statements: size of the connection's prepared-statement cache
+    Connections may be handed between threads, but must only be used by one thread at a time.
+    :return: Connection object (raises sqlite3.Error on failure)
+    """
+    mode = "ro" if read_only else ("rwc" if create else "rw")
+    uri = f"file:{pathname2url(os.path.abspath(db_file))}?mode={mode}"
+    conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False, cached_statements=cached_statements)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB};") # Negative value = size in KiB
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE};")
+    if not read_only:
+        # WAL lets readers keep reading while the writer commits; the setting is stored in the file
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS};")
+    return conn
+
+
+# --- Database Manager ---
+class DatabaseManager:
+    """
+    Owns the single writer connection and a pool of read-only connections.
+    All writes go through write() so they are serialized on one connection;
+    quiz takers read through pooled read-only connections and never block on the writer (WAL).
+    question_cache holds recently used topics in memory (see question_cache.py);
+    attempt_log records finished quizzes in batched writes (see attempt_log.py).
+    """
+    def __init__(self, db_file=DATABASE_FILE, pool_size=READER_POOL_SIZE, cache_bytes=DEFAULT_CACHE_BYTES,
+                 cached_statements=STATEMENT_CACHE_SIZE):
+        self.db_file = db_file; self.pool_size = pool_size; self.cached_statements = cached_statements
+        # The writer is opened first: it enables WAL and applies migrations before any reader opens
+        self.writer = connect(db_file, row_factory=sqlite3.Row, cached_statements=cached_statements)
+        migrate(self.writer)
+        self._writer_lock = threading.RLock()
+        self._idle_readers = queue.LifoQueue() # LIFO keeps the warmest connection (page cache) in use
+        self._closed = False
+        self.question_cache = QuestionCache(self, cache_bytes)
+        self.attempt_log = AttemptLog(self)
+
+    def acquire_reader(self):
+        """ Returns a read-only connection from the pool (opening one if none is idle) """
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            return connect(self.db_file, read_only=True, row_factory=sqlite3.Row, cached_statements=self.cached_statements)
+
+    def release_reader(self, conn):
+        """ Returns a reader to the pool, or closes it if the pool is full or the manager is closed """
+        if conn.in_transaction:
+            conn.rollback() # End any implicit read transaction so the WAL can be checkpointed
+        if self._closed or self._idle_readers.qsize() >= self.pool_size:
+            conn.close()
+        else:
+            self._idle_readers.put(conn)
+
+    @contextmanager
+    def reader(self):
+        """ with db.reader() as conn: ... -- borrows a pooled read-only connection """
+        conn = self.acquire_reader()
+        try:
+            yield conn
+        finally:
+            self.release_reader(conn)
+
+    def data_version(self):
+        """
+        PRAGMA data_version of the writer connection. It changes whenever another connection or process
+        commits, but not for commits made through write(), so it detects external writers only.
+        Never waits for the writer: returns None while a write() block (or another check) holds it.
+        """
+        if not self._writer_lock.acquire(blocking=False):
+            return None
+        try:
+            return self.writer.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._writer_lock.release()
+
+    @contextmanager
+    def write(self):
+        """
+        with db.write() as conn: ... -- runs on the writer connection under the writer lock.
+        Commits when the block finishes, rolls back (and re-raises) on any exception.
+        """
+        with self._writer_lock:
+            try:
+                yield self.writer
+                self.writer.commit()
+            except BaseException:
+                self.writer.rollback()
+                raise
+
+    def close(self):
+        """ Writes any pending quiz attempts, then closes the writer and every idle reader """
+        self.attempt_log.close()
+        self._closed = True
+        while True:
+            try:
+                self._idle_readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            self.writer.close()
@@ -0,0 +1,77 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+import instrumentation
+
+# --- Configuration ---
+POLL_INTERVAL_MS = 20 # How often the Tk thread checks for finished jobs
+MAX_WORKERS = 2
+
+
+class DBWorker:
+    """
+    Runs database jobs on a background thread pool and delivers their results back on the Tk thread.
+    Jobs must not touch widgets; they get their own connection (e.g. `with db.reader() as conn`).
+    The on_success/on_error callbacks run on the Tk thread, from a queue polled with after().
+
+    The poll loop doubles as a responsiveness probe: any time the Tk event loop is blocked,
+    the next poll tick arrives late. max_stall_ms is the worst lateness seen so far.
+    """
+    def __init__(self, root, max_workers=MAX_WORKERS, poll_interval_ms=POLL_INTERVAL_MS):
+        self.root = root; self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.SimpleQueue() # (future, on_success, on_error), filled by worker threads
+        self._pending = 0
+        self.max_stall_ms = 0.0; self._last_tick = None
+        self._after_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def submit(self, job, *args, on_success=None, on_error=None):
+        """
+        Runs job(*args) in the pool.
+        on_success(result) or on_error(exception) is then called on the Tk thread.
+        """
+        self._pending += 1
+        if instrumentation.is_enabled(): # Timed as 'job.<name>', e.g. AdminPanel._job_write -> 'job.write'
+            job = instrumentation.timed(f"job.{getattr(job, '__name__', 'anonymous').removeprefix('_job_')}")(job)
+        future = self._executor.submit(job, *args)
+        future.add_done_callback(lambda f: self._results.put((f, on_success, on_error)))
+        return future
+
+    @property
+    def busy(self):
+        """ True while any submitted job has not had its callback delivered yet """
+        return self._pending > 0
+
+    def reset_stall_metric(self):
+        """ Starts a fresh max_stall_ms measurement (e.g. at the start of a test) """
+        self.max_stall_ms = 0.0; self._last_tick = None
+
+    def _poll(self):
+        """ Delivers finished jobs to their callbacks and records how late this tick was """
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            stall_ms = (now - self._last_tick) * 1000 - self.poll_interval_ms
+            if stall_ms > self.max_stall_ms: self.max_stall_ms = stall_ms
+            instrumentation.record('tk.stall', max(stall_ms, 0.0) / 1000)
+        self._last_tick = now
+        while True:
+            try: future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty: break
+            self._pending -= 1
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error: on_error(error)
+                    else: print(f"Background database job failed: {type(error).__name__} - {error}")
+                elif on_success: on_success(future.result())
+            except Exception as e: # A failing callback must not stop the poll loop
+                print(f"Error in database job callback: {type(e).__name__} - {e}")
+        self._after_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def shutdown(self):
+        """ Stops polling and waits for running jobs to finish """
+        if self._after_id is not None:
+            try: self.root.after_cancel(self._after_id)
+            except Exception: pass # Root may already be destroyed
+            self._after_id = None
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# --- Configuration ---
+TIMINGS_ENV = 'QUIZ_BOWL_TIMINGS' # Set to a file path to record from startup and write the timings there on exit
+# Histogram bucket upper edges in milliseconds; one more bucket holds everything slower
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Timings of the Tk apps' hot paths (database calls, widget build phases, event handlers), by name.
+# Recording is off unless enabled (QUIZ_BOWL_TIMINGS, or enable() from the admin diagnostics pane).
+# While off, a @timed function costs one flag check per call and timer() returns a shared do-nothing object.
+_enabled = bool(os.environ.get(TIMINGS_ENV))
+_histograms = {}
+_lock = threading.Lock()
+
+
+# --- Histogram ---
+class Histogram:
+    """ Call count, total/max time and a fixed-bucket latency histogram for one named operation """
+    __slots__ = ('name', 'count', 'total_seconds', 'max_seconds', 'buckets')
+
+    def __init__(self, name):
+        self.name = name; self.count = 0; self.total_seconds = 0.0; self.max_seconds = 0.0
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+
+    def add(self, seconds):
+        self.count += 1; self.total_seconds += seconds
+        if seconds > self.max_seconds: self.max_seconds = seconds
+        self.buckets[bisect_left(BUCKET_EDGES_MS, seconds * 1000)] += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_seconds * 1000 / self.count if self.count else 0.0
+
+    def percentile_ms(self, fraction):
+        """ Upper edge of the bucket holding the `fraction` quantile (the maximum for the overflow bucket) """
+        rank = fraction * self.count; seen = 0
+        for edge, count in zip(BUCKET_EDGES_MS, self.buckets):
+            seen += count
+            if seen >= rank and count: return min(edge, self.max_seconds * 1000)
+        return self.max_seconds * 1000
+
+    def as_dict(self):
+        return {'name': self.name, 'count': self.count, 'total_ms': round(self.total_seconds * 1000, 3),
+                'mean_ms': round(self.mean_ms, 3), 'p50_ms': round(self.percentile_ms(0.5), 3), 'p95_ms': round(self.percentile_ms(0.95), 3),
+                'max_ms': round(self.max_seconds * 1000, 3),
+                'buckets': {f"<={edge}ms": count for edge, count in zip(BUCKET_EDGES_MS, self.buckets)} | {f">{BUCKET_EDGES_MS[-1]}ms": self.buckets[-1]}}
+
+
+# --- Recording ---
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, seconds):
+    """ Add one timing (in seconds) to histogram `name`, if recording is on """
+    if not _enabled: return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None: histogram = _histograms[name] = Histogram(name)
+        histogram.add(seconds)
+
+
+def timed(name=None):
+    """
+    Decorator: time every call of the function into histogram `name` (default: its qualified name,
+    e.g. 'AdminPanel._save_question'). Exceptions are timed too.
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled: return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter(); return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """ Context manager timing its block into histogram `name`: `with timer('quiz.render'): ...` """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+# --- Reporting ---
+def histograms():
+    """ Snapshot of all histograms (copies), most total time first """
+    with _lock:
+        snapshot = []
+        for histogram in _histograms.values():
+            copy = Histogram(histogram.name); copy.count = histogram.count
+            copy.total_seconds = histogram.total_seconds; copy.max_seconds = histogram.max_seconds; copy.buckets = list(histogram.buckets)
+            snapshot.append(copy)
+    return sorted(snapshot, key=lambda histogram: histogram.total_seconds, reverse=True)
+
+
+def reset():
+    with _lock: _histograms.clear()
+
+
+def timings_dict():
+    """ Histograms plus quiz_data's per-statement counters, ready for JSON """
+    from quiz_data import statement_stats
+    return {'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'enabled': _enabled,
+            'histograms': [histogram.as_dict() for histogram in histograms()],
+            'statements': [{'name': stats.name, 'calls': stats.calls, 'total_ms': round(stats.total_seconds * 1000, 3),
+                            'mean_ms': round(stats.mean_ms, 3), 'max_ms': round(stats.max_seconds * 1000, 3)} for stats in statement_stats()]}
+
+
+def dump_json(path):
+    """ Write timings_dict() to `path` """
+    import json
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(timings_dict(), f, indent=2)
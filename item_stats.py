@@ -0,0 +1,76 @@
+import math
+from question import OPTION_LETTERS
+from quiz_data import ITEM_STAT_COLUMNS, execute_many, fetch_one
+
+# --- Configuration ---
+MIN_RESPONSES_FOR_DISCRIMINATION = 5 # Fewer responses than this: discrimination is reported as unknown
+
+# Running sums per question, so every statistic is O(1) to read and to update:
+# - responses/correct/unanswered and picks_a..picks_e (how often each option was chosen; wrong picks = distractor counts)
+# - rest_sum/rest_sq_sum/correct_rest_sum: the taker's score on the *other* questions of the attempt (a 0-1 fraction),
+#   its square, and its sum over correct responses; enough for the corrected point-biserial correlation.
+# The columns (quiz_data.ITEM_STAT_COLUMNS) and the 'item_stats'/'upsert_item_stats' statements live in quiz_data.py.
+
+
+# --- Item Statistics ---
+class ItemStatistics:
+    """ Classical item analysis for one question, computed from its ItemStats row """
+    __slots__ = ITEM_STAT_COLUMNS
+
+    def __init__(self, *values):
+        for column, value in zip(ITEM_STAT_COLUMNS, values): setattr(self, column, value)
+
+    @property
+    def p_value(self):
+        """ Difficulty: share of responses that were correct (None before the first response) """
+        return self.correct / self.responses if self.responses else None
+
+    @property
+    def discrimination(self):
+        """
+        Corrected point-biserial correlation between answering this question correctly and the score on the
+        rest of the attempt (-1..1; higher = separates strong and weak takers better). None if undefined.
+        """
+        n = self.responses
+        if n < MIN_RESPONSES_FOR_DISCRIMINATION: return None
+        correct_variance = n * self.correct - self.correct ** 2
+        rest_variance = n * self.rest_sq_sum - self.rest_sum ** 2
+        if correct_variance <= 0 or rest_variance <= 1e-12: return None # Everyone (in)correct, or identical rest scores
+        return (n * self.correct_rest_sum - self.correct * self.rest_sum) / math.sqrt(correct_variance * rest_variance)
+
+    def option_picks(self):
+        """ {letter: times chosen} for A-E """
+        return dict(zip(OPTION_LETTERS, (self.picks_a, self.picks_b, self.picks_c, self.picks_d, self.picks_e)))
+
+
+def item_stat_deltas(attempts):
+    """
+    Sum a batch of attempts into one ItemStats delta row per question (the rows of the 'upsert_item_stats' statement).
+    :param attempts: (attempt row, response rows) pairs as queued by attempt_log.AttemptLog
+    """
+    deltas = {}
+    for (_, _, _, question_count, score, _), responses in attempts:
+        for _, question_id, answer, is_correct, _ in responses:
+            rest = (score - is_correct) / (question_count - 1) if question_count > 1 else 0.0
+            delta = deltas.get(question_id)
+            if delta is None: delta = deltas[question_id] = [0] * len(ITEM_STAT_COLUMNS)
+            delta[0] += 1
+            if is_correct: delta[1] += 1; delta[10] += rest
+            if answer is None: delta[2] += 1
+            else: delta[3 + OPTION_LETTERS.index(answer)] += 1
+            delta[8] += rest; delta[9] += rest * rest
+    return [(question_id, *delta) for question_id, delta in deltas.items()]
+
+
+def apply_item_stats(conn, attempts):
+    """ Add a batch of attempts to ItemStats; call inside the transaction that inserts their Responses """
+    execute_many(conn, 'upsert_item_stats', item_stat_deltas(attempts))
+
+
+def fetch_item_stats(conn, question_id):
+    """
+    Statistics of one question (a primary-key lookup, independent of the number of responses).
+    :return: ItemStatistics, or None if the question has never been answered in a recorded attempt
+    """
+    row = fetch_one(conn, 'item_stats', (question_id,))
+    return ItemStatistics(*row) if row else None
@@ -1,57 +1,80 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import sqlite3
+from tkinter import ttk, messagebox
 import os
-import random
+import threading
+import argparse
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from question import Question, QuestionError, OPTION_LETTERS
+from quiz_data import execute, fetch_all, fetch_one
+import instrumentation
+from instrumentation import timed
+# Startup imports only what the start screen needs. Modules that are slow to import, or only used by one
+# screen, are imported where they are first used: sqlite3 and db_connection/db_worker once the window is up,
+# search/dedup/item_stats by the admin panel, the quiz engines by QuizApp, simpledialog by the password prompt.
+# Kept eager on purpose (about 1 ms together, none pulls in sqlite3): question and quiz_data, used by the
+# module-level fetch_* helpers behind the start screen's topic list, and instrumentation, whose @timed
+# decorators run when the classes below are defined.
+# `python benchmarks.py startup` tracks what is left.
 
 DATABASE_FILE = 'quiz_bowl_app.db'
 PASSWORD = "momothecat" # Password for admin panel access
-PASS_THRESHOLD = 80.0 # Percentage needed to pass a quiz
+DIAGNOSTICS_REFRESH_MS = 1000 # How often an open diagnostics pane re-reads the timings
+VIRTUAL_ROW_HEIGHT = 230 # Estimated pixel height of a question row in "All Questions at Once" mode, until it is measured
+VIRTUAL_ROW_GAP = 10 # Pixels between question rows
+VIRTUAL_LAYOUT_PASSES = 4 # Measure/re-layout rounds per scroll; measured rows can change which rows are in view
+ADMIN_PAGE_SIZE = 200 # Questions fetched per page in the admin question list
+LIST_TEXT_CHARS = 60 # Characters of question text shown per admin list row
+QUIZ_LENGTH_CHOICES = ("All", "10", "20", "50") # Questions per quiz; a number draws a random sample of the topic
 
 # --- Database Utility Functions ---
 def connect_db(db_file=DATABASE_FILE):
-    """Establishes connection to the specified SQLite database file."""
+    """Opens the database (WAL writer + read-only pool) for the specified SQLite database file."""
+    import sqlite3
+    from db_connection import DatabaseManager
     if not os.path.exists(db_file):
         messagebox.showerror("Database Error", f"Database file '{db_file}' not found.")
         return None
     try:
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row # Access columns by name
-        conn.execute("PRAGMA foreign_keys = ON;")
+        db = DatabaseManager(db_file) # Also applies pending schema migrations
         print("Database connected successfully.")
-        return conn
+        return db
     except sqlite3.Error as e:
         messagebox.showerror("Database Error", f"Database connection error: {e}")
         return None
 
+@timed('db.fetch_topics')
 def fetch_topics(conn):
     """Fetches all topic IDs and names from the Topics table."""
     if not conn: return []
+    import sqlite3
     topics_list = []
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name FROM Topics ORDER BY name")
-        topics_list = cursor.fetchall()
+        topics_list = fetch_all(conn, 'topics')
     except sqlite3.Error as e:
         print(f"Error fetching topics: {e}")
         # Consider showing warning if critical
     return topics_list
 
+@timed('db.fetch_questions_for_topic')
 def fetch_questions_for_topic(conn, topic_id):
     """Fetches all questions for a specific topic ID."""
-    # Returns list of sqlite3.Row objects in this version
+    # Returns a list of Question objects (see question.py).
+    # Runs on a DBWorker thread, so errors propagate to the job's on_error callback instead of a messagebox.
     if not conn: return []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer
-            FROM Questions WHERE topic_id = ? ORDER BY id
-        """, (topic_id,))
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Database error fetching questions for topic {topic_id}: {e}")
-        messagebox.showwarning("Database Error", f"Could not load questions for the selected topic.\nError: {e}", parent=None)
-        return []
+    return fetch_all(conn, 'topic_questions', (topic_id,), Question.from_row)
+
+@timed('db.fetch_question_page')
+def fetch_question_page(conn, topic_id, after_id=0, limit=None):
+    """Fetches one keyset page of (id, question_text) rows for the admin question list.
+    Only the first LIST_TEXT_CHARS + 1 characters of the text are read (enough to know if '...' is needed)."""
+    return fetch_all(conn, 'question_page', (LIST_TEXT_CHARS + 1, topic_id, after_id, limit or ADMIN_PAGE_SIZE))
+
+@timed('db.fetch_question')
+def fetch_question(conn, question_id):
+    """Fetches one full question as a Question (or None)."""
+    row = fetch_one(conn, 'question', (question_id,))
+    return Question.from_row(row) if row else None
 
 # --- Start Screen Class ---
 class StartScreen(ttk.Frame):
@@ -63,6 +86,7 @@ class StartScreen(ttk.Frame):
         self.launch_quiz_callback = launch_quiz_callback
         self._setup_widgets()
 
+    @timed('build.start_screen')
     def _setup_widgets(self):
         self.grid_rowconfigure(0, weight=1); self.grid_rowconfigure(1, weight=1)
         self.grid_rowconfigure(2, weight=1); self.grid_rowconfigure(3, weight=1)
@@ -74,15 +98,96 @@ class StartScreen(ttk.Frame):
         quiz_button = ttk.Button(self, text="Take Quiz", command=self.launch_quiz_callback, style='Start.TButton', width=20)
         quiz_button.grid(row=2, column=0, pady=10)
 
+# --- Admin Question List Model ---
+class QuestionListModel:
+    """In-memory id model behind the admin question list.
+    ids[i] is the question shown at listbox index i; keyset paging loads them in ascending order,
+    so a question's row is found by bisection instead of re-querying the topic after each save."""
+    def __init__(self):
+        self.ids = []
+        self.complete = False # True once the last page of the topic has been loaded
+
+    def clear(self):
+        self.ids = []; self.complete = False
+
+    def extend(self, ids):
+        self.ids.extend(ids)
+
+    def last_id(self):
+        return self.ids[-1] if self.ids else 0
+
+    def index_of(self, question_id):
+        """Listbox index of question_id, or None if it is not loaded."""
+        i = bisect_left(self.ids, question_id)
+        return i if i < len(self.ids) and self.ids[i] == question_id else None
+
+    def add(self, question_id):
+        """Records a newly inserted question; returns its listbox index, or None if its page is not loaded yet."""
+        if not self.complete: return None # Will arrive with a later page
+        i = bisect_left(self.ids, question_id); self.ids.insert(i, question_id) # New AUTOINCREMENT ids land at the end
+        return i
+
+    def remove(self, question_id):
+        """Forgets a deleted question; returns the listbox index it had (or None)."""
+        i = self.index_of(question_id)
+        if i is not None: del self.ids[i]
+        return i
+
+class VirtualRowLayout:
+    """Row offsets of the all-at-once quiz canvas.
+    Every row starts at an estimated height and gets its measured height (wrapped question and option text)
+    the first time it is shown, so long questions are never clipped; offsets are prefix sums, and the rows
+    in view are found by bisection."""
+    def __init__(self, count, estimate=VIRTUAL_ROW_HEIGHT):
+        self.heights = [estimate] * count
+        self.measured = set() # Rows measured at the current width
+        self._offsets = None
+
+    def __len__(self):
+        return len(self.heights)
+
+    @property
+    def offsets(self):
+        """offsets[i] is the top of row i; offsets[-1] is the total height."""
+        if self._offsets is None: self._offsets = list(accumulate(self.heights, initial=0))
+        return self._offsets
+
+    def visible_range(self, top, bottom):
+        """Rows overlapping the pixel span [top, bottom)."""
+        count = len(self.heights)
+        first = max(0, bisect_right(self.offsets, top, 0, count) - 1)
+        return range(first, max(first, bisect_left(self.offsets, bottom, 0, count)))
+
+    def set_height(self, index, height):
+        """Records row index's measured height; returns True if the layout changed."""
+        self.measured.add(index)
+        if self.heights[index] == height: return False
+        self.heights[index] = height; self._offsets = None
+        return True
+
 # --- Admin Panel Class ---
 class AdminPanel(ttk.Frame):
     """Admin panel UI for managing questions."""
-    def __init__(self, parent, db_connection, back_callback, style, **kwargs):
+    def __init__(self, parent, db, worker, back_callback, style, **kwargs):
         super().__init__(parent, padding="10", **kwargs)
-        self.parent = parent; self.conn = db_connection; self.back_callback = back_callback
-        self.style = style; self.topics = []; self.questions_data = {}; self.current_topic_id = None
+        self.parent = parent; self.db = db; self.worker = worker; self.back_callback = back_callback
+        self.style = style; self.topics = []; self.list_model = QuestionListModel(); self.current_topic_id = None
+        self._list_request = 0; self._detail_request = 0 # Newest request ids; older results are ignored
+        self._page_loading = False # A keyset page of the question list is being fetched
+        self.duplicate_index = None; self._duplicate_lock = threading.Lock() # Near-duplicate LSH index, built on a worker
+        self._duplicate_pending = None # While the index is being built: (id, signature or None for removed) changes to replay
+        self._duplicate_index_requested = False; self.diagnostics = None
         self.grid_columnconfigure(1, weight=1); self._setup_widgets(); self._load_initial_data()
+        self.parent.bind("<Control-D>", self._show_diagnostics, add="+") # Ctrl+Shift+D: hidden timing diagnostics
+
+    def _show_diagnostics(self, event=None):
+        """Opens (or raises) the diagnostics pane; only while the admin panel is showing."""
+        if not self.winfo_ismapped(): return
+        if self.diagnostics and self.diagnostics.winfo_exists(): self.diagnostics.winfo_toplevel().lift(); return
+        window = tk.Toplevel(self.parent); window.title("Diagnostics"); window.geometry("760x420")
+        self.diagnostics = DiagnosticsPane(window); self.diagnostics.pack(fill=tk.BOTH, expand=True)
 
+    @timed('build.admin_panel')
     def _setup_widgets(self):
         """Creates and places all widgets for the admin panel."""
         back_button=ttk.Button(self, text="< Back to Start", command=self.back_callback); back_button.grid(row=0, column=0, pady=(0,15), padx=5, sticky="w")
@@ -91,7 +196,7 @@ class AdminPanel(ttk.Frame):
         self.topic_combobox = ttk.Combobox(self, state="readonly", width=35); self.topic_combobox.grid(row=2, column=1, padx=5, pady=5, sticky="ew"); self.topic_combobox.bind("<<ComboboxSelected>>", self._load_questions_ui)
         q_list_frame = ttk.LabelFrame(self, text="Questions in Selected Topic"); q_list_frame.grid(row=3, column=0, columnspan=2, padx=5, pady=10, sticky="nsew"); q_list_frame.grid_rowconfigure(0, weight=1); q_list_frame.grid_columnconfigure(0, weight=1)
         self.question_listbox = tk.Listbox(q_list_frame, height=10, exportselection=False); self.question_listbox.grid(row=0, column=0, sticky="nsew", padx=5, pady=5); self.question_listbox.bind("<<ListboxSelect>>", self._display_selected_question_ui)
-        list_scrollbar = ttk.Scrollbar(q_list_frame, orient=tk.VERTICAL, command=self.question_listbox.yview); list_scrollbar.grid(row=0, column=1, sticky="ns"); self.question_listbox.config(yscrollcommand=list_scrollbar.set)
+        list_scrollbar = ttk.Scrollbar(q_list_frame, orient=tk.VERTICAL, command=self.question_listbox.yview); list_scrollbar.grid(row=0, column=1, sticky="ns"); self.list_scrollbar = list_scrollbar; self.question_listbox.config(yscrollcommand=self._on_list_scrolled)
         edit_frame = ttk.LabelFrame(self, text="Edit Selected Question"); edit_frame.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="ew"); edit_frame.grid_columnconfigure(1, weight=1)
         self.qid_var = tk.StringVar(); self.opt_a_var = tk.StringVar(); self.opt_b_var = tk.StringVar(); self.opt_c_var = tk.StringVar(); self.opt_d_var = tk.StringVar(); self.opt_e_var = tk.StringVar(); self.correct_var = tk.StringVar()
         ttk.Label(edit_frame, text="ID:").grid(row=0, column=0, sticky="w", padx=5, pady=2); self.qid_entry = ttk.Entry(edit_frame, textvariable=self.qid_var, state="readonly"); self.qid_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=2)
@@ -102,47 +207,140 @@ class AdminPanel(ttk.Frame):
         ttk.Label(edit_frame, text="Option D:").grid(row=5, column=0, sticky="w", padx=5, pady=2); self.opt_d_entry = ttk.Entry(edit_frame, textvariable=self.opt_d_var); self.opt_d_entry.grid(row=5, column=1, sticky="ew", padx=5, pady=2)
         ttk.Label(edit_frame, text="Option E:").grid(row=6, column=0, sticky="w", padx=5, pady=2); self.opt_e_entry = ttk.Entry(edit_frame, textvariable=self.opt_e_var); self.opt_e_entry.grid(row=6, column=1, sticky="ew", padx=5, pady=2)
         ttk.Label(edit_frame, text="Correct (A-E):").grid(row=7, column=0, sticky="w", padx=5, pady=2); self.correct_combobox = ttk.Combobox(edit_frame, textvariable=self.correct_var, values=['A', 'B', 'C', 'D', 'E'], state="readonly", width=5); self.correct_combobox.grid(row=7, column=1, sticky="w", padx=5, pady=2)
+        self.stats_var = tk.StringVar(); ttk.Label(edit_frame, text="Statistics:").grid(row=8, column=0, sticky="nw", padx=5, pady=2); ttk.Label(edit_frame, textvariable=self.stats_var, font=('Helvetica', 9)).grid(row=8, column=1, sticky="w", padx=5, pady=2)
         action_frame = ttk.Frame(self); action_frame.grid(row=5, column=0, columnspan=2, pady=10)
         self.new_button = ttk.Button(action_frame, text="New Question", command=self._prepare_new_question_ui); self.new_button.grid(row=0, column=0, padx=5)
         self.save_button = ttk.Button(action_frame, text="Save Changes", command=self._save_question, state=tk.DISABLED); self.save_button.grid(row=0, column=1, padx=5)
         self.delete_button = ttk.Button(action_frame, text="Delete Question", command=self._delete_question, state=tk.DISABLED); self.delete_button.grid(row=0, column=2, padx=5)
+        search_frame = ttk.LabelFrame(self, text="Search All Questions"); search_frame.grid(row=6, column=0, columnspan=2, padx=5, pady=5, sticky="ew"); search_frame.grid_columnconfigure(0, weight=1)
+        self.search_var = tk.StringVar(); self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var); self.search_entry.grid(row=0, column=0, sticky="ew", padx=5, pady=5); self.search_entry.bind("<Return>", self._search_questions_ui)
+        ttk.Button(search_frame, text="Search", command=self._search_questions_ui).grid(row=0, column=1, padx=5, pady=5)
+        self.search_listbox = tk.Listbox(search_frame, height=5, exportselection=False); self.search_listbox.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5)); self.search_listbox.bind("<<ListboxSelect>>", self._display_search_result_ui)
+        self.search_result_ids = []; self._search_request = 0
+
+    # Database jobs below run on a DBWorker thread; the _on_* callbacks run on the Tk thread.
+    def _job_fetch_topics(self):
+        with self.db.reader() as conn: return fetch_topics(conn)
+
+    def _job_fetch_question_page(self, topic_id, after_id):
+        with self.db.reader() as conn: return fetch_question_page(conn, topic_id, after_id)
+
+    def _job_fetch_question(self, question_id):
+        with self.db.reader() as conn: return fetch_question(conn, question_id)
+
+    def _job_fetch_item_stats(self, question_id):
+        from item_stats import fetch_item_stats
+        with self.db.reader() as conn: return fetch_item_stats(conn, question_id) # Primary-key lookup into ItemStats
+
+    def _job_search(self, search_text):
+        from question_search import search_questions
+        with self.db.reader() as conn: return search_questions(conn, search_text)
+
+    def _job_build_duplicate_index(self):
+        """Builds the near-duplicate index without holding _duplicate_lock, then swaps it in; no-op if built or being built."""
+        from question_dedup import build_duplicate_index
+        with self._duplicate_lock:
+            if self.duplicate_index is not None or self._duplicate_pending is not None: return
+            self._duplicate_pending = []
+        try:
+            with self.db.reader() as conn: index = build_duplicate_index(conn)
+        except BaseException:
+            with self._duplicate_lock: self._duplicate_pending = None # Let the next check retry
+            raise
+        with self._duplicate_lock:
+            for question_id, signature in self._duplicate_pending: # Saves and deletes the build may have missed
+                if signature is None: index.remove(question_id)
+                else: index.add(question_id, signature)
+            self.duplicate_index = index; self._duplicate_pending = None
+
+    def _job_check_duplicates(self, question, qid):
+        """
+        Returns (matches, signature); matches are (question id, similarity) pairs, excluding the question being edited.
+        While another worker is still building the index the check finds nothing rather than holding up the save.
+        """
+        from question_dedup import question_signature
+        self._job_build_duplicate_index() # No-op once built
+        signature = question_signature(question.text, question.options)
+        with self._duplicate_lock:
+            if self.duplicate_index is None: return [], signature
+            return self.duplicate_index.find_duplicates(signature, exclude=qid), signature
+
+    def _update_duplicate_index(self, question_id, signature=None):
+        """Adds (or, with no signature, removes) a question in the duplicate index, or queues the change while it is being built."""
+        with self._duplicate_lock:
+            if self.duplicate_index is not None:
+                if signature is None: self.duplicate_index.remove(question_id)
+                else: self.duplicate_index.add(question_id, signature)
+            elif self._duplicate_pending is not None: self._duplicate_pending.append((question_id, signature))
 
     def _load_initial_data(self):
         """Loads initial topic data."""
-        self.topics = fetch_topics(self.conn)
+        self.topic_combobox.set("Loading topics...")
+        self.worker.submit(self._job_fetch_topics, on_success=self._on_topics_loaded)
+
+    def _warm_duplicate_index(self):
+        """Starts building the near-duplicate index once the admin begins editing, so the first save rarely waits for it."""
+        if self._duplicate_index_requested: return
+        self._duplicate_index_requested = True
+        self.worker.submit(self._job_build_duplicate_index, on_error=lambda e: print(f"Near-duplicate index unavailable: {e}"))
+
+    def _on_topics_loaded(self, topics):
+        self.topics = topics
         self.topic_combobox['values'] = [t['name'] for t in self.topics]
-        if self.topics:
-            self.topic_combobox.current(0)
-            self._load_questions_ui() # Load questions for the default topic
+        self.topic_combobox.set("Select a topic..." if self.topics else "") # Questions are listed once a topic is picked
 
+    @timed('event.admin.select_topic')
     def _load_questions_ui(self, event=None):
         """Loads question listbox based on selected topic."""
         selected_topic_index = self.topic_combobox.current()
-        questions_display_data = [] # Default to empty list
-        if selected_topic_index != -1:
-            selected_topic = self.topics[selected_topic_index]
-            self.current_topic_id = selected_topic['id']
-            try:
-                cursor = self.conn.cursor()
-                cursor.execute("SELECT id, question_text FROM Questions WHERE topic_id = ? ORDER BY id", (self.current_topic_id,))
-                questions_display_data = cursor.fetchall()
-            except sqlite3.Error as e:
-                 messagebox.showerror("Database Error", f"Failed to load questions list:\n{e}", parent=self)
-        else:
-            self.current_topic_id = None # No topic selected
-
         self.question_listbox.delete(0, tk.END) # Clear current list
-        self.questions_data.clear() # Clear mapping
+        self.list_model.clear() # Clear mapping
         self._clear_edit_form()
         self._disable_action_buttons()
+        self._list_request += 1; self._page_loading = False
+        if selected_topic_index == -1:
+            self.current_topic_id = None; return # No topic selected
+        selected_topic = self.topics[selected_topic_index]
+        self.current_topic_id = selected_topic['id']
+        self.question_listbox.insert(tk.END, "Loading questions..."); self.question_listbox.config(state=tk.DISABLED)
+        self._load_next_page()
+
+    def _load_next_page(self):
+        """Fetches the page after the last loaded id (keyset paging: cost is one page, whatever the topic size)."""
+        self._page_loading = True
+        request_id = self._list_request; after_id = self.list_model.last_id()
+        self.worker.submit(self._job_fetch_question_page, self.current_topic_id, after_id,
+                           on_success=lambda rows: self._on_question_page_loaded(request_id, rows),
+                           on_error=lambda e: self._on_question_list_failed(request_id, e))
+
+    @timed('event.admin.page_loaded')
+    def _on_question_page_loaded(self, request_id, questions_display_data):
+        if request_id != self._list_request: return # A newer topic was selected meanwhile
+        self._page_loading = False; self.list_model.complete = len(questions_display_data) < ADMIN_PAGE_SIZE
+        if self.question_listbox.cget('state') == tk.DISABLED: # First page: drop the loading placeholder
+            self.question_listbox.config(state=tk.NORMAL); self.question_listbox.delete(0, tk.END)
+        # Append to the listbox (one Tcl call per page) and to the index -> question id mapping
+        self.question_listbox.insert(tk.END, *[self._list_row_text(q_row['id'], q_row['question_text']) for q_row in questions_display_data])
+        self.list_model.extend(q_row['id'] for q_row in questions_display_data)
+        self._on_list_scrolled(*self.question_listbox.yview()) # Page might not fill the view yet
+
+    def _on_question_list_failed(self, request_id, error):
+        if request_id != self._list_request: return
+        self._page_loading = False; self.list_model.complete = True # Stop paging after an error
+        if self.question_listbox.cget('state') == tk.DISABLED:
+            self.question_listbox.config(state=tk.NORMAL); self.question_listbox.delete(0, tk.END)
+        messagebox.showerror("Database Error", f"Failed to load questions list:\n{error}", parent=self)
 
-        # Populate listbox and internal mapping {listbox_index: question_id}
-        for i, q_row in enumerate(questions_display_data):
-            q_id = q_row['id']; q_text = q_row['question_text']
-            display_text = f"{q_id}: {q_text[:60]}{'...' if len(q_text) > 60 else ''}"
-            self.question_listbox.insert(tk.END, display_text)
-            self.questions_data[i] = q_id
+    def _on_list_scrolled(self, first, last):
+        """Listbox yscrollcommand: updates the scrollbar and fetches the next page near the bottom."""
+        self.list_scrollbar.set(first, last)
+        if not self.list_model.complete and not self._page_loading and float(last) >= 0.9: self._load_next_page()
 
+    @staticmethod
+    def _list_row_text(q_id, q_text):
+        return f"{q_id}: {q_text[:LIST_TEXT_CHARS]}{'...' if len(q_text) > LIST_TEXT_CHARS else ''}"
+
+    @timed('event.admin.select_question')
     def _display_selected_question_ui(self, event=None):
         """Displays selected question details in the edit form."""
         selected_indices = self.question_listbox.curselection()
@@ -150,33 +348,90 @@ class AdminPanel(ttk.Frame):
             self._clear_edit_form(); self._disable_action_buttons(); return
 
         selected_list_index = selected_indices[0]
-        question_id = self.questions_data.get(selected_list_index)
-
-        if question_id:
-            try:
-                cursor = self.conn.cursor()
-                cursor.execute("SELECT * FROM Questions WHERE id=?", (question_id,))
-                q_row = cursor.fetchone()
-                if q_row:
-                    # Populate form fields
-                    self.qid_var.set(q_row['id'])
-                    self.qtext_widget.delete('1.0', tk.END); self.qtext_widget.insert('1.0', q_row['question_text'] or "")
-                    self.opt_a_var.set(q_row['option_a'] or ""); self.opt_b_var.set(q_row['option_b'] or "")
-                    self.opt_c_var.set(q_row['option_c'] or ""); self.opt_d_var.set(q_row['option_d'] or "")
-                    self.opt_e_var.set(q_row['option_e'] or ""); self.correct_var.set(q_row['correct_answer'].upper() if q_row['correct_answer'] else "")
-                    self._enable_action_buttons(); self.save_button.config(text="Save Changes")
-                else:
-                     messagebox.showerror("Error", f"Could not find details for question ID {question_id}.", parent=self)
-                     self._clear_edit_form(); self._disable_action_buttons()
-            except sqlite3.Error as e:
-                messagebox.showerror("Database Error", f"Failed to load question details:\n{e}", parent=self)
-                self._clear_edit_form(); self._disable_action_buttons()
+        question_id = self.list_model.ids[selected_list_index] if selected_list_index < len(self.list_model.ids) else None
+
+        if question_id: self._load_question_details(question_id)
+
+    def _load_question_details(self, question_id):
+        """Fetches a question and its item statistics for the edit form."""
+        self._detail_request += 1; request_id = self._detail_request
+        self._disable_action_buttons() # Re-enabled once the details have arrived
+        self._warm_duplicate_index()
+        self.stats_var.set("Loading...")
+        self.worker.submit(self._job_fetch_question, question_id,
+                           on_success=lambda question: self._on_question_loaded(request_id, question_id, question),
+                           on_error=lambda e: self._on_question_load_failed(request_id, e))
+        self.worker.submit(self._job_fetch_item_stats, question_id,
+                           on_success=lambda stats: self._on_item_stats_loaded(request_id, stats),
+                           on_error=lambda e: self._on_item_stats_loaded(request_id, None, e))
+
+    def _on_item_stats_loaded(self, request_id, stats, error=None):
+        if request_id != self._detail_request: return # Selection changed or form cleared meanwhile
+        if error is not None: self.stats_var.set(f"Unavailable ({error})"); return
+        if stats is None or not stats.responses: self.stats_var.set("No recorded responses yet."); return
+        discrimination = stats.discrimination
+        picks = "  ".join(f"{letter}: {count}" for letter, count in stats.option_picks().items())
+        self.stats_var.set(f"{stats.responses} responses | p-value {stats.p_value:.2f} | discrimination "
+                           f"{'n/a' if discrimination is None else f'{discrimination:+.2f}'} | unanswered {stats.unanswered}\nPicks  {picks}")
+
+    def _on_question_loaded(self, request_id, question_id, question):
+        if request_id != self._detail_request: return # Selection changed meanwhile
+        if question:
+            # Populate form fields
+            self.qid_var.set(question.id)
+            self.qtext_widget.delete('1.0', tk.END); self.qtext_widget.insert('1.0', question.text or "")
+            for option_var, option_text in zip(self._option_vars(), question.options): option_var.set(option_text or "")
+            self.correct_var.set(question.correct_answer)
+            self._enable_action_buttons(); self.save_button.config(text="Save Changes")
+        else:
+             messagebox.showerror("Error", f"Could not find details for question ID {question_id}.", parent=self)
+             self._clear_edit_form(); self._disable_action_buttons()
+
+    def _on_question_load_failed(self, request_id, error):
+        if request_id != self._detail_request: return
+        messagebox.showerror("Database Error", f"Failed to load question details:\n{error}", parent=self)
+        self._clear_edit_form(); self._disable_action_buttons()
+
+    @timed('event.admin.search')
+    def _search_questions_ui(self, event=None):
+        """Runs a ranked full-text search over all topics and lists matches with snippets."""
+        search_text = self.search_var.get().strip()
+        self.search_listbox.delete(0, tk.END); self.search_result_ids = []
+        if not search_text: return
+        self._search_request += 1; request_id = self._search_request
+        self.search_listbox.insert(tk.END, "Searching...")
+        self.worker.submit(self._job_search, search_text,
+                           on_success=lambda rows: self._on_search_results(request_id, rows),
+                           on_error=lambda e: self._on_search_results(request_id, [], e))
+
+    def _on_search_results(self, request_id, rows, error=None):
+        if request_id != self._search_request: return # A newer search was started meanwhile
+        self.search_listbox.delete(0, tk.END)
+        if error is not None: messagebox.showerror("Database Error", f"Search failed:\n{error}", parent=self); return
+        if not rows: self.search_listbox.insert(tk.END, "No matches."); return
+        topic_names = {t['id']: t['name'] for t in self.topics}
+        self.search_listbox.insert(tk.END, *[f"{r['id']} [{topic_names.get(r['topic_id'], '?')}]: {' '.join(r['snippet'].split())}" for r in rows])
+        self.search_result_ids = [r['id'] for r in rows]
+
+    @timed('event.admin.select_search_result')
+    def _display_search_result_ui(self, event=None):
+        """Loads the selected search result into the edit form."""
+        selected_indices = self.search_listbox.curselection()
+        if not selected_indices or selected_indices[0] >= len(self.search_result_ids): return
+        question_id = self.search_result_ids[selected_indices[0]]
+        self.question_listbox.selection_clear(0, tk.END)
+        self._load_question_details(question_id)
+
+    def _option_vars(self):
+        """The StringVars of options A-E, in order."""
+        return (self.opt_a_var, self.opt_b_var, self.opt_c_var, self.opt_d_var, self.opt_e_var)
 
     def _clear_edit_form(self):
         """Clears all edit form fields."""
         self.qid_var.set(""); self.qtext_widget.delete('1.0', tk.END)
         self.opt_a_var.set(""); self.opt_b_var.set(""); self.opt_c_var.set("")
-        self.opt_d_var.set(""); self.opt_e_var.set(""); self.correct_var.set("")
+        self.opt_d_var.set(""); self.opt_e_var.set(""); self.correct_var.set(""); self.stats_var.set("")
+        self._detail_request += 1 # Details still loading belong to the cleared form
         try: self.question_listbox.selection_clear(0, tk.END) # Deselect listbox
         except tk.TclError: pass
 
@@ -193,44 +448,84 @@ class AdminPanel(ttk.Frame):
         if self.current_topic_id is None: messagebox.showwarning("No Topic Selected", "Please select a topic before adding.", parent=self); return
         self._clear_edit_form(); self._disable_action_buttons()
         self.save_button.config(state=tk.NORMAL, text="Save New Question"); self.qtext_widget.focus_set()
+        self._warm_duplicate_index()
 
     def _validate_form_input(self):
-        """Validates form input before saving."""
-        q_text = self.qtext_widget.get("1.0", tk.END).strip()
-        opts = {
-            'a': self.opt_a_var.get().strip(), 'b': self.opt_b_var.get().strip(),
-            'c': self.opt_c_var.get().strip(), 'd': self.opt_d_var.get().strip(),
-            'e': self.opt_e_var.get().strip()
-        }
-        correct = self.correct_var.get().upper()
-        if not q_text or not all(opts.values()): messagebox.showerror("Input Error", "Question and all Options must be filled.", parent=self); return None
-        if not correct: messagebox.showerror("Input Error", "Correct Answer must be selected.", parent=self); return None
-        if correct not in ['A', 'B', 'C', 'D', 'E']: messagebox.showerror("Input Error", "Correct Answer must be A-E.", parent=self); return None
-        return {"question_text": q_text, **{f"option_{k}": v for k, v in opts.items()}, "correct_answer": correct}
+        """Validates form input before saving; returns a Question (without id/topic) or None."""
+        try: return Question.create(self.qtext_widget.get("1.0", tk.END), [var.get() for var in self._option_vars()], self.correct_var.get())
+        except QuestionError as e: messagebox.showerror("Input Error", str(e), parent=self); return None
 
+    @timed('event.admin.save')
     def _save_question(self):
         """Handles saving new or existing question to the database."""
         qid_str = self.qid_var.get(); is_new = not bool(qid_str)
         if self.current_topic_id is None and is_new: messagebox.showerror("Error", "No topic selected for new question.", parent=self); return
-        form_data = self._validate_form_input()
-        if form_data is None: return
-        cursor = self.conn.cursor()
-        try:
-            if is_new:
-                sql = """INSERT INTO Questions (topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
-                params = (self.current_topic_id, form_data["question_text"], form_data["option_a"], form_data["option_b"], form_data["option_c"], form_data["option_d"], form_data["option_e"], form_data["correct_answer"])
-                cursor.execute(sql, params); self.conn.commit(); messagebox.showinfo("Success", "New question added.", parent=self)
-            else:
-                qid = int(qid_str)
-                sql = """UPDATE Questions SET question_text=?, option_a=?, option_b=?, option_c=?, option_d=?, option_e=?, correct_answer=? WHERE id=?"""
-                params = (form_data["question_text"], form_data["option_a"], form_data["option_b"], form_data["option_c"], form_data["option_d"], form_data["option_e"], form_data["correct_answer"], qid)
-                cursor.execute(sql, params); self.conn.commit()
-                if cursor.rowcount == 0: messagebox.showwarning("Warning", f"No update ID {qid}.", parent=self)
-                else: messagebox.showinfo("Success", f"Question ID {qid} updated.", parent=self)
-            self._load_questions_ui(); self._clear_edit_form(); self._disable_action_buttons()
-        except sqlite3.Error as e: self.conn.rollback(); messagebox.showerror("Database Error", f"Failed save:\n{e}", parent=self)
-        except ValueError: messagebox.showerror("Error", "Invalid ID.", parent=self)
+        question = self._validate_form_input()
+        if question is None: return
+        if is_new:
+            statement = 'insert_question'; params = (self.current_topic_id, *question.content_fields())
+            qid = None; topic_id = self.current_topic_id
+        else:
+            try: qid = int(qid_str)
+            except ValueError: messagebox.showerror("Error", "Invalid ID.", parent=self); return
+            statement = 'update_question'; params = (*question.content_fields(), qid)
+            topic_id = None # Looked up by _job_write (a search result may belong to another topic)
+        self._disable_action_buttons(); self.new_button.config(state=tk.DISABLED) # No double submits while saving
+        request_id = self._list_request # The list the saved row belongs to
+        self.worker.submit(self._job_check_duplicates, question, qid,
+                           on_success=lambda result: self._on_duplicates_checked(request_id, qid, topic_id, question, statement, params, *result),
+                           on_error=lambda e: self._on_duplicates_checked(request_id, qid, topic_id, question, statement, params, [], None))
+
+    def _on_duplicates_checked(self, request_id, qid, topic_id, question, statement, params, matches, signature):
+        """Asks before saving a likely near-duplicate, then submits the write."""
+        if matches:
+            match_id, similarity = matches[0]
+            if not messagebox.askyesno("Possible Duplicate", f"This question is {similarity:.0%} similar to question ID {match_id}"
+                                       f"{f' (and {len(matches) - 1} more)' if len(matches) > 1 else ''}.\n\nSave it anyway?", parent=self):
+                self.new_button.config(state=tk.NORMAL); self.save_button.config(state=tk.NORMAL) # Form is kept for editing
+                if qid is not None: self.delete_button.config(state=tk.NORMAL)
+                return
+        self.worker.submit(self._job_write, statement, params, qid, topic_id,
+                           on_success=lambda result: self._on_question_saved(request_id, qid, question.text, *result, signature=signature),
+                           on_error=self._on_write_failed)
+
+    def _job_write(self, statement, params, question_id=None, topic_id=None):
+        """Runs one quiz_data statement; afterwards drops the affected topic (given, or looked up from question_id) from the question cache."""
+        with self.db.write() as conn:
+            if question_id is not None:
+                row = fetch_one(conn, 'question_topic', (question_id,))
+                if row: topic_id = row['topic_id']
+            cursor = execute(conn, statement, params)
+            result = cursor.rowcount, cursor.lastrowid
+        if topic_id is not None: self.db.question_cache.invalidate(topic_id) # After the commit, so a reload sees the change
+        return result
 
+    def _on_question_saved(self, request_id, qid, question_text, rowcount, lastrowid, signature=None):
+        self.new_button.config(state=tk.NORMAL)
+        if signature is not None and rowcount > 0: self._update_duplicate_index(lastrowid if qid is None else qid, signature)
+        if qid is None: messagebox.showinfo("Success", "New question added.", parent=self)
+        elif rowcount == 0: messagebox.showwarning("Warning", f"No update ID {qid}.", parent=self)
+        else: messagebox.showinfo("Success", f"Question ID {qid} updated.", parent=self)
+        if request_id == self._list_request: self._patch_saved_row(qid, question_text, rowcount, lastrowid) # List still shows that topic
+        self._clear_edit_form(); self._disable_action_buttons()
+
+    def _patch_saved_row(self, qid, question_text, rowcount, lastrowid):
+        """Inserts or rewrites only the saved question's list row; no re-query, whatever the topic size."""
+        if qid is None:
+            if not self._page_loading: # An in-flight page already includes the new row
+                index = self.list_model.add(lastrowid)
+                if index is not None: self.question_listbox.insert(index, self._list_row_text(lastrowid, question_text))
+        elif rowcount > 0:
+            index = self.list_model.index_of(qid)
+            if index is not None:
+                self.question_listbox.delete(index); self.question_listbox.insert(index, self._list_row_text(qid, question_text))
+
+    def _on_write_failed(self, error):
+        self.new_button.config(state=tk.NORMAL); self.save_button.config(state=tk.NORMAL) # Form is kept so the admin can retry
+        if self.qid_var.get(): self.delete_button.config(state=tk.NORMAL)
+        messagebox.showerror("Database Error", f"Failed save:\n{error}", parent=self)
+
+    @timed('event.admin.delete')
     def _delete_question(self):
         """Handles deleting the selected question."""
         qid_str = self.qid_var.get()
@@ -238,30 +533,124 @@ class AdminPanel(ttk.Frame):
         try: qid = int(qid_str)
         except ValueError: messagebox.showerror("Error", "Invalid ID.", parent=self); return
         if messagebox.askyesno("Confirm Delete", f"Delete question ID {qid}?", parent=self):
-            try:
-                cursor = self.conn.cursor(); cursor.execute("DELETE FROM Questions WHERE id=?", (qid,)); self.conn.commit()
-                if cursor.rowcount > 0: messagebox.showinfo("Success", f"Question ID {qid} deleted.", parent=self); self._load_questions_ui(); self._clear_edit_form(); self._disable_action_buttons()
-                else: messagebox.showwarning("Warning", f"Could not find ID {qid}.", parent=self)
-            except sqlite3.Error as e: self.conn.rollback(); messagebox.showerror("Database Error", f"Failed delete:\n{e}", parent=self)
+            self._disable_action_buttons(); self.new_button.config(state=tk.DISABLED)
+            request_id = self._list_request
+            self.worker.submit(self._job_write, 'delete_question', (qid,), qid,
+                               on_success=lambda result: self._on_question_deleted(request_id, qid, result[0]),
+                               on_error=self._on_delete_failed)
+
+    def _on_question_deleted(self, request_id, qid, rowcount):
+        self.new_button.config(state=tk.NORMAL)
+        if rowcount > 0:
+            self._update_duplicate_index(qid)
+            messagebox.showinfo("Success", f"Question ID {qid} deleted.", parent=self)
+            if request_id == self._list_request: # Remove just that row
+                index = self.list_model.remove(qid)
+                if index is not None: self.question_listbox.delete(index)
+            self._clear_edit_form(); self._disable_action_buttons()
+        else: messagebox.showwarning("Warning", f"Could not find ID {qid}.", parent=self); self._enable_action_buttons()
+
+    def _on_delete_failed(self, error):
+        self.new_button.config(state=tk.NORMAL); self._enable_action_buttons()
+        messagebox.showerror("Database Error", f"Failed delete:\n{error}", parent=self)
+
+# --- Diagnostics Pane Class ---
+class DiagnosticsPane(ttk.Frame):
+    """Hidden admin pane (Ctrl+Shift+D in the admin panel): hot-path timing histograms and per-statement SQL counters."""
+    COLUMNS = (("count", 70), ("mean", 70), ("p50", 70), ("p95", 70), ("max", 70), ("total", 80))
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, padding="10", **kwargs)
+        self.parent = parent; self.enabled_var = tk.BooleanVar(value=instrumentation.is_enabled()); self._after_id = None
+        self._setup_widgets(); self._refresh()
+        self.parent.protocol("WM_DELETE_WINDOW", self._close)
+
+    def _setup_widgets(self):
+        self.grid_rowconfigure(1, weight=1); self.grid_columnconfigure(0, weight=1)
+        top = ttk.Frame(self); top.grid(row=0, column=0, sticky="ew", pady=(0, 5))
+        ttk.Checkbutton(top, text="Record timings", variable=self.enabled_var, command=lambda: instrumentation.enable(self.enabled_var.get())).pack(side=tk.LEFT)
+        ttk.Button(top, text="Save JSON...", command=self._save_json).pack(side=tk.RIGHT, padx=2); ttk.Button(top, text="Reset", command=self._reset).pack(side=tk.RIGHT, padx=2)
+        self.tree = ttk.Treeview(self, columns=[name for name, _ in self.COLUMNS]); self.tree.grid(row=1, column=0, sticky="nsew")
+        self.tree.heading("#0", text="Timer (ms)"); self.tree.column("#0", width=250)
+        for name, width in self.COLUMNS: self.tree.heading(name, text=name); self.tree.column(name, width=width, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview); scrollbar.grid(row=1, column=1, sticky="ns"); self.tree.config(yscrollcommand=scrollbar.set)
+        self.status_label = ttk.Label(self, text="", font=('Helvetica', 9, 'italic')); self.status_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
+
+    def _refresh(self):
+        """Re-reads the histograms and statement counters; repeats every DIAGNOSTICS_REFRESH_MS while open."""
+        from quiz_data import statement_stats
+        open_groups = {item for item in self.tree.get_children() if self.tree.item(item, "open")} if self.tree.get_children() else {"timers", "sql"}
+        self.tree.delete(*self.tree.get_children())
+        self.tree.insert("", tk.END, iid="timers", text="Timers", open="timers" in open_groups)
+        for h in instrumentation.histograms():
+            self.tree.insert("timers", tk.END, text=h.name, values=(h.count, f"{h.mean_ms:.2f}", f"{h.percentile_ms(0.5):.2f}", f"{h.percentile_ms(0.95):.2f}", f"{h.max_seconds * 1000:.2f}", f"{h.total_seconds * 1000:.1f}"))
+        self.tree.insert("", tk.END, iid="sql", text="SQL statements", open="sql" in open_groups)
+        for stats in statement_stats():
+            self.tree.insert("sql", tk.END, text=stats.name, values=(stats.calls, f"{stats.mean_ms:.3f}", "", "", f"{stats.max_seconds * 1000:.3f}", f"{stats.total_seconds * 1000:.1f}"))
+        self.status_label.config(text="Recording." if instrumentation.is_enabled() else "Timers are off (SQL counters always run). Tick 'Record timings' to start.")
+        self._after_id = self.after(DIAGNOSTICS_REFRESH_MS, self._refresh)
+
+    def _reset(self):
+        from quiz_data import reset_statement_stats
+        instrumentation.reset(); reset_statement_stats()
+        if self._after_id: self.after_cancel(self._after_id)
+        self._refresh()
+
+    def _save_json(self):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=self.parent, title="Save Timings", defaultextension=".json", initialfile="quiz_bowl_timings.json", filetypes=[("JSON", "*.json")])
+        if not path: return
+        try: instrumentation.dump_json(path); self.status_label.config(text=f"Saved to {path}")
+        except OSError as e: messagebox.showerror("Save Error", f"Could not save timings:\n{e}", parent=self.parent)
+
+    def _close(self):
+        if self._after_id: self.after_cancel(self._after_id)
+        self.parent.destroy()
 
 # --- Quiz App Class ---
 class QuizApp:
-    """Handles the quiz-taking UI and logic, supporting multiple display modes."""
-    def __init__(self, parent_window, db_connection):
-        self.quiz_window = parent_window; self.conn = db_connection
+    """Handles the quiz-taking UI and logic, supporting multiple display modes.
+    Questions come from the live database (db) or, when `snapshot` is given, from a memory-mapped QuestionSnapshot."""
+    def __init__(self, parent_window, db, worker, snapshot=None):
+        self.quiz_window = parent_window; self.db = db; self.worker = worker; self.snapshot = snapshot; self.closed = False
         self.quiz_window.title("Quiz Bowl"); self.quiz_window.geometry("700x600")
         self.style = ttk.Style(self.quiz_window); self.style.theme_use('clam')
-        self.topics = []; self.questions = []; self.current_question_index = 0; self.score = 0
+        self.topics = []; self.session = None # QuizSession: questions, answers and score of the current quiz
         self.selected_answer = tk.StringVar() # For one_by_one mode
         self.current_topic_name = ""; self.display_mode = tk.StringVar(value="one_by_one"); self.current_mode = "one_by_one"
-        self.all_answers_vars = {} # {q_index: StringVar} for all_at_once mode
+        self.quiz_length = tk.StringVar(value=QUIZ_LENGTH_CHOICES[0]); self.shuffle_options = tk.BooleanVar(value=False)
+        self.virtual_slots = [] # Recycled question widgets for all_at_once mode (only the visible ones exist)
+        self.virtual_layout = None; self._virtual_refreshing = False
         self.topic_frame = ttk.Frame(self.quiz_window, padding="10")
         self.quiz_frame = ttk.Frame(self.quiz_window, padding="10") # For active quiz UI
-        self.topics = fetch_topics(self.conn)
-        if not self.topics: messagebox.showerror("Init Error", "No topics found!", parent=self.quiz_window); self.quiz_window.destroy(); return
-        self._setup_topic_selection_ui()
         self.quiz_window.protocol("WM_DELETE_WINDOW", self._on_quiz_closing)
+        self.topic_frame.pack(fill=tk.BOTH, expand=True)
+        self.loading_label = ttk.Label(self.topic_frame, text="Loading topics...", font=('Helvetica', 12, 'italic')); self.loading_label.pack(pady=20)
+        self.worker.submit(self._job_fetch_topics, on_success=self._on_topics_loaded, on_error=lambda e: self._on_topics_loaded([]))
 
+    # Database jobs run on a DBWorker thread with a pooled read-only connection; callbacks run on the Tk thread.
+    def _job_fetch_topics(self):
+        if self.snapshot is not None: return self.snapshot.topics()
+        with self.db.reader() as conn: return fetch_topics(conn)
+
+    def _job_fetch_questions(self, topic_id, sample_size=None):
+        bank = self.snapshot if self.snapshot is not None else self.db.question_cache # Same get_topic/sample_topic interface
+        if sample_size: return bank.sample_topic(topic_id, sample_size) # Reads only the sampled rows
+        return bank.get_topic(topic_id) # Served from memory after the first quiz on a topic
+
+    def _job_start_adaptive(self, topic_id, topic_name, length, shuffle_options):
+        """Builds the topic's difficulty index (from ItemStats, or stored in the snapshot) and an adaptive session that picks from it."""
+        from adaptive_quiz import AdaptiveQuizSession, load_difficulty_index
+        index = self.snapshot.difficulty_index(topic_id) if self.snapshot is not None else load_difficulty_index(self.db, topic_id)
+        return AdaptiveQuizSession(index, length, topic_name, shuffle_options=shuffle_options)
+
+    def _on_topics_loaded(self, topics):
+        if self.closed: return # Window was closed while loading
+        self.topics = topics; self.loading_label.destroy()
+        if not self.topics: messagebox.showerror("Init Error", "No topics found!", parent=self.quiz_window); self._on_quiz_closing(); return
+        self._setup_topic_selection_ui()
+
+    @timed('build.quiz_topic_selection')
     def _setup_topic_selection_ui(self):
         """Sets up topic selection and display mode choice."""
         self.quiz_frame.pack_forget(); self.topic_frame.pack(fill=tk.BOTH, expand=True)
@@ -274,9 +663,16 @@ class QuizApp:
         mode_frame.pack(pady=(10, 10), padx=20, fill=tk.X)
         rb_one = ttk.Radiobutton(mode_frame, text="One Question at a Time", variable=self.display_mode, value="one_by_one"); rb_one.pack(anchor='w', pady=2)
         rb_all = ttk.Radiobutton(mode_frame, text="All Questions at Once", variable=self.display_mode, value="all_at_once"); rb_all.pack(anchor='w', pady=2)
-        start_button = ttk.Button(self.topic_frame, text="Start Quiz", command=self._start_quiz); start_button.pack(pady=(10, 20))
+        rb_adaptive = ttk.Radiobutton(mode_frame, text="Adaptive (next question matches your level)", variable=self.display_mode, value="adaptive"); rb_adaptive.pack(anchor='w', pady=2)
+        ttk.Checkbutton(mode_frame, text="Shuffle Answer Options", variable=self.shuffle_options).pack(anchor='w', pady=(6, 2))
+        length_frame = ttk.Frame(self.topic_frame); length_frame.pack(pady=(0, 10), padx=20, fill=tk.X)
+        ttk.Label(length_frame, text="Questions per Quiz:").pack(side=tk.LEFT)
+        ttk.Combobox(length_frame, textvariable=self.quiz_length, values=QUIZ_LENGTH_CHOICES, state="readonly", width=6).pack(side=tk.LEFT, padx=5)
+        self.start_button = ttk.Button(self.topic_frame, text="Start Quiz", command=self._start_quiz); self.start_button.pack(pady=(10, 0))
+        self.status_label = ttk.Label(self.topic_frame, text="", font=('Helvetica', 10, 'italic')); self.status_label.pack(pady=(5, 15))
         self.topic_listbox.focus_set()
 
+    @timed('event.quiz.start')
     def _start_quiz(self):
         """Starts quiz based on selections."""
         selected_indices = self.topic_listbox.curselection()
@@ -284,40 +680,69 @@ class QuizApp:
         selected_index = selected_indices[0]; selected_topic_row = self.topics[selected_index]
         selected_topic_id = selected_topic_row['id']; self.current_topic_name = selected_topic_row['name']
         self.current_mode = self.display_mode.get()
-        self.questions = fetch_questions_for_topic(self.conn, selected_topic_id) # Fetches list of Rows
-        if not self.questions: return # Stop if fetch failed or no questions
-        self.current_question_index = 0; self.score = 0; self.all_answers_vars.clear()
+        sample_size = int(self.quiz_length.get()) if self.quiz_length.get().isdigit() else None # None = whole topic
+        self.start_button.config(state=tk.DISABLED); self.status_label.config(text="Loading questions...")
+        if self.current_mode == "adaptive": # Questions are chosen during the quiz, so the length is passed instead of sampled
+            self.worker.submit(self._job_start_adaptive, selected_topic_id, self.current_topic_name, sample_size, self.shuffle_options.get(), on_success=self._on_adaptive_session_ready, on_error=self._on_questions_failed); return
+        self.worker.submit(self._job_fetch_questions, selected_topic_id, sample_size, on_success=self._on_questions_loaded, on_error=self._on_questions_failed)
+
+    def _on_questions_failed(self, error):
+        if self.closed: return
+        print(f"Database error fetching questions: {error}")
+        self.start_button.config(state=tk.NORMAL); self.status_label.config(text="")
+        messagebox.showwarning("Database Error", f"Could not load questions for the selected topic.\nError: {error}", parent=self.quiz_window)
+
+    @timed('event.quiz.questions_loaded')
+    def _on_questions_loaded(self, questions):
+        if self.closed: return
+        self.start_button.config(state=tk.NORMAL); self.status_label.config(text="")
+        if not questions: return # Stop if no questions
+        from quiz_engine import QuizSession
+        # Id order, or random order for a sampled quiz; option orders are drawn once here, not per render
+        self.session = QuizSession(questions, self.current_topic_name, shuffle_options=self.shuffle_options.get())
+        self._begin_quiz()
+
+    def _on_adaptive_session_ready(self, session):
+        if self.closed: return
+        self.start_button.config(state=tk.NORMAL); self.status_label.config(text="")
+        if not len(session): return # Topic has no questions
+        self.session = session; self._begin_quiz()
+
+    def _begin_quiz(self):
+        """Shows the first question(s) of self.session in the chosen mode."""
         self.topic_frame.pack_forget()
-        if self.current_mode == "one_by_one": self._setup_quiz_ui_one_by_one(); self._load_question_one_by_one()
+        if self.current_mode in ("one_by_one", "adaptive"): self._setup_quiz_ui_one_by_one(); self._load_question_one_by_one()
         else: self._setup_quiz_ui_all_at_once()
 
     # --- Methods for "One by One" Mode ---
+    @timed('build.quiz_one_by_one')
     def _setup_quiz_ui_one_by_one(self):
         """Sets up UI for one question at a time."""
         for widget in self.quiz_frame.winfo_children(): widget.destroy()
         self.quiz_frame.pack(fill=tk.BOTH, expand=True)
         self.topic_label = ttk.Label(self.quiz_frame, text=f"Topic: {self.current_topic_name}", font=('Helvetica', 14, 'bold')); self.topic_label.pack(pady=(5, 5))
         self.q_num_label = ttk.Label(self.quiz_frame, text="", font=('Helvetica', 10)); self.q_num_label.pack(pady=(0, 5))
-        total_questions = len(self.questions); self.running_score_label = ttk.Label(self.quiz_frame, text=f"Score: {self.score} / {total_questions}", font=('Helvetica', 10, 'bold')); self.running_score_label.pack(pady=(0, 10))
+        total_questions = len(self.session); self.running_score_label = ttk.Label(self.quiz_frame, text=f"Score: {self.session.score} / {total_questions}", font=('Helvetica', 10, 'bold')); self.running_score_label.pack(pady=(0, 10))
         self.question_label = tk.Message(self.quiz_frame, text="Loading...", font=('Helvetica', 12), width=650, justify=tk.LEFT); self.question_label.pack(pady=(5, 15), padx=10, fill=tk.X)
         self.options_frame = ttk.Frame(self.quiz_frame); self.options_frame.pack(pady=5, padx=20, anchor='w')
         self.radio_buttons = {}
-        for letter in ['A', 'B', 'C', 'D', 'E']: rb = ttk.Radiobutton(self.options_frame, text=f"{letter}.", variable=self.selected_answer, value=letter, command=self._enable_check_button); rb.pack(anchor='w', pady=2); self.radio_buttons[letter] = rb
+        for letter in OPTION_LETTERS: rb = ttk.Radiobutton(self.options_frame, text=f"{letter}.", variable=self.selected_answer, value=letter, command=self._enable_check_button); rb.pack(anchor='w', pady=2); self.radio_buttons[letter] = rb
         self.feedback_label = ttk.Label(self.quiz_frame, text="", font=('Helvetica', 11, 'italic')); self.feedback_label.pack(pady=(10, 5))
         self.button_frame = ttk.Frame(self.quiz_frame); self.button_frame.pack(pady=(10, 15))
         self.check_button = ttk.Button(self.button_frame, text="Check Answer", command=self._check_answer_one_by_one, state=tk.DISABLED); self.check_button.grid(row=0, column=0, padx=5)
         self.next_button = ttk.Button(self.button_frame, text="Next Question", command=self._next_question_one_by_one, state=tk.DISABLED); self.next_button.grid(row=0, column=1, padx=5)
 
+    @timed('event.quiz.show_question')
     def _load_question_one_by_one(self):
         """Loads current question for one-by-one mode."""
-        if 0 <= self.current_question_index < len(self.questions):
-            q_data = self.questions[self.current_question_index]
-            self.q_num_label.config(text=f"Question {self.current_question_index + 1} of {len(self.questions)}")
-            self.question_label.config(text=q_data['question_text'])
-            for letter, rb_widget in self.radio_buttons.items(): rb_widget.config(text=f"{letter}. {q_data[f'option_{letter.lower()}']}", state=tk.NORMAL)
+        q_data = self.session.current_question
+        if q_data is not None:
+            self.q_num_label.config(text=f"Question {self.session.current_index + 1} of {len(self.session)}")
+            self.question_label.config(text=q_data.text)
+            for letter, option_text in zip(OPTION_LETTERS, self.session.displayed_options(self.session.current_index)): self.radio_buttons[letter].config(text=f"{letter}. {option_text}", state=tk.NORMAL)
             self.selected_answer.set(""); self.feedback_label.config(text="")
             self.check_button.config(state=tk.DISABLED); self.next_button.config(state=tk.DISABLED)
-            if self.current_question_index == len(self.questions) - 1: self.next_button.config(text="Show Results")
+            if self.session.is_last_question: self.next_button.config(text="Show Results")
             else: self.next_button.config(text="Next Question")
         else: self._show_results()
 
@@ -328,6 +753,7 @@ class QuizApp:
         if self.next_button.instate(['disabled']): self.check_button.config(state=tk.NORMAL)
 
     # *** METHOD WITH CORRECTED SAFEGUARD ***
+    @timed('event.quiz.check_answer')
     def _check_answer_one_by_one(self):
         """Checks the answer for the current question in one-by-one mode."""
         # Check individual widgets first
@@ -349,12 +775,12 @@ class QuizApp:
 
         try:
             # Check index validity
-            if not (0 <= self.current_question_index < len(self.questions)):
-                print(f"Error: Invalid question index {self.current_question_index}")
+            if self.session.finished:
+                print(f"Error: Invalid question index {self.session.current_index}")
                 return # Avoid IndexError
 
-            q_data = self.questions[self.current_question_index] # Get the sqlite3.Row
-            correct_answer = q_data['correct_answer'].upper() # Use upper for comparison
+            index = self.session.current_index
+            is_correct, correct_answer = self.session.check_answer(user_answer) # Records the answer and updates the score
 
             # Disable radio buttons and check button
             for rb in self.radio_buttons.values(): # Iterate through widgets in the dict
@@ -363,18 +789,15 @@ class QuizApp:
             self.check_button.config(state=tk.DISABLED)
 
             # Check correctness and provide feedback
-            if user_answer == correct_answer:
-                self.score += 1
+            if is_correct:
                 self.feedback_label.config(text="Correct!", foreground='green')
             else:
-                correct_option_key = f"option_{correct_answer.lower()}"
-                # Check if the key exists before accessing, in case correct_answer is invalid
-                correct_text = q_data[correct_option_key] if correct_answer in ['A','B','C','D','E'] else "N/A"
+                correct_text = self.session.option_text(index, correct_answer) # "N/A" if correct_answer is invalid
                 self.feedback_label.config(text=f"Incorrect. Correct: {correct_answer}. {correct_text}", foreground='red')
 
             # Update the running score display
-            total_questions = len(self.questions)
-            self.running_score_label.config(text=f"Score: {self.score} / {total_questions}")
+            total_questions = len(self.session)
+            self.running_score_label.config(text=f"Score: {self.session.score} / {total_questions}")
 
             # Enable the Next button
             self.next_button.config(state=tk.NORMAL)
@@ -384,15 +807,19 @@ class QuizApp:
             print(f"ERROR inside check_answer_one_by_one logic: {type(e).__name__} - {e}")
             self.feedback_label.config(text="Error checking answer!", foreground='red')
 
+    @timed('event.quiz.next_question')
     def _next_question_one_by_one(self):
         """Loads next question."""
         if not self.next_button.winfo_exists(): return
-        self.current_question_index += 1; self._load_question_one_by_one()
+        self.session.next_question(); self._load_question_one_by_one()
 
     # --- Methods for "All At Once" Mode ---
-    # *** METHOD WITH CORRECTED SCROLLABLE FRAME WIDTH HANDLING ***
+    # The list is virtualized: every question gets a row in the canvas scroll region (VirtualRowLayout), but
+    # widgets exist only for the rows in view. A small pool of slots is re-pointed at other questions
+    # as the view scrolls, and answers live in the session (self.session.answers) rather than in widgets.
+    @timed('build.quiz_all_at_once')
     def _setup_quiz_ui_all_at_once(self):
-        """Sets up the UI for all-questions-at-once mode using a scrollable frame."""
+        """Sets up the UI for all-questions-at-once mode using a virtualized scrollable canvas."""
         for widget in self.quiz_frame.winfo_children(): widget.destroy()
         self.quiz_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -404,96 +831,176 @@ class QuizApp:
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
-        canvas = tk.Canvas(container)
+        self.virtual_canvas = canvas = tk.Canvas(container, highlightthickness=0)
         canvas.grid(row=0, column=0, sticky="nsew")
 
         scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
         scrollbar.grid(row=0, column=1, sticky="ns")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Frame inside the canvas to hold the actual content
-        self.scrollable_frame = ttk.Frame(canvas)
-        # Add frame to canvas using create_window and store the item ID
-        self.scrollable_frame_window_id = canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-
-        # Populate Scrollable Frame
-        self.all_answers_vars.clear() # Ensure it's empty before populating
-        for index, q_data in enumerate(self.questions):
-            q_frame = ttk.LabelFrame(self.scrollable_frame, text=f" Question {index + 1} ", padding="10")
-            # Make the question frame expand horizontally within the scrollable frame
-            q_frame.pack(pady=10, padx=10, fill=tk.X, expand=True) # Added expand=True
-
-            q_label = tk.Message(q_frame, text=q_data['question_text'], font=('Helvetica', 11), width=600, justify=tk.LEFT)
-            q_label.pack(anchor='w', pady=(0, 5))
-
-            answer_var = tk.StringVar() # Unique variable for this question's answer
-            self.all_answers_vars[index] = answer_var # Store it, keyed by question index
-            options_letters = ['A', 'B', 'C', 'D', 'E']
-            for letter in options_letters:
-                option_key = f"option_{letter.lower()}"
-                option_text = q_data[option_key]
-                rb = ttk.Radiobutton(q_frame, text=f"{letter}. {option_text}", variable=answer_var, value=letter)
-                rb.pack(anchor='w') # Pack options to the left
-
-        # Update scroll region AND frame width when canvas is configured
-        def on_canvas_configure(event):
-            # Update scroll region to encompass the entire scrollable_frame
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            # Update the width of the frame window on the canvas to match the canvas's width
-            canvas.itemconfig(self.scrollable_frame_window_id, width=event.width)
 
-        # Bind the configure event on the CANVAS to the function
+        # Any change of the visible region (scrollbar, wheel, resize) re-binds the slots
+        def on_view_change(first, last):
+            scrollbar.set(first, last)
+            self._refresh_virtual_rows()
+        canvas.configure(yscrollcommand=on_view_change)
+
+        self.virtual_slots = []; self.virtual_layout = VirtualRowLayout(len(self.session)); self._virtual_row_width = None
+        canvas.configure(scrollregion=(0, 0, 0, self.virtual_layout.offsets[-1]))
+
+        # Keep slot width equal to the canvas width; text re-wraps, so every row is measured again
+        def on_canvas_configure(event):
+            if event.width != self._virtual_row_width:
+                self._virtual_row_width = event.width; self.virtual_layout.measured.clear()
+                for slot in self.virtual_slots: self._size_virtual_slot(slot, event.width)
+            self._refresh_virtual_rows()
         canvas.bind('<Configure>', on_canvas_configure)
 
+        # Mouse wheel over the rows (Windows/macOS send <MouseWheel>, X11 sends Button-4/5)
+        self.quiz_window.bind("<MouseWheel>", lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.quiz_window.bind("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
+        self.quiz_window.bind("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
+        canvas.configure(yscrollincrement=VIRTUAL_ROW_HEIGHT // 4)
+
         # Submit Button (Outside Scrollable Area)
         submit_button = ttk.Button(self.quiz_frame, text="Submit Quiz", command=self._check_all_answers)
         submit_button.pack(pady=15) # Place below the scrollable container
 
+    def _create_virtual_slot(self):
+        """Creates one reusable question row (frame, text, five radio buttons)."""
+        canvas = self.virtual_canvas
+        slot = {'index': None}
+        slot['frame'] = ttk.LabelFrame(canvas, padding="10")
+        slot['message'] = tk.Message(slot['frame'], font=('Helvetica', 11), justify=tk.LEFT)
+        slot['message'].pack(anchor='w', pady=(0, 5))
+        slot['var'] = tk.StringVar()
+        slot['radios'] = {}
+        for letter in OPTION_LETTERS:
+            rb = ttk.Radiobutton(slot['frame'], variable=slot['var'], value=letter, style='QuizOption.TRadiobutton',
+                                 command=lambda s=slot: self._on_virtual_answer(s))
+            rb.pack(anchor='w') # Pack options to the left
+            slot['radios'][letter] = rb
+        slot['window_id'] = canvas.create_window(0, 0, window=slot['frame'], anchor="nw",
+                                                 width=canvas.winfo_width(), height=VIRTUAL_ROW_HEIGHT - VIRTUAL_ROW_GAP)
+        self._size_virtual_slot(slot, canvas.winfo_width())
+        self.virtual_slots.append(slot)
+        return slot
+
+    def _size_virtual_slot(self, slot, width):
+        """Wraps the slot's question and option text to the row width (instead of clipping it)."""
+        self.virtual_canvas.itemconfig(slot['window_id'], width=width)
+        text_width = max(width - 40, 100) # Less the frame's padding and border
+        slot['message'].config(width=text_width)
+        self.style.configure('QuizOption.TRadiobutton', wraplength=text_width - 30) # ttk wraps via the style; less the indicator
+
+    @timed('event.quiz.scroll')
+    def _refresh_virtual_rows(self):
+        """Points the slot pool at the questions currently in view, creating slots only if the view grew."""
+        canvas = getattr(self, 'virtual_canvas', None)
+        if canvas is None or not canvas.winfo_exists() or not self.session or self._virtual_refreshing: return
+        self._virtual_refreshing = True # Measuring runs idle tasks, which may call back in here
+        try:
+            for _ in range(VIRTUAL_LAYOUT_PASSES):
+                top = canvas.canvasy(0); view_height = max(canvas.winfo_height(), 1)
+                visible = set(self.virtual_layout.visible_range(top, top + view_height))
+                while len(self.virtual_slots) < len(visible): self._create_virtual_slot()
+                # Keep slots already showing a visible question where they are; re-point only the rest
+                free_slots = [slot for slot in self.virtual_slots if slot['index'] not in visible]
+                shown = {slot['index'] for slot in self.virtual_slots if slot['index'] in visible}
+                for index in sorted(visible - shown): self._bind_virtual_slot(free_slots.pop(), index)
+                for slot in free_slots:
+                    slot['index'] = None; canvas.itemconfig(slot['window_id'], state='hidden')
+                if not self._measure_virtual_rows(): break
+        finally:
+            self._virtual_refreshing = False
 
+    def _measure_virtual_rows(self):
+        """Gives newly shown rows their wrapped height and moves every shown row to its offset; True if the layout changed."""
+        canvas = self.virtual_canvas; layout = self.virtual_layout
+        shown = [slot for slot in self.virtual_slots if slot['index'] is not None]
+        unmeasured = [slot for slot in shown if slot['index'] not in layout.measured]
+        changed = False
+        if unmeasured:
+            canvas.update_idletasks() # Lay out the new text so the frames report their wrapped height
+            for slot in unmeasured: changed |= layout.set_height(slot['index'], slot['frame'].winfo_reqheight() + VIRTUAL_ROW_GAP)
+        if changed: canvas.configure(scrollregion=(0, 0, 0, layout.offsets[-1]))
+        for slot in shown:
+            canvas.coords(slot['window_id'], 0, layout.offsets[slot['index']])
+            canvas.itemconfig(slot['window_id'], height=layout.heights[slot['index']] - VIRTUAL_ROW_GAP)
+        return changed
+
+    def _bind_virtual_slot(self, slot, index):
+        """Shows question `index` in `slot`."""
+        q_data = self.session.questions[index]
+        slot['index'] = index
+        slot['frame'].config(text=f" Question {index + 1} ")
+        slot['message'].config(text=q_data.text)
+        for letter, option_text in zip(OPTION_LETTERS, self.session.displayed_options(index)): slot['radios'][letter].config(text=f"{letter}. {option_text}")
+        slot['var'].set(self.session.displayed_answer(index)) # "" clears the previous question's selection
+        self.virtual_canvas.itemconfig(slot['window_id'], state='normal') # Placed by _measure_virtual_rows()
+
+    def _on_virtual_answer(self, slot):
+        """Stores a radio selection in the session (the slot may show another question later)."""
+        if slot['index'] is not None: self.session.select_answer(slot['index'], slot['var'].get())
+
+    @timed('event.quiz.check_all')
     def _check_all_answers(self):
         """Checks all answers for all-at-once mode."""
-        self.score = 0; all_answered = True
-        for index, q_data in enumerate(self.questions):
-            user_answer = self.all_answers_vars.get(index, tk.StringVar()).get()
-            if not user_answer: all_answered = False; continue # Score unanswered as incorrect
-            correct_answer = q_data['correct_answer'].upper()
-            if user_answer == correct_answer: self.score += 1
-        if not all_answered: messagebox.showwarning("Incomplete", "Unanswered questions count as incorrect.", parent=self.quiz_window)
+        unanswered = self.session.grade() # Unanswered questions are scored as incorrect
+        if unanswered: messagebox.showwarning("Incomplete", "Unanswered questions count as incorrect.", parent=self.quiz_window)
         self._show_results() # Show results after checking all
 
     # --- Common Methods ---
+    @timed('event.quiz.results')
     def _show_results(self):
         """Displays final results (used by both modes)."""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.quiz_window.unbind(sequence) # All-at-once scrolling
+        self.virtual_canvas = None; self.virtual_slots = []; self.virtual_layout = None
+        if self.session and self.db: self.db.attempt_log.submit(self.session) # Buffered in memory; written in the background (not in snapshot mode)
         for widget in self.quiz_frame.winfo_children(): widget.destroy()
         self.quiz_frame.pack(fill=tk.BOTH, expand=True) # Ensure frame is visible
         ttk.Label(self.quiz_frame, text="Quiz Finished!", font=('Helvetica', 16, 'bold')).pack(pady=10)
-        total_questions = len(self.questions); result_text = ""; status_text = ""; status_color = "black"
+        total_questions = len(self.session) if self.session else 0; result_text = ""; status_text = ""; status_color = "black"
         if total_questions > 0:
-            percentage = (self.score / total_questions) * 100
-            if percentage >= PASS_THRESHOLD: status = "Pass"; status_color = "green"
+            percentage = self.session.percentage # Pass mark is quiz_engine.PASS_THRESHOLD
+            if self.session.passed: status = "Pass"; status_color = "green"
             else: status = "Fail"; status_color = "red"
-            result_text = f"Your final score: {self.score} out of {total_questions} ({percentage:.1f}%)"; status_text = f"Result: {status}"
+            result_text = f"Your final score: {self.session.score} out of {total_questions} ({percentage:.1f}%)"; status_text = f"Result: {status}"
         else: result_text = "No questions were asked."
         ttk.Label(self.quiz_frame, text=result_text, font=('Helvetica', 14)).pack(pady=5)
         if status_text: ttk.Label(self.quiz_frame, text=status_text, font=('Helvetica', 14, 'bold'), foreground=status_color).pack(pady=5)
+        if self.session and self.session.seed is not None: ttk.Label(self.quiz_frame, text=f"Option order seed: {self.session.seed}", font=('Helvetica', 9, 'italic')).pack(pady=2)
         close_button = ttk.Button(self.quiz_frame, text="Close Quiz", command=self._on_quiz_closing); close_button.pack(pady=20)
 
     def _on_quiz_closing(self):
         """Handles quiz window closing."""
+        self.closed = True # Pending database callbacks check this and do nothing
         if self.quiz_window.grab_status() != "none": self.quiz_window.grab_release()
         self.quiz_window.destroy()
 
 # --- Main Application Class ---
 class MainApp:
     """Main application controller."""
-    def __init__(self, root):
+    def __init__(self, root, snapshot_file=None, db_file=DATABASE_FILE):
         self.root = root; self.root.title("Quiz Bowl Application"); self.root.geometry("700x650")
-        self.db_connection = connect_db()
-        if not self.db_connection: self.root.destroy(); return
+        self.db = None; self.snapshot = None; self.worker = None
         self.style = ttk.Style(self.root); self.style.theme_use('clam')
         self.start_screen = None; self.admin_panel = None
         self._create_start_screen()
         self.root.protocol("WM_DELETE_WINDOW", self._on_app_closing)
+        # The start screen is shown first; the question bank is opened from the first idle callback, after it is drawn.
+        # Button clicks queue behind that callback, so they always find the bank open (or the app closed).
+        self.root.after_idle(self._open_bank, snapshot_file, db_file)
+
+    def _open_bank(self, snapshot_file, db_file):
+        """Opens the database (or the snapshot) and starts the DBWorker pool; closes the app if that fails."""
+        from db_worker import DBWorker
+        if snapshot_file: # Quiz-only (kiosk) mode: no database, questions come from the snapshot
+            from question_snapshot import QuestionSnapshot, SnapshotError
+            try: self.snapshot = QuestionSnapshot(snapshot_file); self.root.title("Quiz Bowl Application (snapshot)")
+            except (SnapshotError, OSError) as e: messagebox.showerror("Snapshot Error", f"Could not open snapshot:\n{e}"); self.root.destroy(); return
+        else:
+            self.db = connect_db(db_file)
+            if not self.db: self.root.destroy(); return
+        self.worker = DBWorker(self.root) # Background thread pool for all database work
 
     def _create_start_screen(self):
         if self.admin_panel: self.admin_panel.pack_forget()
@@ -501,10 +1008,12 @@ class MainApp:
         self.start_screen.pack(fill=tk.BOTH, expand=True)
 
     def show_admin_panel(self):
+        if self.db is None: messagebox.showinfo("Snapshot Mode", "The admin panel needs the live database.\nThis app was started from a question snapshot.", parent=self.root); return
+        from tkinter import simpledialog
         password = simpledialog.askstring("Password Required", "Enter Admin Password:", parent=self.root, show='*')
         if password == PASSWORD:
             if self.start_screen: self.start_screen.pack_forget()
-            if not self.admin_panel: self.admin_panel = AdminPanel(self.root, self.db_connection, back_callback=self.show_start_screen, style=self.style)
+            if not self.admin_panel: self.admin_panel = AdminPanel(self.root, self.db, self.worker, back_callback=self.show_start_screen, style=self.style)
             self.admin_panel.pack(fill=tk.BOTH, expand=True)
         elif password is not None: messagebox.showerror("Access Denied", "Incorrect password.", parent=self.root)
 
@@ -528,17 +1037,28 @@ class MainApp:
         if not quiz_window_exists:
              quiz_toplevel_window = tk.Toplevel(self.root)
              quiz_toplevel_window.grab_set() # Make modal
-             quiz_app_instance = QuizApp(quiz_toplevel_window, self.db_connection) # Instantiates the updated QuizApp
+             quiz_app_instance = QuizApp(quiz_toplevel_window, self.db, self.worker, snapshot=self.snapshot) # Instantiates the updated QuizApp
 
     def _on_app_closing(self):
         """Handles application close."""
-        if self.db_connection:
-             try: self.db_connection.close(); print("Main database connection closed.")
+        if self.worker: self.worker.shutdown()
+        if self.db:
+             import sqlite3
+             try: self.db.close(); print("Main database connection closed.")
              except sqlite3.Error as e: print(f"Error closing database connection: {e}")
+        if self.snapshot: self.snapshot.close()
+        timings_file = os.environ.get(instrumentation.TIMINGS_ENV)
+        if timings_file:
+            try: instrumentation.dump_json(timings_file); print(f"Timings written to '{timings_file}'.")
+            except OSError as e: print(f"Error writing timings: {e}")
         self.root.destroy()
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz Bowl application (admin panel and quizzes).")
+    parser.add_argument('--db', default=DATABASE_FILE, help=f"SQLite database file (default: {DATABASE_FILE}).")
+    parser.add_argument('--snapshot', help="Take quizzes from a question_snapshot.py snapshot instead of the database (no admin panel).")
+    args = parser.parse_args()
     main_window = tk.Tk()
-    app = MainApp(main_window)
+    app = MainApp(main_window, snapshot_file=args.snapshot, db_file=args.db)
     main_window.mainloop()
\ No newline at end of file
@@ -1,8 +1,25 @@
 import sqlite3
 import os
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from db_connection import connect
+from question_dedup import build_duplicate_index, question_signature
+from question import Question, QuestionError, OPTION_LETTERS
+from quiz_data import STATEMENTS, execute_many, fetch_all, fetch_questions_by_ids
+from schema_migrations import SQL_CREATE_QUESTIONS_TABLE, apply_schema, migrate
 
 # --- Configuration ---
 DATABASE_FILE = 'quiz_bowl_app.db'
+DEFAULT_BATCH_SIZE = 5000 # Rows per executemany batch / transaction
+PROGRESS_EVERY = 100000 # Print a progress line every N inserted rows
+SQL_VARIABLE_CHUNK = 500 # Max ids per 'IN (...)' lookup (stays under SQLite's variable limit)
+IMPORT_CHUNK_BYTES = 4 * 1024 * 1024 # JSONL files are parsed in byte ranges of this size by the parallel importer
 # Ensure topic names exactly match those in the Topics table
 # (Case-sensitive)
 TOPICS = [
@@ -409,16 +426,13 @@ finance_questions = [
 ]
 ALL_QUESTIONS_DATA.extend(finance_questions)
 
-
 # --- Database Functions ---
 def create_connection(db_file):
     """ Create a database connection to the SQLite database specified by db_file """
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file)
         print(f"SQLite connection established to {db_file}")
-        # Enable foreign key constraint enforcement
-        conn.execute("PRAGMA foreign_keys = ON;")
         return conn
     except sqlite3.Error as e:
         print(f"Error connecting to database: {e}")
@@ -450,34 +464,592 @@ def get_topic_id(conn, topic_name):
         print(f"Error retrieving topic ID for '{topic_name}': {e}")
         return None
 
-def add_question(conn, topic_id, q_data):
-    """ Add a single question to the Questions table """
-    sql = ''' INSERT INTO Questions(topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer)
-              VALUES(?,?,?,?,?,?,?,?) '''
+def add_question(conn, topic_id, q_data, duplicate_index=None):
+    """
+    Add a single question to the Questions table
+    :param duplicate_index: optional question_dedup.DuplicateIndex; near-duplicates of indexed questions are not inserted
+    """
+    try:
+        question = record_to_question(q_data, topic_id)
+        source_key = record_source_key(q_data['topic'], question.text, q_data.get('source_id'))
+    except KeyError as e:
+        print(f"Error: Missing key in question data: {e}\nData: {q_data}")
+        return None
+    except QuestionError as e:
+        print(f"Error: Invalid question data ({e})\nData: {q_data}")
+        return None
+    signature = None
+    if duplicate_index is not None:
+        signature = question_signature(question.text, question.options)
+        duplicates = duplicate_index.find_duplicates(signature, first=True)
+        if duplicates:
+            print(f"Skipping near-duplicate of question ID {duplicates[0][0]} ({duplicates[0][1]:.0%} similar): {question.text[:60]}")
+            return None
+    sql = STATEMENTS['insert_source_question']
+    fields = question.content_fields()
     cursor = conn.cursor()
     try:
-        cursor.execute(sql, (
-            topic_id,
-            q_data['question'],
-            q_data['A'],
-            q_data['B'],
-            q_data['C'],
-            q_data['D'],
-            q_data['E'],
-            q_data['correct']
-        ))
+        cursor.execute(sql, (topic_id, *fields, source_key, record_content_hash(fields)))
         # Removed commit from here to commit once after all insertions
+        if cursor.rowcount == 0:
+            print(f"Skipping question already in the bank: {question.text[:60]}")
+            return None
+        if duplicate_index is not None:
+            duplicate_index.add(cursor.lastrowid, signature)
         return cursor.lastrowid # Return the id of the inserted question
     except sqlite3.Error as e:
         print(f"Error adding question: {e}\nData: {q_data}")
         return None
-    except KeyError as e:
-        print(f"Error: Missing key in question data: {e}\nData: {q_data}")
+
+
+# --- Bulk Import Functions ---
+def iter_question_records(file_path):
+    """
+    Stream question records from a CSV or JSONL export, one dictionary at a time.
+    Records use the same keys as ALL_QUESTIONS_DATA:
+    'topic', 'question', 'A', 'B', 'C', 'D', 'E', 'correct', plus an optional stable 'source_id' (see record_source_key).
+    :param file_path: path to a .csv, .jsonl or .ndjson file
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(file_path, newline='', encoding='utf-8') as f:
+        if extension == '.csv':
+            for record in csv.DictReader(f):
+                yield record
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Warning: Bad JSON on line {line_number} of '{file_path}': {e}")
+                    yield None # Counted as skipped by the importer
+        else:
+            raise ValueError(f"Unsupported import file type '{extension}' (expected .csv or .jsonl).")
+
+def load_topic_map(conn):
+    """ Build the topic name -> id map once, instead of one SELECT per question """
+    return dict(fetch_all(conn, 'topic_ids_by_name'))
+
+def record_to_question(q_data, topic_id):
+    """
+    Build a validated Question from an import record ('question', 'A'-'E', 'correct' keys).
+    :raises KeyError: if a key is missing; QuestionError: if a field is invalid
+    """
+    return Question.create(q_data['question'], [q_data[letter] for letter in OPTION_LETTERS], q_data['correct'], topic_id=topic_id)
+
+def question_params(topic_map, q_data):
+    """
+    Convert one question record into a parameter tuple for the 'insert_source_question' statement:
+    (topic_id, question_text, option_a..option_e, correct_answer, source_key, content_hash).
+    :return: parameter tuple, or None if the record cannot be inserted
+    """
+    if not isinstance(q_data, dict):
+        return None
+    topic_id = topic_map.get(q_data.get('topic'))
+    if topic_id is None:
+        return None
+    try:
+        question = record_to_question(q_data, topic_id)
+    except (KeyError, QuestionError):
         return None
+    fields = question.content_fields()
+    return (topic_id, *fields, record_source_key(q_data['topic'], question.text, q_data.get('source_id')), record_content_hash(fields))
+
+def _insert_batch(conn, sql, batch, duplicate_index=None, keys=None):
+    """
+    Insert one batch inside an explicit transaction.
+    If the batch fails as a whole, or some rows are already in the bank (same source_key, see
+    'insert_source_question'), retry it row by row so each such row only skips itself.
+    :param duplicate_index, keys: the near-duplicate index and each row's key in it; rows that fail are removed
+                                  again, so they cannot mark later records as duplicates
+    :return: (added, skipped)
+    """
+    try:
+        conn.execute("BEGIN")
+        if conn.executemany(sql, batch).rowcount == len(batch):
+            conn.commit()
+            return len(batch), 0
+        conn.rollback() # Some rows were already imported; find out which
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Warning: Batch insert failed ({e}); retrying {len(batch)} rows individually.")
+    added = 0
+    conn.execute("BEGIN")
+    for position, params in enumerate(batch):
+        try:
+            inserted = conn.execute(sql, params).rowcount == 1
+            if not inserted:
+                print(f"Skipping question already in the bank: {params[1][:60]}")
+        except sqlite3.Error as e:
+            print(f"Error adding question: {e}\nData: {params}")
+            inserted = False
+        if inserted:
+            added += 1
+        elif duplicate_index is not None:
+            duplicate_index.remove(keys[position])
+    conn.commit()
+    return added, len(batch) - added
+
+def _index_import_record(duplicate_index, params, record_number, signature=None):
+    """
+    Check one INSERT parameter tuple against the index; unique records are added to it
+    (keyed by their position in the import, since they have no id yet) so duplicates within the import are caught too.
+    :param signature: the record's question_signature(), if already computed (e.g. by an import worker)
+    :return: the record's key in the index, or None if it is a near-duplicate
+    """
+    if signature is None:
+        signature = question_signature(params[1], params[2:7])
+    duplicates = duplicate_index.find_duplicates(signature, first=True)
+    if duplicates:
+        match, similarity = duplicates[0]
+        source = f"question ID {match}" if isinstance(match, int) else f"import record {match[2]}"
+        print(f"Skipping near-duplicate of {source} ({similarity:.0%} similar): {params[1][:60]}")
+        return None
+    key = ('import', len(duplicate_index), record_number) # Unique even across several files
+    duplicate_index.add(key, signature)
+    return key
+
+def bulk_import_questions(conn, records, batch_size=DEFAULT_BATCH_SIZE, progress_every=PROGRESS_EVERY, duplicate_index=None):
+    """
+    Insert question records in executemany batches.
+    :param conn: Connection object
+    :param records: any iterable of question dictionaries (e.g. iter_question_records())
+    :param batch_size: number of rows per executemany/transaction
+    :param progress_every: print a rows/sec progress line every N rows (0 to disable)
+    :param duplicate_index: optional question_dedup.DuplicateIndex; near-duplicates of indexed questions
+                            (or of earlier records in this import) are skipped
+    :return: (added_count, skipped_count, elapsed_seconds)
+    """
+    sql = STATEMENTS['insert_source_question']
+    topic_map = load_topic_map(conn)
+    if conn.in_transaction:
+        conn.commit() # Start from a clean transaction state
+    added_count = 0
+    skipped_count = 0
+    next_progress = progress_every
+    batch = []
+    batch_keys = [] # Each row's key in duplicate_index
+    start_time = time.perf_counter()
+
+    for record_number, q_data in enumerate(records, start=1):
+        params = question_params(topic_map, q_data)
+        if params is None:
+            skipped_count += 1
+            continue
+        if duplicate_index is not None:
+            key = _index_import_record(duplicate_index, params, record_number)
+            if key is None:
+                skipped_count += 1
+                continue
+            batch_keys.append(key)
+        batch.append(params)
+        if len(batch) >= batch_size:
+            added, skipped = _insert_batch(conn, sql, batch, duplicate_index, batch_keys)
+            added_count += added
+            skipped_count += skipped
+            batch = []
+            batch_keys = []
+            if progress_every and added_count >= next_progress:
+                elapsed = time.perf_counter() - start_time
+                print(f"  ... {added_count} rows inserted ({added_count / elapsed:,.0f} rows/sec)")
+                next_progress += progress_every
+
+    if batch:
+        added, skipped = _insert_batch(conn, sql, batch, duplicate_index, batch_keys)
+        added_count += added
+        skipped_count += skipped
+
+    return added_count, skipped_count, time.perf_counter() - start_time
+
+def print_import_summary(added_count, skipped_count, elapsed):
+    """ Print the summary block shared by the rebuild and import modes """
+    print("\n--- Summary ---")
+    print(f"Successfully added {added_count} questions.")
+    if elapsed > 0:
+        print(f"Import rate: {added_count / elapsed:,.0f} rows/sec ({elapsed:.2f} s).")
+    if skipped_count > 0:
+        print(f"Skipped {skipped_count} questions (due to errors, missing topics, invalid fields, near-duplicates or questions already in the bank). Check warnings above.")
+    print(f"Database '{DATABASE_FILE}' has been populated.")
+
+
+# --- Parallel Import Functions ---
+# Parsing and validating records is CPU-bound, so it runs in a process pool. Each worker task is one
+# chunk of one file and returns its INSERT parameter tuples (plus near-duplicate signatures if needed).
+# The parent process is the only writer: it checks duplicates and inserts the rows in file order.
+_worker_topic_map = None # Set in each worker process by _init_import_worker()
+_worker_signatures = False
+
+def plan_import_chunks(file_path, chunk_bytes=IMPORT_CHUNK_BYTES):
+    """
+    Split one import file into worker tasks (file_path, start byte, end byte).
+    JSONL files are split into byte ranges; a CSV file is one task (a quoted field may span lines).
+    :raises OSError: if the file cannot be read; ValueError: for an unsupported file type
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in ('.csv', '.jsonl', '.ndjson'):
+        raise ValueError(f"Unsupported import file type '{extension}' (expected .csv or .jsonl).")
+    size = os.path.getsize(file_path)
+    if extension == '.csv' or size <= chunk_bytes:
+        return [(file_path, 0, None)]
+    return [(file_path, start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+def iter_chunk_records(file_path, start, end):
+    """
+    Stream the records of one task from plan_import_chunks(). A JSONL line belongs to the chunk it starts in.
+    """
+    if end is None:
+        yield from iter_question_records(file_path)
+        return
+    with open(file_path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline() # Skip the rest of the line that started in the previous chunk
+        position = f.tell()
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            line_start = position
+            position += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"Warning: Bad JSON at byte {line_start} of '{file_path}': {e}")
+                yield None # Counted as skipped by the importer
+
+def _init_import_worker(topic_map, with_signatures):
+    global _worker_topic_map, _worker_signatures
+    _worker_topic_map = topic_map
+    _worker_signatures = with_signatures
+
+def _validate_chunk(task):
+    """
+    Worker task: parse and validate one chunk (the checks of Question.create(), like the admin form).
+    :return: (INSERT parameter tuples, signatures or [], records read, records skipped, seconds)
+    """
+    start_time = time.perf_counter()
+    rows = []
+    signatures = []
+    records = skipped = 0
+    for q_data in iter_chunk_records(*task):
+        records += 1
+        params = question_params(_worker_topic_map, q_data)
+        if params is None:
+            skipped += 1
+            continue
+        rows.append(params)
+        if _worker_signatures:
+            signatures.append(question_signature(params[1], params[2:7]))
+    return rows, signatures, records, skipped, time.perf_counter() - start_time
+
+def parallel_import_questions(conn, file_paths, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                              chunk_bytes=IMPORT_CHUNK_BYTES, duplicate_index=None):
+    """
+    Import CSV/JSONL files with parsing and validation spread over a process pool.
+    Validated rows stream back chunk by chunk (in file order) to this process, which inserts them in
+    executemany batches as in bulk_import_questions(). At most two chunks per worker are in flight at once,
+    so memory stays bounded however large the files are.
+    :param workers: number of worker processes (None: one per CPU)
+    :param duplicate_index: optional question_dedup.DuplicateIndex; workers compute the signatures
+    :return: (added_count, skipped_count, elapsed_seconds, stages) where stages holds per-stage totals:
+             'files', 'chunks', 'records', 'parse_seconds' (summed over workers), 'dedup_seconds', 'write_seconds'
+    """
+    sql = STATEMENTS['insert_source_question']
+    topic_map = load_topic_map(conn)
+    if conn.in_transaction:
+        conn.commit() # Start from a clean transaction state
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    files = 0
+    for file_path in file_paths:
+        try:
+            tasks.extend(plan_import_chunks(file_path, chunk_bytes))
+            files += 1
+        except (OSError, ValueError) as e:
+            print(f"Error importing '{file_path}': {e}")
+    stages = {'files': files, 'chunks': len(tasks), 'records': 0, 'parse_seconds': 0.0, 'dedup_seconds': 0.0, 'write_seconds': 0.0}
+    added_count = 0
+    skipped_count = 0
+    batch = []
+    batch_keys = [] # Each row's key in duplicate_index
+    start_time = time.perf_counter()
+
+    def write(rows, keys):
+        nonlocal added_count, skipped_count
+        write_start = time.perf_counter()
+        added, skipped = _insert_batch(conn, sql, rows, duplicate_index, keys)
+        stages['write_seconds'] += time.perf_counter() - write_start
+        added_count += added
+        skipped_count += skipped
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_import_worker,
+                             initargs=(topic_map, duplicate_index is not None)) as executor:
+        task_iter = iter(tasks)
+        in_flight = deque((task, executor.submit(_validate_chunk, task)) for task in itertools.islice(task_iter, 2 * workers))
+        while in_flight:
+            task, future = in_flight.popleft()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                in_flight.append((next_task, executor.submit(_validate_chunk, next_task)))
+            try:
+                rows, signatures, records, skipped, seconds = future.result()
+            except (OSError, ValueError) as e:
+                print(f"Error importing '{task[0]}' (bytes {task[1]}-{task[2] or 'end'}): {e}")
+                continue
+            first_record = stages['records'] + 1
+            stages['records'] += records
+            stages['parse_seconds'] += seconds
+            skipped_count += skipped
+            if duplicate_index is not None:
+                dedup_start = time.perf_counter()
+                unique_rows = []
+                for record_number, (params, signature) in enumerate(zip(rows, signatures), start=first_record):
+                    key = _index_import_record(duplicate_index, params, record_number, signature)
+                    if key is not None:
+                        unique_rows.append(params)
+                        batch_keys.append(key)
+                skipped_count += len(rows) - len(unique_rows)
+                rows = unique_rows
+                stages['dedup_seconds'] += time.perf_counter() - dedup_start
+            batch.extend(rows)
+            while len(batch) >= batch_size:
+                write(batch[:batch_size], batch_keys[:batch_size])
+                del batch[:batch_size]
+                del batch_keys[:batch_size]
+    if batch:
+        write(batch, batch_keys)
+
+    return added_count, skipped_count, time.perf_counter() - start_time, stages
+
+def print_stage_summary(stages, elapsed, workers):
+    """ Print per-stage throughput of a parallel import """
+    def rate(count, seconds):
+        return f"{count / seconds:,.0f}" if seconds > 0 else "n/a"
+    print("\n--- Import Stages ---")
+    print(f"Planned {stages['chunks']} chunks from {stages['files']} files for {workers} worker processes.")
+    print(f"Parse + validate: {stages['records']} records in {stages['parse_seconds']:.2f} worker-seconds "
+          f"({rate(stages['records'], stages['parse_seconds'])} records/sec per worker).")
+    if stages['dedup_seconds'] > 0:
+        print(f"Near-duplicate check: {stages['dedup_seconds']:.2f} s in the writer.")
+    print(f"Insert: {stages['write_seconds']:.2f} s in the writer.")
+    print(f"End to end: {rate(stages['records'], elapsed)} records/sec ({elapsed:.2f} s wall).")
+
+
+# --- Incremental Sync Functions ---
+def record_source_key(topic_name, question_text, source_id=None):
+    """
+    Stable identity of a source record, independent of later admin edits.
+    A record's own 'source_id' field (e.g. an id from the system that exports the bank) is used when present,
+    so its wording can change freely; otherwise the identity is its topic and question text.
+    """
+    identity = f"id\x1f{source_id}" if source_id not in (None, '') else f"{topic_name}\x1f{question_text}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+def record_content_hash(fields):
+    """ Hash of (question_text, option_a..option_e, correct_answer) """
+    return hashlib.sha1("\x1f".join(fields).encode('utf-8')).hexdigest()
+
+def _locally_modified_ids(conn, stored_hashes):
+    """
+    Return the ids whose current content no longer matches the hash stored by the last sync,
+    i.e. rows an admin has edited since.
+    :param stored_hashes: {question_id: content_hash}
+    """
+    modified = set()
+    ids = list(stored_hashes)
+    for start in range(0, len(ids), SQL_VARIABLE_CHUNK):
+        for row in fetch_questions_by_ids(conn, ids[start:start + SQL_VARIABLE_CHUNK]):
+            if record_content_hash(row[2:]) != stored_hashes[row[0]]: # row: id, topic_id, question_text ... correct_answer
+                modified.add(row[0])
+    return modified
+
+def _pair_reworded_records(missing_rows, inserts):
+    """
+    Match synced rows that disappeared from the source with new source records that look like the same question
+    reworded: same topic, options and correct answer. Only unambiguous pairs (one row and one record for that content)
+    are matched, so such a record updates its row, and keeps its id and statistics, instead of replacing it.
+    :param missing_rows: {source_key: (question_id, content_hash, topic_id, option_a..option_e, correct_answer)}
+    :param inserts: list of 'insert_source_question' parameter tuples; paired records are removed from it
+    :return: {question_id: (stored_hash, rekeying UPDATE parameters)}
+    """
+    rows_by_content = {}
+    for key, (q_id, stored_hash, *content) in missing_rows.items():
+        rows_by_content.setdefault(tuple(content), []).append((key, q_id, stored_hash))
+    records_by_content = {}
+    for position, params in enumerate(inserts):
+        records_by_content.setdefault((params[0], *params[2:8]), []).append(position)
+
+    pairs = {}; paired_positions = set()
+    for content, rows in rows_by_content.items():
+        positions = records_by_content.get(content, [])
+        if len(rows) == 1 and len(positions) == 1:
+            key, q_id, stored_hash = rows[0]
+            params = inserts[positions[0]]
+            pairs[q_id] = (stored_hash, (*params[1:], q_id))
+            paired_positions.add(positions[0])
+            del missing_rows[key]
+    inserts[:] = [params for position, params in enumerate(inserts) if position not in paired_positions]
+    return pairs
+
+def sync_questions(conn, records, force=False):
+    """
+    Bring the Questions table in line with a complete source bank, writing only the delta.
+    - New source records are INSERTed.
+    - Records whose content hash changed are UPDATEd. A record whose question text changed has a new source_key
+      (unless it carries a 'source_id'), but if it is the only new record with the topic, options and correct answer
+      of a row that disappeared from the source, that row is updated in place and keeps its id and statistics.
+    - Synced rows that disappeared from the source are DELETEd.
+    Rows edited by an admin since the last sync are left alone unless force is True.
+    Rows without a source_key (created in the admin panel) are never touched unless force is True, in which case
+    a row matching a source record by topic and question text is adopted: overwritten with the record and managed
+    by later syncs. Without force such records are skipped, not inserted again as duplicates.
+    :return: dictionary of counts plus 'elapsed' seconds
+    """
+    start_time = time.perf_counter()
+    migrate(conn) # Adds the source_key/content_hash columns to older databases
+    topic_map = load_topic_map(conn)
+
+    synced_rows = {row[0]: row[1:] for row in fetch_all(conn, 'synced_questions')}
+    unmanaged_rows = {(topic_id, text): q_id for topic_id, text, q_id in fetch_all(conn, 'unmanaged_questions')}
+
+    inserts = []; updates = {}; adoptions = []
+    seen_keys = set(); skipped_count = 0; unchanged_count = 0; unmanaged_count = 0
+    for q_data in records:
+        params = question_params(topic_map, q_data)
+        if params is None:
+            skipped_count += 1
+            continue
+        topic_id, fields, key, content_hash = params[0], params[1:8], params[8], params[9]
+        if key in seen_keys:
+            skipped_count += 1 # Duplicate record within the source; first one wins
+            continue
+        seen_keys.add(key)
+        if key in synced_rows:
+            q_id, stored_hash = synced_rows[key][:2]
+            if stored_hash == content_hash:
+                unchanged_count += 1
+            else:
+                updates[q_id] = (stored_hash, (*fields, key, content_hash, q_id))
+        elif (topic_id, fields[0]) in unmanaged_rows:
+            q_id = unmanaged_rows.pop((topic_id, fields[0]))
+            if force:
+                adoptions.append((*fields, key, content_hash, q_id))
+            else:
+                unmanaged_count += 1
+        else:
+            inserts.append(params)
+
+    missing_rows = {key: row for key, row in synced_rows.items() if key not in seen_keys}
+    updates.update(_pair_reworded_records(missing_rows, inserts))
+    deletes = {q_id: stored_hash for q_id, stored_hash, *_ in missing_rows.values()}
+
+    kept_count = 0
+    if not force:
+        modified = _locally_modified_ids(conn, {**{q_id: h for q_id, (h, _) in updates.items()}, **deletes})
+        kept_count = len(modified)
+        updates = {q_id: value for q_id, value in updates.items() if q_id not in modified}
+        deletes = {q_id: h for q_id, h in deletes.items() if q_id not in modified}
+
+    try:
+        conn.execute("BEGIN")
+        execute_many(conn, 'delete_question', [(q_id,) for q_id in deletes])
+        execute_many(conn, 'rekey_question', [params for _, params in updates.values()])
+        execute_many(conn, 'rekey_question', adoptions)
+        execute_many(conn, 'insert_source_question', inserts)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Error during sync, no changes were written: {e}")
+        raise
+
+    return {
+        'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes),
+        'adopted': len(adoptions), 'unchanged': unchanged_count, 'kept_local_edits': kept_count, 'kept_unmanaged': unmanaged_count,
+        'skipped': skipped_count, 'elapsed': time.perf_counter() - start_time,
+    }
+
+def print_sync_summary(counts):
+    """ Print the summary block for sync mode """
+    print("\n--- Sync Summary ---")
+    print(f"Inserted {counts['inserted']}, updated {counts['updated']}, deleted {counts['deleted']} questions.")
+    print(f"Unchanged: {counts['unchanged']}. Adopted existing rows: {counts['adopted']}.")
+    if counts['kept_local_edits'] > 0:
+        print(f"Kept {counts['kept_local_edits']} rows edited in the admin panel (use --force to overwrite).")
+    if counts['kept_unmanaged'] > 0:
+        print(f"Kept {counts['kept_unmanaged']} rows not created by a sync that match source records (use --force to adopt them).")
+    if counts['skipped'] > 0:
+        print(f"Skipped {counts['skipped']} source records (duplicates, missing topics or invalid fields).")
+    print(f"Sync finished in {counts['elapsed']:.3f} s.")
+
+
+def clear_question_history(conn):
+    """
+    Delete every recorded attempt, response and item statistic. They refer to questions by id, and a rebuilt
+    Questions table hands out ids from 1 again, so keeping them would attach old results to new, unrelated questions.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('ItemStats', 'Responses', 'Attempts')")
+    tables = {row[0] for row in cursor.fetchall()}
+    for table in ('ItemStats', 'Responses', 'Attempts'): # Responses before Attempts (foreign key)
+        if table in tables:
+            cursor.execute(f"DELETE FROM {table}")
+    conn.commit()
+
+def rebuild_questions(conn):
+    """ DROP and recreate the Questions table, then load ALL_QUESTIONS_DATA """
+    print("\n" + "="*40)
+    print("WARNING:")
+    print("This script will:")
+    print("1. DROP the existing 'Questions' table (if it exists).")
+    print("2. CREATE a new 'Questions' table suitable for multiple-choice.")
+    print("3. Populate the new table with sample questions.")
+    print("Any data currently in the 'Questions' table will be lost,")
+    print("together with all recorded quiz attempts and question statistics.")
+    print("="*40 + "\n")
+
+    # --- Step 1: Modify Schema ---
+    print("Clearing recorded quiz attempts and question statistics...")
+    clear_question_history(conn) # Before apply_schema(), whose ItemStats back-fill reads Responses
+    print("Modifying Questions table schema...")
+    sql_drop_questions_table = "DROP TABLE IF EXISTS Questions;"
+    execute_sql(conn, sql_drop_questions_table)
+    # New schema for Questions table (shared with create_database.py), plus its indexes
+    execute_sql(conn, SQL_CREATE_QUESTIONS_TABLE)
+    apply_schema(conn)
+    print("Schema modification complete.")
+
+    # --- Step 2: Add Questions ---
+    print("\nAdding questions to the database...")
+    return bulk_import_questions(conn, ALL_QUESTIONS_DATA)
 
 
 # --- Main Execution ---
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Populate the Quiz Bowl question bank.")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='FILE',
+                        help="Append questions from CSV/JSONL files instead of rebuilding the sample bank.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="With --import, parse and validate files in this many worker processes "
+                             "(0: one per CPU; default 1: in this process).")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per executemany batch/transaction (default: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument('--sync', dest='sync_files', nargs='*', metavar='FILE',
+                        help="Incrementally sync the bank to the sample data (or to the given CSV/JSONL files, "
+                             "which must hold the complete bank) without dropping the table.")
+    parser.add_argument('--skip-duplicates', action='store_true',
+                        help="With --import, skip records that are near-duplicates of existing questions or of each other.")
+    parser.add_argument('--force', action='store_true',
+                        help="With --sync, overwrite/delete rows that were edited in the admin panel, "
+                             "and adopt matching rows that were not created by a sync.")
+    args = parser.parse_args()
+    if args.sync_files is not None and args.import_files:
+        parser.error("--sync and --import cannot be combined; sync to a complete bank, or import to append.")
+
     if not os.path.exists(DATABASE_FILE):
         print(f"Error: Database file '{DATABASE_FILE}' not found.")
         print("Please run the script to create the database first.")
@@ -486,74 +1058,53 @@ if __name__ == '__main__':
         conn = create_connection(DATABASE_FILE)
 
         if conn:
-            print("\n" + "="*40)
-            print("WARNING:")
-            print("This script will:")
-            print("1. DROP the existing 'Questions' table (if it exists).")
-            print("2. CREATE a new 'Questions' table suitable for multiple-choice.")
-            print("3. Populate the new table with sample questions.")
-            print("Any data currently in the 'Questions' table will be lost.")
-            print("="*40 + "\n")
-
-            # --- Step 1: Modify Schema ---
-            print("Modifying Questions table schema...")
-            sql_drop_questions_table = "DROP TABLE IF EXISTS Questions;"
-            # New schema for Questions table
-            sql_create_new_questions_table = """CREATE TABLE IF NOT EXISTS Questions (
-                                                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                                    topic_id INTEGER NOT NULL,
-                                                    question_text TEXT NOT NULL,
-                                                    option_a TEXT NOT NULL,
-                                                    option_b TEXT NOT NULL,
-                                                    option_c TEXT NOT NULL,
-                                                    option_d TEXT NOT NULL,
-                                                    option_e TEXT NOT NULL,
-                                                    correct_answer TEXT NOT NULL CHECK(correct_answer IN ('A', 'B', 'C', 'D', 'E')),
-                                                    FOREIGN KEY (topic_id) REFERENCES Topics (id) ON DELETE CASCADE
-                                                );"""
-            execute_sql(conn, sql_drop_questions_table)
-            execute_sql(conn, sql_create_new_questions_table)
-            print("Schema modification complete.")
-
-            # --- Step 2: Add Questions ---
-            print("\nAdding questions to the database...")
-            question_count = 0
-            skipped_count = 0
-            for q_data in ALL_QUESTIONS_DATA:
-                topic_name = q_data.get('topic')
-                if not topic_name:
-                    print(f"Skipping question due to missing topic: {q_data.get('question')}")
-                    skipped_count += 1
-                    continue
-
-                topic_id = get_topic_id(conn, topic_name)
-
-                if topic_id:
-                    question_id = add_question(conn, topic_id, q_data)
-                    if question_id:
-                         question_count += 1
-                         # print(f"Added question ID {question_id} for topic '{topic_name}'") # Uncomment for verbose output
-                    else:
-                         skipped_count += 1
+            if args.sync_files is not None:
+                if args.sync_files:
+                    source = itertools.chain.from_iterable(iter_question_records(path) for path in args.sync_files)
                 else:
-                    # Error message printed within get_topic_id
-                    skipped_count += 1
-
-            # --- Step 3: Commit and Close ---
-            if question_count > 0:
-                print(f"\nCommitting {question_count} added questions...")
-                conn.commit() # Commit all changes at once
+                    source = ALL_QUESTIONS_DATA
+                print("\nSyncing question bank (incremental)...")
+                try:
+                    counts = sync_questions(conn, source, force=args.force)
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    print(f"Error syncing question bank: {e}")
+                    counts = None
+                print("\nClosing database connection.")
+                conn.close()
+                if counts:
+                    print_sync_summary(counts)
             else:
-                 print("\nNo questions were added.")
-
-            print("\nClosing database connection.")
-            conn.close()
+                if args.import_files:
+                    added_count = skipped_count = 0
+                    elapsed = 0.0
+                    duplicate_index = None
+                    if args.skip_duplicates:
+                        print("\nIndexing existing questions for near-duplicate checks...")
+                        duplicate_index = build_duplicate_index(conn)
+                    if args.workers != 1:
+                        workers = args.workers or os.cpu_count() or 1
+                        print(f"\nImporting questions from {len(args.import_files)} files with {workers} worker processes (batch size {args.batch_size})...")
+                        added_count, skipped_count, elapsed, stages = parallel_import_questions(
+                            conn, args.import_files, workers=workers, batch_size=args.batch_size, duplicate_index=duplicate_index)
+                        print_stage_summary(stages, elapsed, workers)
+                    else:
+                        for file_path in args.import_files:
+                            print(f"\nImporting questions from '{file_path}' (batch size {args.batch_size})...")
+                            try:
+                                added, skipped, seconds = bulk_import_questions(conn, iter_question_records(file_path), batch_size=args.batch_size,
+                                                                                duplicate_index=duplicate_index)
+                            except (OSError, ValueError) as e:
+                                print(f"Error importing '{file_path}': {e}")
+                                continue
+                            added_count += added
+                            skipped_count += skipped
+                            elapsed += seconds
+                else:
+                    added_count, skipped_count, elapsed = rebuild_questions(conn)
 
-            print("\n--- Summary ---")
-            print(f"Successfully added {question_count} questions.")
-            if skipped_count > 0:
-                print(f"Skipped {skipped_count} questions (due to errors or missing topics). Check warnings above.")
-            print(f"Database '{DATABASE_FILE}' has been populated.")
+                print("\nClosing database connection.")
+                conn.close()
+                print_import_summary(added_count, skipped_count, elapsed)
 
         else:
-            print("Failed to connect to the database. Aborting.")
\ No newline at end of file
+            print("Failed to connect to the database. Aborting.")
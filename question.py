@@ -0,0 +1,69 @@
+# --- Configuration ---
+OPTION_LETTERS = ('A', 'B', 'C', 'D', 'E')
+OPTION_COLUMNS = ('option_a', 'option_b', 'option_c', 'option_d', 'option_e')
+# Column order expected by Question.from_row()
+QUESTION_COLUMNS = "id, topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer"
+
+
+class QuestionError(ValueError):
+    """ Raised when question fields fail validation; the message is suitable for showing to the user """
+
+
+def _clean(value):
+    """ Stripped text of one raw field; None (e.g. a JSON null) is empty, not the text "None" """
+    return '' if value is None else str(value).strip()
+
+
+# --- Question Class ---
+class Question:
+    """
+    One multiple-choice question: text, exactly five options (A-E) and the index of the correct one.
+    __slots__ keeps each instance to a fixed set of fields with no per-object dict, which matters when
+    a whole bank is held in memory (see `benchmarks.py question-memory`).
+    Instances are treated as immutable; edits create a new Question.
+    """
+    __slots__ = ('id', 'topic_id', 'text', 'options', 'correct_index')
+
+    def __init__(self, id, topic_id, text, options, correct_index):
+        self.id = id; self.topic_id = topic_id
+        self.text = text
+        self.options = options # Tuple of 5 strings, A-E
+        self.correct_index = correct_index # 0-4
+
+    @classmethod
+    def from_row(cls, row):
+        """ Build from a row selected as QUESTION_COLUMNS (tuple or sqlite3.Row) """
+        return cls(row[0], row[1], row[2], (row[3], row[4], row[5], row[6], row[7]), OPTION_LETTERS.index(row[8].upper()))
+
+    @classmethod
+    def create(cls, text, options, correct_answer, id=None, topic_id=None):
+        """
+        Validate raw input (admin form, import record) and build a Question.
+        Surrounding whitespace is stripped, None counts as empty and the correct answer letter is upper-cased.
+        :raises QuestionError: with the same messages the admin panel shows
+        """
+        text = _clean(text); options = tuple(_clean(option) for option in options)
+        correct_answer = _clean(correct_answer).upper()
+        if not text or len(options) != len(OPTION_LETTERS) or not all(options): raise QuestionError("Question and all Options must be filled.")
+        if not correct_answer: raise QuestionError("Correct Answer must be selected.")
+        if correct_answer not in OPTION_LETTERS: raise QuestionError("Correct Answer must be A-E.")
+        return cls(id, topic_id, text, options, OPTION_LETTERS.index(correct_answer))
+
+    @property
+    def correct_answer(self):
+        """ Correct letter, A-E """
+        return OPTION_LETTERS[self.correct_index]
+
+    def option(self, letter):
+        """ Text of option `letter` (A-E), or "N/A" for an invalid letter """
+        return self.options[OPTION_LETTERS.index(letter)] if letter in OPTION_LETTERS else "N/A"
+
+    def is_correct(self, letter):
+        return letter == OPTION_LETTERS[self.correct_index]
+
+    def content_fields(self):
+        """ (question_text, option_a..option_e, correct_answer), the column order used by INSERT/UPDATE """
+        return (self.text, *self.options, OPTION_LETTERS[self.correct_index])
+
+    def __repr__(self):
+        return f"Question(id={self.id!r}, topic_id={self.topic_id!r}, text={self.text[:40]!r}, correct={self.correct_answer})"
@@ -0,0 +1,148 @@
+import sys
+import time
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from question import Question
+from quiz_data import execute, fetch_all, fetch_questions_by_ids
+
+# --- Configuration ---
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024 # Memory budget for cached topics (estimated, 64 MiB)
+SQL_VARIABLE_CHUNK = 500 # Max ids per 'IN (...)' lookup (stays under SQLite's variable limit)
+DATA_VERSION_CHECK_SECONDS = 0.5 # Look for external writes at most this often
+
+
+def estimate_size(questions):
+    """ Approximate bytes held by a tuple of Questions (objects, option tuples and strings) """
+    size = sys.getsizeof(questions)
+    for question in questions:
+        size += sys.getsizeof(question) + sys.getsizeof(question.text) + sys.getsizeof(question.options)
+        size += sum(sys.getsizeof(option) for option in question.options)
+    return size
+
+
+# --- Question Cache ---
+class QuestionCache:
+    """
+    Process-wide cache of each topic's questions, shared by every quiz taker using the same DatabaseManager.
+    Entries are immutable tuples of question.Question in id order (or, for sampled quizzes, just the topic's
+    id list), kept in LRU order and evicted once the estimated size exceeds max_bytes.
+    Staleness is handled two ways:
+    - Writes made through this process (the admin panel) call invalidate(topic_id) after committing.
+    - Writes from anywhere else (populate_database.py, another app) change PRAGMA data_version on the
+      writer connection; lookups check it (at most every check_interval seconds) and clear the whole cache.
+      The check is skipped, not waited for, while the writer is busy, so cache hits never queue behind writes.
+      If the writer is busy when the cache is created, the first value read later becomes the baseline;
+      until then loaded topics are returned but not kept, since nothing could tell whether they went stale.
+    """
+    def __init__(self, db, max_bytes=DEFAULT_CACHE_BYTES):
+        self.db = db; self.max_bytes = max_bytes
+        # ('questions' | 'ids', topic id) -> (value, estimated bytes), least recently used first
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._generation = 0 # Bumped by every invalidation; loads that started before one are not stored
+        self._data_version = db.data_version() # None while the writer is busy; set by the first successful check
+        self.check_interval = DATA_VERSION_CHECK_SECONDS
+        self._next_check = 0.0 # time.monotonic() of the next data_version check
+        self.hits = 0; self.misses = 0; self.evictions = 0
+
+    def _lookup(self, key):
+        """ Cached value for key (marking it recently used), or None """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            self._entries.move_to_end(key); self.hits += 1
+            return entry[0]
+
+    def _load(self, key, loader, sizer):
+        """ Run loader() on a pooled reader and keep the result, unless an invalidation happened meanwhile """
+        with self._lock:
+            self.misses += 1; generation = self._generation
+        with self.db.reader() as conn:
+            cursor = conn.cursor(); cursor.row_factory = None # Plain tuples; they are converted straight away
+            value = loader(cursor)
+        size = sizer(value)
+        with self._lock:
+            if (generation == self._generation and self._data_version is not None
+                    and size <= self.max_bytes and key not in self._entries):
+                self._entries[key] = (value, size); self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._size -= evicted_size; self.evictions += 1
+        return value
+
+    def get_topic(self, topic_id):
+        """ Questions of a topic (tuple of Question, id order), from memory if cached """
+        self._check_external_writes()
+        questions = self._lookup(('questions', topic_id))
+        if questions is None:
+            questions = self._load(('questions', topic_id),
+                                   lambda cursor: tuple(fetch_all(cursor, 'topic_questions', (topic_id,), Question.from_row)),
+                                   estimate_size)
+        return questions
+
+    def get_topic_ids(self, topic_id):
+        """ Question ids of a topic (array of int64, ascending), read from the topic index and cached """
+        self._check_external_writes()
+        ids = self._lookup(('ids', topic_id))
+        if ids is None:
+            ids = self._load(('ids', topic_id),
+                             lambda cursor: array('q', (row[0] for row in execute(cursor, 'topic_question_ids', (topic_id,)))),
+                             lambda ids: sys.getsizeof(ids))
+        return ids
+
+    def sample_topic(self, topic_id, count, rng=None):
+        """
+        `count` random questions of a topic (all of them, shuffled, if the topic is smaller).
+        Uses the cached questions if the whole topic is in memory; otherwise samples from the topic's
+        id index (8 bytes per question) and reads only the chosen rows, so the cost grows with count,
+        not with the topic size.
+        :return: list of Question in random order
+        """
+        rng = rng or random
+        self._check_external_writes()
+        questions = self._lookup(('questions', topic_id))
+        if questions is not None:
+            return rng.sample(questions, min(count, len(questions)))
+        ids = self.get_topic_ids(topic_id)
+        chosen_ids = rng.sample(ids, min(count, len(ids)))
+        by_id = {}
+        with self.db.reader() as conn:
+            cursor = conn.cursor(); cursor.row_factory = None
+            for start in range(0, len(chosen_ids), SQL_VARIABLE_CHUNK):
+                for question in fetch_questions_by_ids(cursor, chosen_ids[start:start + SQL_VARIABLE_CHUNK], Question.from_row):
+                    by_id[question.id] = question
+        return [by_id[question_id] for question_id in chosen_ids if question_id in by_id] # Skips rows deleted meanwhile
+
+    def invalidate(self, topic_id=None):
+        """ Drop one topic (or everything when topic_id is None); call after committing a write """
+        with self._lock:
+            self._generation += 1
+            if topic_id is None:
+                self._entries.clear(); self._size = 0
+            else:
+                for key in (('questions', topic_id), ('ids', topic_id)):
+                    entry = self._entries.pop(key, None)
+                    if entry is not None: self._size -= entry[1]
+
+    def _check_external_writes(self):
+        """ Clear the cache if another connection or process has committed since the last check """
+        now = time.monotonic()
+        if now < self._next_check: return
+        data_version = self.db.data_version()
+        if data_version is None: return # Writer busy; try again on the next lookup
+        self._next_check = now + self.check_interval
+        if self._data_version is None: # No baseline yet (writer was busy at start); nothing cached to clear
+            self._data_version = data_version
+        elif data_version != self._data_version:
+            self.invalidate()
+            self._data_version = data_version
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,206 @@
+import sqlite3
+import os
+import argparse
+import re
+import time
+import unicodedata
+import zlib
+from itertools import islice
+from operator import eq
+from db_connection import connect
+from quiz_data import execute, fetch_all
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+SHINGLE_SIZE = 2 # Words per shingle of normalized text
+NUM_BINS = 64 # MinHash signature length
+BANDS = 8 # LSH bands of NUM_BINS // BANDS values; candidates share at least one whole band
+DUPLICATE_THRESHOLD = 0.8 # Estimated Jaccard similarity at which two questions count as near-duplicates
+# Most keys compared per band bucket in one lookup. A bigger bucket is a cluster of similar questions;
+# its newest members stand in for it, so a bank of look-alike questions does not make lookups quadratic.
+MAX_BAND_CANDIDATES = 64
+_MAX_HASH = (1 << 64) - 1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15 # Odd 64-bit constant (golden ratio)
+_NON_WORD_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+
+# --- Signatures ---
+def normalize_text(text):
+    """ Lowercase, strip accents and punctuation, collapse whitespace """
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD_PATTERN.sub(" ", text.lower()).strip()
+
+def question_fingerprint_text(question_text, options):
+    """
+    Text compared for duplicates: the question plus its options in sorted order,
+    so the same question with shuffled options still matches.
+    """
+    return " | ".join([normalize_text(question_text), *sorted(normalize_text(o) for o in options)])
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    Set of 64-bit hashes of the word shingles of (already normalized) text.
+    crc32 is stable across runs (unlike hash()) and fast; multiplying by an odd constant spreads it over 64 bits.
+    """
+    words = text.split()
+    if len(words) < size:
+        words = words + [""] * (size - len(words)) # Very short text still yields one shingle
+    return {(zlib.crc32(" ".join(words[i:i + size]).encode('utf-8')) * _HASH_MULTIPLIER) & _MAX_HASH
+            for i in range(len(words) - size + 1)}
+
+def minhash_signature(hashes, num_bins=NUM_BINS):
+    """
+    One-permutation MinHash: each shingle hash is hashed once and kept as the minimum of its bin,
+    instead of applying num_bins separate permutations. Empty bins borrow from the next non-empty bin
+    (rotation densification) so two signatures stay comparable position by position.
+    :return: tuple of num_bins ints
+    """
+    signature = [_MAX_HASH] * num_bins
+    for h in hashes:
+        index = h % num_bins; value = h // num_bins
+        if value < signature[index]:
+            signature[index] = value
+    if _MAX_HASH in signature and len(hashes):
+        # Walk right to left (twice round the ring) carrying the nearest non-empty bin to the right
+        filled = list(signature); source = None
+        for position in range(2 * num_bins - 1, -1, -1):
+            index = position % num_bins
+            if signature[index] != _MAX_HASH:
+                source = position
+            elif source is not None and position < num_bins:
+                # Borrowed values are tagged with their distance so they only match bins borrowed the same way
+                filled[index] = signature[source % num_bins] + (source - position) * (_MAX_HASH + 1)
+        signature = filled
+    return tuple(signature)
+
+def question_signature(question_text, options):
+    """ MinHash signature of a question and its five options """
+    return minhash_signature(shingle_hashes(question_fingerprint_text(question_text, options)))
+
+def estimated_similarity(signature_a, signature_b):
+    """ Fraction of equal bins, an estimate of the Jaccard similarity of the two shingle sets """
+    return sum(map(eq, signature_a, signature_b)) / len(signature_a)
+
+
+# --- LSH Index ---
+class DuplicateIndex:
+    """
+    Locality-sensitive hash index over MinHash signatures.
+    Each signature is split into BANDS bands; questions that agree on a whole band land in the same bucket,
+    so a lookup only compares against the few questions sharing a bucket instead of the whole bank.
+    Keys are question ids (any hashable works, e.g. for records that are not inserted yet).
+    """
+    def __init__(self, bands=BANDS, threshold=DUPLICATE_THRESHOLD, max_band_candidates=MAX_BAND_CANDIDATES):
+        self.bands = bands; self.threshold = threshold; self.max_band_candidates = max_band_candidates
+        self.signatures = {} # key -> signature
+        self._buckets = {} # (band number, band values) -> dict of keys (an insertion-ordered set)
+        self.comparisons = 0 # estimated_similarity() calls made by lookups so far
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, signature):
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, key, signature):
+        """ Index a signature (replaces any earlier signature for the same key) """
+        self.remove(key)
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, {})[key] = None
+
+    def remove(self, key):
+        """ Drop a key from the index (no-op if it is not indexed) """
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket: del self._buckets[band_key]
+
+    def find_duplicates(self, signature, exclude=None, first=False):
+        """
+        Indexed questions whose estimated similarity to signature reaches the threshold.
+        At most max_band_candidates keys (the newest) are compared per band, so a lookup costs at most
+        bands * max_band_candidates comparisons however many look-alike questions are indexed.
+        :param exclude: key to ignore (e.g. the question being edited)
+        :param first: stop at the first match (enough to skip a record)
+        :return: list of (key, similarity), most similar first
+        """
+        seen = {exclude}; matches = []
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if not bucket: continue
+            for key in islice(reversed(bucket), self.max_band_candidates):
+                if key in seen: continue
+                seen.add(key); self.comparisons += 1
+                similarity = estimated_similarity(signature, self.signatures[key])
+                if similarity >= self.threshold:
+                    if first: return [(key, similarity)]
+                    matches.append((key, similarity))
+        return sorted(matches, key=lambda m: -m[1])
+
+
+# --- Database Functions ---
+def _iter_question_signatures(conn):
+    """ Yields (id, signature) for every question, in id order """
+    for row in execute(conn, 'question_signatures'):
+        yield row[0], question_signature(row[1], row[2:7])
+
+def build_duplicate_index(conn, threshold=DUPLICATE_THRESHOLD):
+    """ DuplicateIndex over every question in the table """
+    index = DuplicateIndex(threshold=threshold)
+    for question_id, signature in _iter_question_signatures(conn):
+        index.add(question_id, signature)
+    return index
+
+def find_duplicate_pairs(conn, threshold=DUPLICATE_THRESHOLD):
+    """
+    Batch report over the whole Questions table.
+    Every question is checked against the ones before it, then indexed, so each pair is reported once.
+    :return: (list of (earlier_id, later_id, similarity), the finished DuplicateIndex)
+    """
+    index = DuplicateIndex(threshold=threshold)
+    pairs = []
+    for question_id, signature in _iter_question_signatures(conn):
+        pairs.extend((match_id, question_id, similarity) for match_id, similarity in index.find_duplicates(signature))
+        index.add(question_id, signature)
+    return pairs, index
+
+def print_duplicate_report(conn, pairs):
+    """ Print each near-duplicate pair with both question texts """
+    for earlier_id, later_id, similarity in pairs:
+        texts = dict(fetch_all(conn, 'question_text_pair', (earlier_id, later_id)))
+        print(f"{similarity:.0%} similar: ID {earlier_id} and ID {later_id}")
+        print(f"    {earlier_id}: {texts.get(earlier_id, '')[:80]}")
+        print(f"    {later_id}: {texts.get(later_id, '')[:80]}")
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report near-duplicate questions in the question bank.")
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD,
+                        help=f"Estimated similarity (0-1) at which questions are reported (default: {DUPLICATE_THRESHOLD}).")
+    args = parser.parse_args()
+
+    if not os.path.exists(DATABASE_FILE):
+        print(f"Error: Database file '{DATABASE_FILE}' not found.")
+    else:
+        conn = None
+        try:
+            conn = connect(DATABASE_FILE, read_only=True)
+            start_time = time.perf_counter()
+            pairs, index = find_duplicate_pairs(conn, args.threshold)
+            elapsed = time.perf_counter() - start_time
+            print_duplicate_report(conn, pairs)
+            print(f"\nChecked {len(index)} questions in {elapsed:.2f} s; found {len(pairs)} near-duplicate pairs.")
+        except sqlite3.Error as e:
+            print(f"Error reading questions: {e}")
+        finally:
+            if conn: conn.close()
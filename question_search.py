@@ -0,0 +1,46 @@
+import re
+from quiz_data import fetch_all, fetch_one
+
+# --- Configuration ---
+SEARCH_LIMIT = 50 # Max results returned to the admin panel
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# --- Functions ---
+def build_match_query(search_text):
+    """
+    Turns free text typed by an admin into a safe FTS5 MATCH expression.
+    Every word must appear (implicit AND); the last word is treated as a prefix so results
+    show up while a word is still being typed. FTS5 operators typed by the user are not interpreted.
+    :return: MATCH string, or None if the text has no searchable words
+    """
+    words = _WORD_PATTERN.findall(search_text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+def escape_like(text, escape='\\'):
+    """ Escapes LIKE wildcards (% and _) so they match literally; use with ESCAPE '\\' """
+    return text.replace(escape, escape * 2).replace('%', escape + '%').replace('_', escape + '_')
+
+def has_full_text_index(conn):
+    """ True if the QuestionsFTS table exists (SQLite built with FTS5 and migration 3 applied) """
+    return fetch_one(conn, 'full_text_index') is not None
+
+def search_questions(conn, search_text, topic_id=None, limit=SEARCH_LIMIT):
+    """
+    Ranked search over question text and options A-E.
+    :param topic_id: restrict results to one topic (None = all topics)
+    :return: list of rows with id, topic_id and snippet (matches wrapped in [ ]), best match first
+    """
+    match_query = build_match_query(search_text)
+    if match_query is None:
+        return []
+    if not has_full_text_index(conn):
+        # Unranked substring match on the question text and options; the snippet is the plain question text
+        return fetch_all(conn, 'search_questions_like', (f"%{escape_like(search_text.strip())}%", topic_id, limit))
+    if topic_id is None:
+        return fetch_all(conn, 'search_questions', (match_query, limit))
+    return fetch_all(conn, 'search_topic_questions', (match_query, topic_id, limit))
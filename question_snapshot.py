@@ -0,0 +1,193 @@
+import os
+import mmap
+import random
+import struct
+from question import Question
+from quiz_data import fetch_all
+from adaptive_quiz import DifficultyIndex, difficulty_from_stats
+
+# sqlite3 and db_connection are imported only where a snapshot is exported: an app started with --snapshot
+# never touches the database, and skipping those imports is a large part of the faster start.
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+SNAPSHOT_FILE = 'quiz_bank.qbs'
+SNAPSHOT_MAGIC = b'QBSNAP\0\0'
+SNAPSHOT_VERSION = 1
+
+# --- File Layout (little-endian, every section 8-byte aligned) ---
+# header     magic, version, topic count, question count, string count, section offsets
+# topics     per topic: id, name string, first question record, question count (questions are grouped by topic)
+# questions  per question: id, topic id, correct option index, first of its 6 strings (text, A-E), difficulty
+# offsets    string_count + 1 uint64 offsets into the blob (string i = blob[offsets[i]:offsets[i + 1]])
+# blob       UTF-8 text of all strings, back to back
+HEADER = struct.Struct('<8sIIIIQQQQ')
+TOPIC_RECORD = struct.Struct('<qIII4x')
+QUESTION_RECORD = struct.Struct('<qqIIf4x')
+STRINGS_PER_QUESTION = 6
+
+
+class SnapshotError(ValueError):
+    """ Raised when a file is not a readable question snapshot (wrong magic, unsupported version, truncated) """
+
+
+def _align(size):
+    return (size + 7) & ~7
+
+
+# --- Export ---
+def export_snapshot(conn, path):
+    """
+    Write every topic and question (with its difficulty from ItemStats) to a snapshot file.
+    The file is written next to `path` and renamed over it, so readers never see a partial snapshot.
+    :return: (topic_count, question_count, file size in bytes)
+    """
+    import sqlite3
+    topics = fetch_all(conn, 'all_topics')
+    try:
+        stats = {row[0]: (row[1], row[2]) for row in fetch_all(conn, 'all_item_stats')}
+    except sqlite3.OperationalError: # Database not migrated to ItemStats yet
+        print("Note: no item statistics in this database; every question gets difficulty 0.")
+        stats = {}
+    strings = [topic[1] for topic in topics]
+    topic_records = []; question_records = []
+    for topic_id, _ in topics:
+        first = len(question_records)
+        for question in fetch_all(conn, 'topic_questions', (topic_id,), Question.from_row):
+            question_records.append(QUESTION_RECORD.pack(question.id, topic_id, question.correct_index, len(strings),
+                                                         difficulty_from_stats(*stats.get(question.id, (0, 0)))))
+            strings.append(question.text); strings.extend(question.options)
+        topic_records.append(TOPIC_RECORD.pack(topic_id, len(topic_records), first, len(question_records) - first))
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for data in encoded: offsets.append(offsets[-1] + len(data))
+
+    topics_offset = _align(HEADER.size)
+    questions_offset = _align(topics_offset + TOPIC_RECORD.size * len(topic_records))
+    offsets_offset = _align(questions_offset + QUESTION_RECORD.size * len(question_records))
+    blob_offset = _align(offsets_offset + 8 * len(offsets))
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(topic_records), len(question_records), len(strings),
+                         topics_offset, questions_offset, offsets_offset, blob_offset)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        for offset, chunks in ((0, [header]), (topics_offset, topic_records), (questions_offset, question_records),
+                               (offsets_offset, [struct.pack(f'<{len(offsets)}Q', *offsets)]), (blob_offset, encoded)):
+            f.write(b'\0' * (offset - f.tell())) # Alignment padding
+            f.writelines(chunks)
+        size = f.tell()
+    os.replace(temp_path, path)
+    return len(topic_records), len(question_records), size
+
+
+# --- Loader ---
+class QuestionSnapshot:
+    """
+    Read-only question bank memory-mapped from a snapshot file: opening reads only the header and the
+    topic table, and a topic's questions are decoded from the mapped pages when first asked for.
+    Processes mapping the same file share its pages through the OS page cache.
+    Offers the reads QuizApp needs from the live database (topics, get_topic, sample_topic, difficulty_index).
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            try: self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: raise SnapshotError(f"'{path}' is empty.") # mmap refuses empty files
+        try:
+            if len(self._map) < HEADER.size: raise SnapshotError(f"'{path}' is too short to be a snapshot.")
+            (magic, version, topic_count, self.question_count, string_count,
+             topics_offset, self._questions_offset, offsets_offset, self._blob_offset) = HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC: raise SnapshotError(f"'{path}' is not a question snapshot.")
+            if version != SNAPSHOT_VERSION: raise SnapshotError(f"'{path}' is snapshot version {version}; this program reads version {SNAPSHOT_VERSION}.")
+            section_ends = (topics_offset + TOPIC_RECORD.size * topic_count, self._questions_offset + QUESTION_RECORD.size * self.question_count,
+                            offsets_offset + 8 * (string_count + 1), self._blob_offset)
+            if max(section_ends) > len(self._map): raise SnapshotError(f"'{path}' is truncated.")
+            self._offsets = memoryview(self._map)[offsets_offset:offsets_offset + 8 * (string_count + 1)].cast('Q')
+            if self._blob_offset + self._offsets[-1] > len(self._map): raise SnapshotError(f"'{path}' is truncated.")
+            # topic id -> (name, first question record, question count)
+            self._topics = {}
+            for topic_id, name_index, first, count in TOPIC_RECORD.iter_unpack(self._map[topics_offset:topics_offset + TOPIC_RECORD.size * topic_count]):
+                self._topics[topic_id] = (self._string(name_index), first, count)
+        except (SnapshotError, struct.error, TypeError, ValueError) as e:
+            self.close()
+            raise e if isinstance(e, SnapshotError) else SnapshotError(f"'{path}' is damaged ({e}).")
+        self._questions = {} # topic id -> tuple of Question, decoded on first use
+
+    def _string(self, index):
+        start = self._blob_offset + self._offsets[index]
+        return self._map[start:self._blob_offset + self._offsets[index + 1]].decode('utf-8')
+
+    def _question(self, record_number):
+        question_id, topic_id, correct_index, first_string, difficulty = QUESTION_RECORD.unpack_from(
+            self._map, self._questions_offset + record_number * QUESTION_RECORD.size)
+        text, *options = (self._string(first_string + i) for i in range(STRINGS_PER_QUESTION))
+        return Question(question_id, topic_id, text, tuple(options), correct_index), difficulty
+
+    def topics(self):
+        """ [{'id', 'name'}] sorted by name, like quiz_data's 'topics' statement """
+        return sorted(({'id': topic_id, 'name': name} for topic_id, (name, _, _) in self._topics.items()), key=lambda topic: topic['name'])
+
+    def get_topic(self, topic_id):
+        """ Questions of a topic (tuple of Question, id order); empty for an unknown topic """
+        questions = self._questions.get(topic_id)
+        if questions is None:
+            _, first, count = self._topics.get(topic_id, (None, 0, 0))
+            questions = self._questions[topic_id] = tuple(self._question(first + i)[0] for i in range(count))
+        return questions
+
+    def sample_topic(self, topic_id, count, rng=None):
+        """ `count` random questions of a topic, decoding only those records (list of Question in random order) """
+        _, first, size = self._topics.get(topic_id, (None, 0, 0))
+        return [self._question(first + i)[0] for i in (rng or random).sample(range(size), min(count, size))]
+
+    def difficulty_index(self, topic_id):
+        """ adaptive_quiz.DifficultyIndex of a topic, using the difficulties stored at export time """
+        _, first, count = self._topics.get(topic_id, (None, 0, 0))
+        questions = self.get_topic(topic_id)
+        difficulties = [QUESTION_RECORD.unpack_from(self._map, self._questions_offset + (first + i) * QUESTION_RECORD.size)[4] for i in range(count)]
+        return DifficultyIndex(questions, difficulties)
+
+    def close(self):
+        offsets = getattr(self, '_offsets', None)
+        if offsets is not None: offsets.release() # The map cannot close while a view of it exists
+        self._map.close()
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    import argparse
+    import sqlite3
+    import time
+    from db_connection import connect
+    parser = argparse.ArgumentParser(description="Export the question bank to a memory-mappable snapshot, or describe one.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export = subparsers.add_parser('export', help="Write a snapshot of the database.")
+    export.add_argument('--db', default=DATABASE_FILE, help=f"SQLite database file (default: {DATABASE_FILE}).")
+    export.add_argument('--out', default=SNAPSHOT_FILE, help=f"Snapshot file to write (default: {SNAPSHOT_FILE}).")
+    info = subparsers.add_parser('info', help="Print a snapshot's topics.")
+    info.add_argument('snapshot', nargs='?', default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        if not os.path.exists(args.db):
+            print(f"Error: Database file '{args.db}' not found.")
+        else:
+            conn = None
+            try:
+                conn = connect(args.db, read_only=True)
+                start = time.perf_counter()
+                topic_count, question_count, size = export_snapshot(conn, args.out)
+                print(f"Wrote '{args.out}': {topic_count} topics, {question_count} questions, {size:,} bytes in {time.perf_counter() - start:.2f} s.")
+            except (sqlite3.Error, OSError) as e:
+                print(f"Error exporting snapshot: {e}")
+            finally:
+                if conn: conn.close()
+    else:
+        try:
+            snapshot = QuestionSnapshot(args.snapshot)
+        except (SnapshotError, OSError) as e:
+            print(f"Error: {e}")
+        else:
+            print(f"'{args.snapshot}': snapshot version {SNAPSHOT_VERSION}, {snapshot.question_count} questions.")
+            for topic in snapshot.topics():
+                print(f"  {topic['id']:>4}  {topic['name']} ({len(snapshot.get_topic(topic['id']))} questions)")
+            snapshot.close()
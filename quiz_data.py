@@ -0,0 +1,184 @@
+import threading
+import time
+from question import QUESTION_COLUMNS
+
+# --- Configuration ---
+# ItemStats running sums (see item_stats.py for what each one is for)
+ITEM_STAT_COLUMNS = ("responses", "correct", "unanswered", "picks_a", "picks_b", "picks_c", "picks_d", "picks_e",
+                     "rest_sum", "rest_sq_sum", "correct_rest_sum")
+SNIPPET_TOKENS = 12 # Words of context around each match in a search snippet
+
+# --- Statements ---
+# Every query the apps run on a hot path, by name. Each name always maps to the same SQL text, so
+# sqlite3's per-connection statement cache (db_connection.STATEMENT_CACHE_SIZE) compiles it once per
+# connection and reuses the prepared statement afterwards. Columns are always listed explicitly.
+STATEMENTS = {
+    # Topics
+    'topics': "SELECT id, name FROM Topics ORDER BY name",
+    'topic_name': "SELECT name FROM Topics WHERE id = ?",
+    'all_topics': "SELECT id, name FROM Topics ORDER BY id",
+    'topic_ids_by_name': "SELECT name, id FROM Topics",
+    # Questions
+    'topic_questions': f"SELECT {QUESTION_COLUMNS} FROM Questions WHERE topic_id = ? ORDER BY id",
+    'topic_question_ids': "SELECT id FROM Questions WHERE topic_id = ? ORDER BY id", # Answered from the (topic_id, id) index alone
+    'topic_answer_key': "SELECT id, correct_answer FROM Questions WHERE topic_id = ? ORDER BY id",
+    'question_page': """SELECT id, substr(question_text, 1, ?) AS question_text
+                        FROM Questions WHERE topic_id = ? AND id > ? ORDER BY id LIMIT ?""",
+    'question': f"SELECT {QUESTION_COLUMNS} FROM Questions WHERE id = ?",
+    'question_topic': "SELECT topic_id FROM Questions WHERE id = ?",
+    'all_questions': f"SELECT {QUESTION_COLUMNS}, source_key, content_hash FROM Questions ORDER BY id",
+    'insert_question': """INSERT INTO Questions (topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer)
+                          VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    # Rows from source data (sample bank, --import, --sync) carry their source_key and content_hash (see populate_database.py);
+    # a record whose source_key is already in the bank is skipped
+    'insert_source_question': """INSERT INTO Questions (topic_id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer,
+                                                        source_key, content_hash)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(source_key) DO NOTHING""",
+    'update_question': """UPDATE Questions SET question_text = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?,
+                          option_e = ?, correct_answer = ? WHERE id = ?""",
+    'delete_question': "DELETE FROM Questions WHERE id = ?",
+    'question_signatures': "SELECT id, question_text, option_a, option_b, option_c, option_d, option_e FROM Questions ORDER BY id",
+    'question_text_pair': "SELECT id, question_text FROM Questions WHERE id IN (?, ?)",
+    # Incremental sync (populate_database.py --sync)
+    'synced_questions': """SELECT source_key, id, content_hash, topic_id, option_a, option_b, option_c, option_d, option_e, correct_answer
+                           FROM Questions WHERE source_key IS NOT NULL""",
+    'unmanaged_questions': "SELECT topic_id, question_text, id FROM Questions WHERE source_key IS NULL",
+    'rekey_question': """UPDATE Questions SET question_text = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?,
+                         option_e = ?, correct_answer = ?, source_key = ?, content_hash = ? WHERE id = ?""",
+    # Search (question_search.py)
+    'full_text_index': "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'QuestionsFTS'",
+    # 'ORDER BY rank' (bm25, lower is better) is evaluated inside FTS5; rows are joined only after LIMIT
+    'search_questions': f"""SELECT q.id, q.topic_id, top.snippet FROM (
+                               SELECT rowid, rank, snippet(QuestionsFTS, -1, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet
+                               FROM QuestionsFTS WHERE QuestionsFTS MATCH ? ORDER BY rank LIMIT ?
+                           ) AS top JOIN Questions q ON q.id = top.rowid
+                           ORDER BY top.rank""",
+    # The topic filter needs the Questions row, so join before ranking
+    'search_topic_questions': f"""SELECT q.id, q.topic_id, snippet(QuestionsFTS, -1, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet
+                                 FROM QuestionsFTS JOIN Questions q ON q.id = QuestionsFTS.rowid
+                                 WHERE QuestionsFTS MATCH ? AND q.topic_id = ?
+                                 ORDER BY rank LIMIT ?""",
+    # Fallback without FTS5: unranked substring match on the question text and options A-E, like the FTS index;
+    # params: ?1 LIKE pattern, ?2 topic id (NULL = all topics), ?3 limit
+    'search_questions_like': """SELECT id, topic_id, question_text AS snippet FROM Questions
+                                WHERE (question_text LIKE ?1 ESCAPE '\\' OR option_a LIKE ?1 ESCAPE '\\' OR option_b LIKE ?1 ESCAPE '\\'
+                                       OR option_c LIKE ?1 ESCAPE '\\' OR option_d LIKE ?1 ESCAPE '\\' OR option_e LIKE ?1 ESCAPE '\\')
+                                AND (?2 IS NULL OR topic_id = ?2)
+                                ORDER BY id LIMIT ?3""",
+    # Attempts and item statistics
+    # A topic deleted while its quiz was running is recorded as NULL (the foreign key's ON DELETE SET NULL)
+    'insert_attempt': """INSERT INTO Attempts(topic_id, started_at, finished_at, question_count, score, option_seed)
+                         VALUES((SELECT id FROM Topics WHERE id = ?), ?, ?, ?, ?, ?)""",
+    'insert_response': """INSERT INTO Responses(attempt_id, position, question_id, answer, is_correct, answered_at)
+                          VALUES(?, ?, ?, ?, ?, ?)""",
+    'item_stats': f"SELECT {', '.join(ITEM_STAT_COLUMNS)} FROM ItemStats WHERE question_id = ?",
+    'upsert_item_stats': f"""INSERT INTO ItemStats(question_id, {', '.join(ITEM_STAT_COLUMNS)})
+                             VALUES(?, {', '.join('?' * len(ITEM_STAT_COLUMNS))})
+                             ON CONFLICT(question_id) DO UPDATE SET
+                             {', '.join(f'{column} = {column} + excluded.{column}' for column in ITEM_STAT_COLUMNS)}""",
+    'all_item_stats': "SELECT question_id, responses, correct FROM ItemStats",
+    'topic_item_stats': """SELECT s.question_id, s.responses, s.correct FROM ItemStats s
+                           JOIN Questions q ON q.id = s.question_id WHERE q.topic_id = ?""",
+}
+# Tables read_database.py may dump, and the statement that reads each one
+TABLE_STATEMENTS = {'Topics': 'all_topics', 'Questions': 'all_questions'}
+
+
+def questions_by_ids_sql(count):
+    """ SELECT of `count` questions by id. One text per count, so each quiz length stays a cached statement. """
+    return f"SELECT {QUESTION_COLUMNS} FROM Questions WHERE id IN ({','.join('?' * count)})"
+
+
+# --- Timing Counters ---
+class StatementStats:
+    """ Calls and wall time of one named statement (execute plus, for fetch_*, reading the rows) """
+    __slots__ = ('name', 'calls', 'total_seconds', 'max_seconds')
+
+    def __init__(self, name):
+        self.name = name; self.calls = 0; self.total_seconds = 0.0; self.max_seconds = 0.0
+
+    @property
+    def mean_ms(self):
+        return self.total_seconds * 1000 / self.calls if self.calls else 0.0
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name, elapsed):
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None: stats = _stats[name] = StatementStats(name)
+        stats.calls += 1; stats.total_seconds += elapsed
+        if elapsed > stats.max_seconds: stats.max_seconds = elapsed
+
+
+def statement_stats():
+    """ Snapshot of the counters: list of StatementStats, most total time first """
+    with _stats_lock:
+        snapshot = []
+        for stats in _stats.values():
+            copy = StatementStats(stats.name); copy.calls = stats.calls
+            copy.total_seconds = stats.total_seconds; copy.max_seconds = stats.max_seconds
+            snapshot.append(copy)
+    return sorted(snapshot, key=lambda stats: stats.total_seconds, reverse=True)
+
+
+def reset_statement_stats():
+    with _stats_lock: _stats.clear()
+
+
+def print_statement_stats():
+    print(f"{'statement':<20} | {'calls':>8} | {'total ms':>10} | {'mean ms':>8} | {'max ms':>8}")
+    print("-" * 66)
+    for stats in statement_stats():
+        print(f"{stats.name:<20} | {stats.calls:>8} | {stats.total_seconds * 1000:>10.1f} | {stats.mean_ms:>8.3f} | {stats.max_seconds * 1000:>8.3f}")
+
+
+# --- Execution ---
+# `conn` may be a Connection or a Cursor (e.g. one with row_factory = None for plain tuples).
+def execute(conn, name, params=()):
+    """ Run statement `name`; returns the cursor. Timing covers the execute step only (the first row for SELECTs). """
+    start = time.perf_counter()
+    try:
+        return conn.execute(STATEMENTS[name], params)
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def execute_many(conn, name, rows):
+    """ executemany() of statement `name` over `rows`; returns the cursor """
+    start = time.perf_counter()
+    try:
+        return conn.executemany(STATEMENTS[name], rows)
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def fetch_one(conn, name, params=()):
+    start = time.perf_counter()
+    try:
+        return conn.execute(STATEMENTS[name], params).fetchone()
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def fetch_all(conn, name, params=(), convert=None):
+    """ All rows of statement `name`, optionally passed through convert(row) (timed together) """
+    start = time.perf_counter()
+    try:
+        cursor = conn.execute(STATEMENTS[name], params)
+        return cursor.fetchall() if convert is None else [convert(row) for row in cursor]
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def fetch_questions_by_ids(conn, ids, convert=None):
+    """ Rows (or convert(row)) for a list of question ids, timed as 'questions_by_ids'; ids must stay under SQLite's variable limit """
+    start = time.perf_counter()
+    try:
+        cursor = conn.execute(questions_by_ids_sql(len(ids)), ids)
+        return cursor.fetchall() if convert is None else [convert(row) for row in cursor]
+    finally:
+        _record('questions_by_ids', time.perf_counter() - start)
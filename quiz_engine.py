@@ -0,0 +1,134 @@
+import random
+import time
+from itertools import permutations
+from question import OPTION_LETTERS
+
+# --- Configuration ---
+PASS_THRESHOLD = 80.0 # Percentage needed to pass a quiz
+# All 120 orderings of the five options. A session stores one byte per question (an index into this
+# table) instead of shuffled copies of the option strings. ORDERS[code][shown position] = option index.
+OPTION_ORDERS = tuple(permutations(range(len(OPTION_LETTERS))))
+# Inverse of each ordering: SHOWN_POSITIONS[code][option index] = shown position
+SHOWN_POSITIONS = tuple(tuple(order.index(i) for i in range(len(order))) for order in OPTION_ORDERS)
+
+
+# --- Quiz Session ---
+class QuizSession:
+    """
+    The state and rules of one quiz attempt, with no UI code: questions, the taker's answers,
+    score and pass/fail. The Tk apps drive it; a server or benchmark can run thousands of them.
+    Questions are question.Question objects.
+
+    With shuffle_options, every question's options are shown in a random order fixed for the session.
+    Letters passed to and returned by the methods below are the letters as shown; self.answers always
+    holds the canonical letters (the ones stored in the database). The orders come from `seed`, so
+    QuizSession(session.questions, shuffle_options=True, seed=session.seed) replays a session exactly.
+    """
+    def __init__(self, questions, topic_name="", shuffle=False, rng=None, shuffle_options=False, seed=None):
+        """
+        :param shuffle: randomize question order (rng: optional random.Random for reproducible order)
+        :param shuffle_options: show each question's options in a per-session random order
+        :param seed: seed for the option orders (a new random seed if None)
+        """
+        self.questions = list(questions); self.topic_name = topic_name
+        if shuffle: (rng or random).shuffle(self.questions)
+        self.seed = None; self.option_orders = None # One OPTION_ORDERS index per question, or None for A-E order
+        if shuffle_options:
+            self.seed = seed if seed is not None else random.randrange(2**32)
+            order_rng = random.Random(self.seed)
+            self.option_orders = bytes(order_rng.randrange(len(OPTION_ORDERS)) for _ in self.questions)
+        self.answers = [""] * len(self.questions) # Canonical letter selected per question ("" = unanswered)
+        self.answered_at = [None] * len(self.questions) # time.time() of each question's latest answer
+        self.started_at = time.time()
+        self.current_index = 0 # Question shown in one-at-a-time mode
+        self.score = 0
+
+    def __len__(self):
+        return len(self.questions)
+
+    # --- Questions ---
+    @property
+    def finished(self):
+        """ True once one-at-a-time mode has moved past the last question """
+        return self.current_index >= len(self)
+
+    @property
+    def is_last_question(self):
+        return self.current_index == len(self) - 1
+
+    @property
+    def current_question(self):
+        return None if self.finished else self.questions[self.current_index]
+
+    def displayed_options(self, index):
+        """ Option texts of question `index` in the order shown (for letters A-E) """
+        options = self.questions[index].options
+        if self.option_orders is None: return options
+        return tuple(options[i] for i in OPTION_ORDERS[self.option_orders[index]])
+
+    def to_canonical(self, index, letter):
+        """ Canonical letter of the option shown as `letter` for question `index` ("" and invalid letters pass through) """
+        if self.option_orders is None or letter not in OPTION_LETTERS: return letter
+        return OPTION_LETTERS[OPTION_ORDERS[self.option_orders[index]][OPTION_LETTERS.index(letter)]]
+
+    def to_displayed(self, index, letter):
+        """ Letter under which canonical option `letter` of question `index` is shown """
+        if self.option_orders is None or letter not in OPTION_LETTERS: return letter
+        return OPTION_LETTERS[SHOWN_POSITIONS[self.option_orders[index]][OPTION_LETTERS.index(letter)]]
+
+    def correct_answer(self, index):
+        """ Correct letter (A-E, as shown) of question `index` """
+        return self.to_displayed(index, self.questions[index].correct_answer)
+
+    def option_text(self, index, letter):
+        """ Text of the option shown as `letter` (A-E) for question `index`, or "N/A" for an invalid letter """
+        return self.questions[index].option(self.to_canonical(index, letter))
+
+    def displayed_answer(self, index):
+        """ Recorded answer of question `index` as shown ("" if unanswered) """
+        return self.to_displayed(index, self.answers[index])
+
+    # --- Answering ---
+    def select_answer(self, index, letter):
+        """ Record an answer (as shown) without grading it (all-at-once mode grades everything in grade()) """
+        self.answers[index] = self.to_canonical(index, letter); self.answered_at[index] = time.time()
+
+    def check_answer(self, letter):
+        """
+        Record and grade the answer (as shown) to the current question (one-at-a-time mode).
+        :return: (is_correct, correct_letter as shown)
+        """
+        index = self.current_index
+        answer = self.answers[index] = self.to_canonical(index, letter); self.answered_at[index] = time.time()
+        is_correct = self.questions[index].is_correct(answer)
+        if is_correct: self.score += 1
+        return is_correct, self.correct_answer(index)
+
+    def replay(self):
+        """ A fresh, unanswered session with the same questions, question order and option orders """
+        return QuizSession(self.questions, self.topic_name, shuffle_options=self.seed is not None, seed=self.seed)
+
+    def next_question(self):
+        """ Move to the next question; returns False once the quiz is finished """
+        self.current_index += 1
+        return not self.finished
+
+    def grade(self):
+        """
+        Score every recorded answer at once (all-at-once mode). Unanswered questions count as incorrect.
+        :return: number of unanswered questions
+        """
+        self.score = 0; unanswered = 0
+        for question, answer in zip(self.questions, self.answers):
+            if not answer: unanswered += 1
+            elif question.is_correct(answer): self.score += 1
+        return unanswered
+
+    # --- Results ---
+    @property
+    def percentage(self):
+        return (self.score / len(self.questions)) * 100 if self.questions else 0.0
+
+    @property
+    def passed(self):
+        return bool(self.questions) and self.percentage >= PASS_THRESHOLD
@@ -3,9 +3,14 @@ from tkinter import ttk  # For themed widgets (optional, but looks nicer)
 from tkinter import messagebox
 import sqlite3
 import os
-import random
+from db_connection import DatabaseManager
+from db_worker import DBWorker
+from quiz_engine import QuizSession
+from question import OPTION_LETTERS
+from quiz_data import fetch_all
 
 DATABASE_FILE = 'quiz_bowl_app.db'
+QUESTIONS_PER_QUIZ = 20 # Random questions drawn per quiz (None = the whole topic)
 
 class QuizApp:
     def __init__(self, root):
@@ -18,11 +23,10 @@ class QuizApp:
         self.style.theme_use('clam') # Or 'alt', 'default', 'classic'
 
         # State variables
-        self.conn = None
+        self.db = None # DatabaseManager (WAL writer + read-only pool)
+        self.worker = None # Runs topic and question fetches off the UI thread
         self.topics = [] # List of (id, name) tuples
-        self.questions = [] # List of question data dictionaries/tuples for current topic
-        self.current_question_index = 0
-        self.score = 0
+        self.session = None # QuizSession for the current topic (questions, answers, score)
         self.selected_answer = tk.StringVar() # Holds the user's radio button selection
 
         # --- Frames ---
@@ -38,8 +42,9 @@ class QuizApp:
              return
 
         # --- Initial Setup ---
-        self.fetch_topics()
-        self.setup_topic_selection_ui()
+        self.worker = DBWorker(self.root)
+        self.worker.submit(self.fetch_topics, on_success=self.on_topics_fetched)
+        self.setup_topic_selection_ui() # Shows "Loading topics..." until the worker delivers them
 
         # --- Closing Protocol ---
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -50,53 +55,67 @@ class QuizApp:
         if not os.path.exists(DATABASE_FILE):
             return False
         try:
-            self.conn = sqlite3.connect(DATABASE_FILE)
-            # Use Row factory for easier access to columns by name
-            self.conn.row_factory = sqlite3.Row
+            # The manager applies pending schema migrations and enables WAL;
+            # quiz taking only reads, through its pooled read-only connections (rows use sqlite3.Row)
+            self.db = DatabaseManager(DATABASE_FILE)
             print("Database connected successfully.")
             return True
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
-            self.conn = None
+            if self.db:
+                self.db.close()
+            self.db = None
             return False
 
     def fetch_topics(self):
-        """Fetches topic IDs and names from the database."""
-        if not self.conn:
-            return
+        """Fetches topic IDs and names from the database.
+        Runs on the DBWorker thread (pooled read-only connection); returns the rows."""
+        topics = []
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT id, name FROM Topics ORDER BY name")
-            self.topics = cursor.fetchall() # Fetches list of sqlite3.Row objects
-            print(f"Fetched topics: {[t['name'] for t in self.topics]}")
+            with self.db.reader() as conn:
+                topics = fetch_all(conn, 'topics') # List of sqlite3.Row objects
+            print(f"Fetched topics: {[t['name'] for t in topics]}")
         except sqlite3.Error as e:
             print(f"Error fetching topics: {e}")
-            self.topics = []
+        return topics
+
+    def on_topics_fetched(self, topics):
+        """Fills the topic list once the worker has fetched it (runs on the Tk thread)."""
+        self.topics = topics
+        self.topic_listbox.delete(0, tk.END)
+        for topic in self.topics:
+            self.topic_listbox.insert(tk.END, topic['name'])
+        if self.topics:
+            self.topic_listbox.select_set(0)
+        self.start_button.config(state=tk.NORMAL, text="Start Quiz")
 
     def fetch_questions(self, topic_id):
-        """Fetches questions for the selected topic ID."""
-        self.questions = []
-        if not self.conn:
-            return False
+        """Fetches questions for the selected topic ID.
+        Runs on the DBWorker thread (pooled connection on a cache miss); returns the rows."""
+        questions = []
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT id, question_text, option_a, option_b, option_c, option_d, option_e, correct_answer
-                FROM Questions
-                WHERE topic_id = ?
-            """, (topic_id,))
-            self.questions = cursor.fetchall() # List of sqlite3.Row objects
-            if self.questions:
-                random.shuffle(self.questions) # Shuffle questions for variety
-                print(f"Fetched {len(self.questions)} questions for topic ID {topic_id}.")
-                return True
+            # Shared per-process cache; the topic is read from disk only the first time (or after it changed)
+            questions = self.db.question_cache.get_topic(topic_id) # Tuple of Question objects
+            if questions:
+                print(f"Fetched {len(questions)} questions for topic ID {topic_id}.")
             else:
                 print(f"No questions found for topic ID {topic_id}.")
-                return False
         except sqlite3.Error as e:
             print(f"Error fetching questions: {e}")
-            self.questions = []
-            return False
+        return questions
+
+    def start_session(self, topic_id, topic_name):
+        """Worker job: build a QuizSession of QUESTIONS_PER_QUIZ random questions (shuffling stays off the UI thread)."""
+        if QUESTIONS_PER_QUIZ is None:
+            return QuizSession(self.fetch_questions(topic_id), topic_name, shuffle=True) # Shuffle questions for variety
+        try:
+            # Samples ids from the topic index and reads only those rows (already in random order)
+            questions = self.db.question_cache.sample_topic(topic_id, QUESTIONS_PER_QUIZ)
+            print(f"Drew {len(questions)} random questions for topic ID {topic_id}.")
+        except sqlite3.Error as e:
+            print(f"Error fetching questions: {e}")
+            questions = []
+        return QuizSession(questions, topic_name)
 
     def setup_topic_selection_ui(self):
         """Creates the UI elements for selecting a topic."""
@@ -115,8 +134,10 @@ class QuizApp:
         if self.topics:
             self.topic_listbox.select_set(0)
 
-        start_button = ttk.Button(self.topic_frame, text="Start Quiz", command=self.start_quiz)
-        start_button.pack(pady=(10, 20))
+        self.start_button = ttk.Button(self.topic_frame, text="Start Quiz", command=self.start_quiz)
+        self.start_button.pack(pady=(10, 20))
+        if self.worker.busy and not self.topics: # Topics still loading
+            self.start_button.config(state=tk.DISABLED, text="Loading topics...")
 
     def start_quiz(self):
         """Starts the quiz for the selected topic."""
@@ -132,13 +153,19 @@ class QuizApp:
 
         print(f"Selected Topic: {self.current_topic_name} (ID: {selected_topic_id})")
 
-        if not self.fetch_questions(selected_topic_id):
+        # Fetch in the background; the window stays responsive while loading
+        self.start_button.config(state=tk.DISABLED, text="Loading...")
+        self.worker.submit(self.start_session, selected_topic_id, self.current_topic_name, on_success=self.on_questions_fetched)
+
+    def on_questions_fetched(self, session):
+        """Called on the Tk thread once start_session() has finished."""
+        self.start_button.config(state=tk.NORMAL, text="Start Quiz")
+        if not session:
             messagebox.showinfo("No Questions", f"No questions found for the topic '{self.current_topic_name}'.")
             return
 
-        # Reset state for the new quiz
-        self.current_question_index = 0
-        self.score = 0
+        # The new session starts at question 1 with a score of 0
+        self.session = session
 
         # Switch frames
         self.topic_frame.pack_forget()
@@ -166,8 +193,7 @@ class QuizApp:
         self.options_frame.pack(pady=5, padx=20, anchor='w')
 
         self.radio_buttons = []
-        options = ['A', 'B', 'C', 'D', 'E']
-        for option in options:
+        for option in OPTION_LETTERS:
              rb = ttk.Radiobutton(self.options_frame, text=f"{option}. Option Text", variable=self.selected_answer, value=option, command=self.enable_check_button)
              rb.pack(anchor='w', pady=2)
              self.radio_buttons.append(rb)
@@ -191,27 +217,19 @@ class QuizApp:
 
     def load_question(self):
         """Loads the current question and options into the UI."""
-        if self.current_question_index < len(self.questions):
-            question_data = self.questions[self.current_question_index]
-
+        question_data = self.session.current_question
+        if question_data is not None:
             # Update Question Number Label
-            self.q_num_label.config(text=f"Question {self.current_question_index + 1} of {len(self.questions)}")
+            self.q_num_label.config(text=f"Question {self.session.current_index + 1} of {len(self.session)}")
 
             # Update Question Text
-            self.question_label.config(text=question_data['question_text'])
+            self.question_label.config(text=question_data.text)
 
             # Update Radio Button Options
-            options = ['A', 'B', 'C', 'D', 'E']
-            option_texts = [
-                question_data['option_a'],
-                question_data['option_b'],
-                question_data['option_c'],
-                question_data['option_d'],
-                question_data['option_e']
-            ]
+            option_texts = question_data.options # Always five, A-E
 
             for i, rb in enumerate(self.radio_buttons):
-                rb.config(text=f"{options[i]}. {option_texts[i]}", state=tk.NORMAL) # Enable radio buttons
+                rb.config(text=f"{OPTION_LETTERS[i]}. {option_texts[i]}", state=tk.NORMAL) # Enable radio buttons
 
             # Reset state for the new question
             self.selected_answer.set("") # Clear previous selection
@@ -240,44 +258,47 @@ class QuizApp:
             messagebox.showwarning("No Answer", "Please select an answer.")
             return
 
-        correct_answer = self.questions[self.current_question_index]['correct_answer']
+        is_correct, correct_answer = self.session.check_answer(user_answer) # Records the answer and updates the score
 
         # Disable radio buttons and check button after checking
         for rb in self.radio_buttons:
             rb.config(state=tk.DISABLED)
         self.check_button.config(state=tk.DISABLED)
 
-        if user_answer == correct_answer:
-            self.score += 1
+        if is_correct:
             self.feedback_label.config(text="Correct!", foreground='green')
         else:
             # Find the full text of the correct answer
             correct_option_text = ""
-            correct_idx = ['A', 'B', 'C', 'D', 'E'].index(correct_answer)
+            correct_idx = OPTION_LETTERS.index(correct_answer)
             correct_option_text = self.radio_buttons[correct_idx]['text'] # Get text from the correct radio btn
 
             self.feedback_label.config(text=f"Incorrect. The correct answer was: {correct_option_text}", foreground='red')
 
         # Enable the Next button
         self.next_button.config(state=tk.NORMAL)
-        if self.current_question_index == len(self.questions) - 1:
+        if self.session.is_last_question:
              self.next_button.config(text="Show Results") # Change button text for last question
 
 
     def next_question(self):
         """Loads the next question or shows results if finished."""
-        self.current_question_index += 1
+        self.session.next_question()
         self.load_question()
 
     def show_results(self):
         """Displays the final score."""
+        self.db.attempt_log.submit(self.session) # Buffered in memory; written in the background
+
         # Clear the quiz frame
         for widget in self.quiz_frame.winfo_children():
             widget.destroy()
 
         # Display results
         ttk.Label(self.quiz_frame, text="Quiz Finished!", font=('Helvetica', 16, 'bold')).pack(pady=20)
-        ttk.Label(self.quiz_frame, text=f"Your final score: {self.score} out of {len(self.questions)}", font=('Helvetica', 14)).pack(pady=10)
+        ttk.Label(self.quiz_frame, text=f"Your final score: {self.session.score} out of {len(self.session)} ({self.session.percentage:.1f}%)", font=('Helvetica', 14)).pack(pady=10)
+        status, status_color = ("Pass", 'green') if self.session.passed else ("Fail", 'red') # quiz_engine.PASS_THRESHOLD
+        ttk.Label(self.quiz_frame, text=f"Result: {status}", font=('Helvetica', 14, 'bold'), foreground=status_color).pack(pady=5)
 
         # Option to restart
         restart_button = ttk.Button(self.quiz_frame, text="Select Another Topic", command=self.setup_topic_selection_ui)
@@ -286,9 +307,11 @@ class QuizApp:
 
     def on_closing(self):
         """Handles window closing event."""
-        if self.conn:
+        if self.worker:
+            self.worker.shutdown()
+        if self.db:
             print("Closing database connection.")
-            self.conn.close()
+            self.db.close()
         self.root.destroy()
 
 
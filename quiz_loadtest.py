@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+# --- Configuration ---
+HOST = '127.0.0.1'
+PORT = 8080
+DEFAULT_TAKERS = 2000 # Concurrent simulated quiz takers (one keep-alive connection each)
+QUESTIONS_PER_TAKER = 20 # Answers each taker submits (fewer if the topic is smaller)
+
+
+# --- HTTP Client ---
+async def request(reader, writer, method, path, payload=None):
+    """ One HTTP/1.1 keep-alive request; returns (status, decoded JSON body) """
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''): break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length': length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def quiz_taker(host, port, topic_ids, answers, latencies, errors, start_gate):
+    """ One simulated taker: list topics, start a session, then fetch/answer questions """
+    await start_gate.wait()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        errors.append(f"connect: {e}"); return
+    async def timed(endpoint, method, path, payload=None):
+        start = time.perf_counter()
+        status, body = await request(reader, writer, method, path, payload)
+        latencies.setdefault(endpoint, []).append((time.perf_counter() - start) * 1000)
+        if status >= 400: raise RuntimeError(f"{method} {path} -> {status} {body}")
+        return body
+    try:
+        await timed('GET /topics', 'GET', '/topics')
+        session = await timed('POST /sessions', 'POST', '/sessions', {"topic_id": random.choice(topic_ids)})
+        session_path = f"/sessions/{session['session_id']}"
+        for _ in range(min(answers, session['total'])):
+            await timed('GET question', 'GET', f"{session_path}/question")
+            await timed('POST answer', 'POST', f"{session_path}/answer", {"answer": random.choice("ABCDE")})
+    except (RuntimeError, ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+        errors.append(str(e))
+    finally:
+        writer.close()
+
+
+def percentile(samples, fraction):
+    """ Nearest-rank percentile of a sorted list """
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def run_load_test(host=HOST, port=PORT, takers=DEFAULT_TAKERS, answers=QUESTIONS_PER_TAKER):
+    reader, writer = await asyncio.open_connection(host, port)
+    _, topics = await request(reader, writer, 'GET', '/topics')
+    writer.close()
+    topic_ids = [topic['id'] for topic in topics]
+    if not topic_ids:
+        print("Error: The server has no topics."); return
+    latencies = {}; errors = []; start_gate = asyncio.Event()
+    tasks = [asyncio.create_task(quiz_taker(host, port, topic_ids, answers, latencies, errors, start_gate)) for _ in range(takers)]
+    await asyncio.sleep(0) # Let every taker reach the gate, so they all start together
+    start = time.perf_counter(); start_gate.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    all_samples = sorted(sample for samples in latencies.values() for sample in samples)
+    print(f"{takers} concurrent takers, {len(all_samples)} requests in {elapsed:.2f} s ({len(all_samples) / elapsed:,.0f} req/s).")
+    print(f"{'endpoint':<16} | {'requests':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8}")
+    print("-" * 60)
+    for endpoint, samples in list(latencies.items()) + [('all', all_samples)]:
+        samples = sorted(samples)
+        if not samples: # Every taker failed before reaching this endpoint
+            print(f"{endpoint:<16} | {0:>8} | {'-':>8} | {'-':>8} | {'-':>8}"); continue
+        print(f"{endpoint:<16} | {len(samples):>8} | {statistics.median(samples):>8.2f} | {percentile(samples, 0.99):>8.2f} | {samples[-1]:>8.2f}")
+    if errors:
+        print(f"\n{len(errors)} takers failed, e.g.: {errors[0]}")
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test a running quiz_server.py on localhost.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--takers', type=int, default=DEFAULT_TAKERS, help="Concurrent simulated quiz takers.")
+    parser.add_argument('--answers', type=int, default=QUESTIONS_PER_TAKER, help="Questions answered per taker.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_load_test(args.host, args.port, args.takers, args.answers))
+    except OSError as e:
+        print(f"Error: Could not reach the quiz service at {args.host}:{args.port} ({e}).")
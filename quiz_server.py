@@ -0,0 +1,208 @@
+import sqlite3
+import os
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db_connection import DatabaseManager, READER_POOL_SIZE
+from quiz_engine import QuizSession
+from question import OPTION_LETTERS
+from quiz_data import fetch_all, fetch_one
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+HOST = '127.0.0.1'
+PORT = 8080
+SESSION_TTL_SECONDS = 2 * 60 * 60 # Sessions idle longer than this are dropped
+MAX_BODY_BYTES = 64 * 1024
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """ Raised by a handler to answer with an error status and {"error": message} """
+    def __init__(self, status, message):
+        super().__init__(message); self.status = status
+
+
+# --- Quiz Service ---
+class QuizService:
+    """
+    HTTP/JSON quiz service for many concurrent quiz takers.
+      GET  /topics                          -> [{"id", "name"}]
+      POST /sessions {"topic_id", "count"?} -> {"session_id", "topic", "total"} (count: random sample size)
+      GET  /sessions/<id>/question          -> next unanswered question (without the answer) or the final result
+      POST /sessions/<id>/answer {"answer"} -> {"correct", "correct_answer", "score", "finished"}
+      GET  /sessions/<id>                   -> progress and result
+    One asyncio loop handles all connections; SQLite reads run on a thread pool sized to the
+    DatabaseManager's read-only connection pool, so the loop never blocks on the database.
+    Quiz state lives in quiz_engine.QuizSession objects held in memory.
+    """
+    def __init__(self, db_file=DATABASE_FILE, read_threads=READER_POOL_SIZE):
+        self.db = DatabaseManager(db_file, pool_size=read_threads)
+        self._executor = ThreadPoolExecutor(max_workers=read_threads, thread_name_prefix="db-read")
+        self.sessions = {} # session id -> (QuizSession, last used time)
+        self._topic_loads = {} # topic id -> in-flight read, shared by sessions starting the same topic at once
+
+    # --- Database reads (run on the thread pool) ---
+    def _read_topics(self):
+        with self.db.reader() as conn:
+            return [{"id": row['id'], "name": row['name']} for row in fetch_all(conn, 'topics')]
+
+    def _read_topic_questions(self, topic_id, count=None):
+        with self.db.reader() as conn:
+            topic = fetch_one(conn, 'topic_name', (topic_id,))
+        if topic is None: return None, []
+        if count: return topic['name'], self.db.question_cache.sample_topic(topic_id, count)
+        return topic['name'], self.db.question_cache.get_topic(topic_id)
+
+    async def _read(self, job, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, job, *args)
+
+    async def _load_topic(self, topic_id):
+        """ Topic read for a new session; a burst of takers starting the same topic waits on one query """
+        future = self._topic_loads.get(topic_id)
+        if future is None:
+            future = asyncio.ensure_future(self._read(self._read_topic_questions, topic_id))
+            self._topic_loads[topic_id] = future
+            future.add_done_callback(lambda _: self._topic_loads.pop(topic_id, None))
+        return await asyncio.shield(future) # One cancelled request must not cancel the shared read
+
+    # --- Sessions ---
+    def _get_session(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None: raise HTTPError(404, "Unknown or expired session.")
+        self.sessions[session_id] = (entry[0], time.monotonic())
+        return entry[0]
+
+    @staticmethod
+    def _result(session):
+        return {"finished": session.finished, "answered": session.current_index, "total": len(session),
+                "score": session.score, "percentage": round(session.percentage, 1), "passed": session.passed}
+
+    async def expire_sessions(self):
+        """ Background task: drop sessions that have been idle longer than SESSION_TTL_SECONDS """
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.monotonic() - SESSION_TTL_SECONDS
+            for session_id in [sid for sid, (_, last_used) in self.sessions.items() if last_used < cutoff]:
+                del self.sessions[session_id]
+
+    # --- Routes ---
+    async def handle(self, method, path, body):
+        """ Route one request; returns (status, JSON-serializable payload) """
+        parts = [part for part in path.split('?', 1)[0].split('/') if part]
+        if parts == ['topics']:
+            if method != 'GET': raise HTTPError(405, "Use GET.")
+            return 200, await self._read(self._read_topics)
+        if parts == ['sessions']:
+            if method != 'POST': raise HTTPError(405, "Use POST.")
+            try: topic_id = int(body['topic_id']); count = int(body.get('count') or 0)
+            except (KeyError, TypeError, ValueError, AttributeError): raise HTTPError(400, "Body must contain an integer topic_id (and optional integer count).")
+            if count < 0: raise HTTPError(400, "count must not be negative.")
+            if count: topic_name, questions = await self._read(self._read_topic_questions, topic_id, count) # Each taker gets its own sample
+            else: topic_name, questions = await self._load_topic(topic_id)
+            if topic_name is None: raise HTTPError(404, f"Topic {topic_id} not found.")
+            if not questions: raise HTTPError(404, f"No questions found for topic '{topic_name}'.")
+            session_id = secrets.token_urlsafe(12)
+            self.sessions[session_id] = (QuizSession(questions, topic_name, shuffle=not count), time.monotonic())
+            return 201, {"session_id": session_id, "topic": topic_name, "total": len(questions)}
+        if len(parts) >= 2 and parts[0] == 'sessions':
+            session = self._get_session(parts[1])
+            if len(parts) == 2 and method == 'GET':
+                return 200, self._result(session)
+            if parts[2:] == ['question'] and method == 'GET':
+                question = session.current_question
+                if question is None: return 200, self._result(session)
+                return 200, {"index": session.current_index, "total": len(session), "question_text": question.text,
+                             "options": dict(zip(OPTION_LETTERS, question.options))}
+            if parts[2:] == ['answer'] and method == 'POST':
+                answer = str(body.get('answer', '')).strip().upper() if isinstance(body, dict) else ''
+                if answer not in OPTION_LETTERS: raise HTTPError(400, "answer must be one of A-E.")
+                if session.finished: raise HTTPError(400, "Quiz already finished.")
+                is_correct, correct_answer = session.check_answer(answer)
+                if not session.next_question(): self.db.attempt_log.submit(session) # Buffered; no database wait
+                return 200, {"correct": is_correct, "correct_answer": correct_answer, "score": session.score,
+                             "finished": session.finished, **({"result": self._result(session)} if session.finished else {})}
+        raise HTTPError(404, "Not found.")
+
+    # --- HTTP/1.1 (keep-alive, JSON bodies) ---
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break # Client closed the connection
+                try: method, path, version = request_line.decode('latin-1').split()
+                except ValueError: break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''): break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    value = headers.get('content-length') or '0'
+                    length = int(value) if value.isascii() and value.isdigit() else -1 # -1: body cannot be framed
+                    if length < 0: raise HTTPError(400, "Content-Length must be a non-negative integer.")
+                    if length > MAX_BODY_BYTES: raise HTTPError(413, "Request body too large.")
+                    raw_body = await reader.readexactly(length) if length else b''
+                    try: body = json.loads(raw_body) if raw_body else {}
+                    except json.JSONDecodeError: raise HTTPError(400, "Body must be JSON.")
+                    status, payload = await self.handle(method.upper(), path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except sqlite3.Error as e:
+                    print(f"Database error handling {method} {path}: {e}")
+                    status, payload = 500, {"error": "Database error."}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e: # A bug or an unexpected body must not drop the connection without an answer
+                    print(f"Unexpected error handling {method} {path}: {e!r}")
+                    status, payload = 500, {"error": "Internal server error."}
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive or status == 413 or length < 0: break # Unread or unframeable body: stop here
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # Client went away mid-request
+        finally:
+            writer.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+
+async def run_server(db_file=DATABASE_FILE, host=HOST, port=PORT, backlog=4096):
+    """ Serve until cancelled (Ctrl+C) """
+    service = QuizService(db_file)
+    server = await asyncio.start_server(service.serve_connection, host, port, backlog=backlog)
+    expiry_task = asyncio.create_task(service.expire_sessions())
+    print(f"Quiz service listening on http://{host}:{port} (database '{db_file}').")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        expiry_task.cancel()
+        service.close()
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the quiz bank over HTTP.")
+    parser.add_argument('--db', default=DATABASE_FILE, help=f"SQLite database file (default: {DATABASE_FILE}).")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database file '{args.db}' not found.")
+    else:
+        try:
+            asyncio.run(run_server(args.db, args.host, args.port))
+        except KeyboardInterrupt:
+            print("\nQuiz service stopped.")
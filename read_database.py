@@ -1,5 +1,7 @@
 import sqlite3
 import os
+from db_connection import connect
+from quiz_data import TABLE_STATEMENTS, execute
 
 # --- Configuration ---
 DATABASE_FILE = 'quiz_bowl_app.db'
@@ -9,10 +11,8 @@ def create_connection(db_file):
     """ Create a database connection to the SQLite database specified by db_file """
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file, read_only=True)
         # Optional: print(f"SQLite connection established to {db_file}")
-        # Enable foreign key constraint enforcement (good practice, though less critical for reading)
-        # conn.execute("PRAGMA foreign_keys = ON;")
         return conn
     except sqlite3.Error as e:
         print(f"Error connecting to database '{db_file}': {e}")
@@ -20,11 +20,13 @@ def create_connection(db_file):
 
 def display_table_data(conn, table_name):
     """ Fetches and prints all data from a specified table """
+    if table_name not in TABLE_STATEMENTS:
+        print(f"Error: Unknown table '{table_name}' (expected one of: {', '.join(TABLE_STATEMENTS)}).")
+        return
     print(f"\n{'='*15} Data from table: {table_name} {'='*15}")
-    cursor = conn.cursor()
     try:
-        # Select all data from the table
-        cursor.execute(f"SELECT * FROM {table_name}") # Safe here as table_name is controlled by us
+        # Fixed statement per table (explicit columns); the table name never becomes part of the SQL
+        cursor = execute(conn, TABLE_STATEMENTS[table_name])
 
         # Fetch column names from cursor description
         column_names = [description[0] for description in cursor.description]
@@ -0,0 +1,223 @@
+import sqlite3
+import os
+
+# --- Configuration ---
+DATABASE_FILE = 'quiz_bowl_app.db'
+
+# --- Table Definitions ---
+# Using IF NOT EXISTS prevents errors if the statements are run multiple times
+SQL_CREATE_TOPICS_TABLE = """ CREATE TABLE IF NOT EXISTS Topics (
+                                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                    name TEXT NOT NULL UNIQUE
+                                ); """
+
+# The Questions table links to the Topics table using topic_id
+# ON DELETE CASCADE means if a topic is deleted, all its questions are also deleted.
+# source_key/content_hash are maintained by `populate_database.py --sync` (NULL for admin-created rows).
+SQL_CREATE_QUESTIONS_TABLE = """CREATE TABLE IF NOT EXISTS Questions (
+                                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                    topic_id INTEGER NOT NULL,
+                                    question_text TEXT NOT NULL,
+                                    option_a TEXT NOT NULL,
+                                    option_b TEXT NOT NULL,
+                                    option_c TEXT NOT NULL,
+                                    option_d TEXT NOT NULL,
+                                    option_e TEXT NOT NULL,
+                                    correct_answer TEXT NOT NULL CHECK(correct_answer IN ('A', 'B', 'C', 'D', 'E')),
+                                    source_key TEXT,
+                                    content_hash TEXT,
+                                    FOREIGN KEY (topic_id) REFERENCES Topics (id) ON DELETE CASCADE
+                                );"""
+
+# One row per finished quiz; option_seed is QuizSession.seed (NULL when options were shown A-E)
+SQL_CREATE_ATTEMPTS_TABLE = """CREATE TABLE IF NOT EXISTS Attempts (
+                                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                    topic_id INTEGER,
+                                    started_at REAL NOT NULL,
+                                    finished_at REAL NOT NULL,
+                                    question_count INTEGER NOT NULL,
+                                    score INTEGER NOT NULL,
+                                    option_seed INTEGER,
+                                    FOREIGN KEY (topic_id) REFERENCES Topics (id) ON DELETE SET NULL
+                                );"""
+
+# One row per question shown in an attempt. question_id is deliberately not a foreign key, so the
+# history survives the question being edited away or deleted. answer is the canonical letter (NULL = unanswered).
+SQL_CREATE_RESPONSES_TABLE = """CREATE TABLE IF NOT EXISTS Responses (
+                                    attempt_id INTEGER NOT NULL,
+                                    position INTEGER NOT NULL,
+                                    question_id INTEGER NOT NULL,
+                                    answer TEXT CHECK(answer IN ('A', 'B', 'C', 'D', 'E')),
+                                    is_correct INTEGER NOT NULL,
+                                    answered_at REAL,
+                                    PRIMARY KEY (attempt_id, position),
+                                    FOREIGN KEY (attempt_id) REFERENCES Attempts (id) ON DELETE CASCADE
+                                ) WITHOUT ROWID;"""
+
+# Running per-question sums maintained by attempt_log on every flush (see item_stats.py for the statistics)
+SQL_CREATE_ITEM_STATS_TABLE = """CREATE TABLE IF NOT EXISTS ItemStats (
+                                    question_id INTEGER PRIMARY KEY,
+                                    responses INTEGER NOT NULL DEFAULT 0,
+                                    correct INTEGER NOT NULL DEFAULT 0,
+                                    unanswered INTEGER NOT NULL DEFAULT 0,
+                                    picks_a INTEGER NOT NULL DEFAULT 0,
+                                    picks_b INTEGER NOT NULL DEFAULT 0,
+                                    picks_c INTEGER NOT NULL DEFAULT 0,
+                                    picks_d INTEGER NOT NULL DEFAULT 0,
+                                    picks_e INTEGER NOT NULL DEFAULT 0,
+                                    rest_sum REAL NOT NULL DEFAULT 0,
+                                    rest_sq_sum REAL NOT NULL DEFAULT 0,
+                                    correct_rest_sum REAL NOT NULL DEFAULT 0
+                                );"""
+
+
+# --- Migration Steps ---
+# Every step must be idempotent: apply_schema() re-runs all of them after a table rebuild.
+def _add_sync_columns(conn):
+    """ v1: source_key/content_hash columns used by incremental sync """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(Questions)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column in ('source_key', 'content_hash'):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE Questions ADD COLUMN {column} TEXT")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_source_key ON Questions(source_key)")
+
+def _add_topic_index(conn):
+    """ v2: index for 'WHERE topic_id = ? ORDER BY id' (covers id-only lookups, no sort step) """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_topic_id ON Questions(topic_id, id)")
+
+def _add_full_text_search(conn):
+    """
+    v3: FTS5 index over question text and options, kept in sync with Questions by triggers.
+    :return: False if this SQLite lacks FTS5 (v3 is then not recorded, so a later run retries it)
+    """
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS QuestionsFTS USING fts5(
+                            question_text, option_a, option_b, option_c, option_d, option_e,
+                            content='Questions', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                        )""")
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: search falls back to LIKE (see question_search.py)
+        print(f"Warning: full-text search unavailable ({e}).")
+        return False
+    # External-content FTS tables are maintained with the special 'delete' command
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON Questions BEGIN
+                        INSERT INTO QuestionsFTS(rowid, question_text, option_a, option_b, option_c, option_d, option_e)
+                        VALUES (new.id, new.question_text, new.option_a, new.option_b, new.option_c, new.option_d, new.option_e);
+                    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON Questions BEGIN
+                        INSERT INTO QuestionsFTS(QuestionsFTS, rowid, question_text, option_a, option_b, option_c, option_d, option_e)
+                        VALUES ('delete', old.id, old.question_text, old.option_a, old.option_b, old.option_c, old.option_d, old.option_e);
+                    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS questions_fts_update
+                    AFTER UPDATE OF question_text, option_a, option_b, option_c, option_d, option_e ON Questions BEGIN
+                        INSERT INTO QuestionsFTS(QuestionsFTS, rowid, question_text, option_a, option_b, option_c, option_d, option_e)
+                        VALUES ('delete', old.id, old.question_text, old.option_a, old.option_b, old.option_c, old.option_d, old.option_e);
+                        INSERT INTO QuestionsFTS(rowid, question_text, option_a, option_b, option_c, option_d, option_e)
+                        VALUES (new.id, new.question_text, new.option_a, new.option_b, new.option_c, new.option_d, new.option_e);
+                    END""")
+    conn.execute("INSERT INTO QuestionsFTS(QuestionsFTS) VALUES ('rebuild')") # Index the existing rows
+
+def _add_attempt_tables(conn):
+    """ v4: Attempts/Responses, written in batches by attempt_log.AttemptLog """
+    conn.execute(SQL_CREATE_ATTEMPTS_TABLE)
+    conn.execute(SQL_CREATE_RESPONSES_TABLE)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_question_id ON Responses(question_id)")
+
+def _add_item_stats(conn):
+    """ v5: ItemStats, back-filled once from the Responses recorded so far """
+    conn.execute(SQL_CREATE_ITEM_STATS_TABLE)
+    # rest = score on the attempt's other questions, as a fraction (see item_stats.item_stat_deltas)
+    conn.execute("""INSERT OR REPLACE INTO ItemStats
+                    SELECT question_id, COUNT(*), SUM(is_correct), SUM(answer IS NULL),
+                           SUM(answer = 'A'), SUM(answer = 'B'), SUM(answer = 'C'), SUM(answer = 'D'), SUM(answer = 'E'),
+                           SUM(rest), SUM(rest * rest), SUM(is_correct * rest)
+                    FROM (SELECT r.question_id, r.answer, r.is_correct,
+                                 CASE WHEN a.question_count > 1 THEN (a.score - r.is_correct) * 1.0 / (a.question_count - 1) ELSE 0.0 END AS rest
+                          FROM Responses r JOIN Attempts a ON a.id = r.attempt_id)
+                    GROUP BY question_id""")
+
+def _add_item_stats_cleanup(conn):
+    """ v6: a deleted question takes its ItemStats row with it, so the statistics never outlive the question """
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS questions_item_stats_delete AFTER DELETE ON Questions BEGIN
+                        DELETE FROM ItemStats WHERE question_id = old.id;
+                    END""")
+    conn.execute("DELETE FROM ItemStats WHERE question_id NOT IN (SELECT id FROM Questions)") # Rows of questions deleted before v6
+
+# (version, description, step function) -- append new migrations, never reorder
+MIGRATIONS = [
+    (1, "Add sync columns to Questions", _add_sync_columns),
+    (2, "Add index on Questions(topic_id, id)", _add_topic_index),
+    (3, "Add full-text search over questions and options", _add_full_text_search),
+    (4, "Add Attempts and Responses tables", _add_attempt_tables),
+    (5, "Add incrementally maintained ItemStats", _add_item_stats),
+    (6, "Delete ItemStats rows together with their question", _add_item_stats_cleanup),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# --- Functions ---
+def get_schema_version(conn):
+    """ Returns the schema version recorded in PRAGMA user_version (0 for an untracked database) """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _run_steps(conn, steps, verbose=True):
+    """
+    Run migration steps in one transaction and record the resulting version.
+    A step returning False could not be applied here (e.g. no FTS5); the later steps still run, but the
+    recorded version stays below it, so the next migrate() tries it again (every step is idempotent).
+    """
+    if conn.in_transaction:
+        conn.commit()
+    try:
+        conn.execute("BEGIN")
+        recorded_version = steps[-1][0]
+        for version, description, step in steps:
+            if step(conn) is False:
+                recorded_version = min(recorded_version, version - 1)
+            elif verbose:
+                print(f"Applied schema migration {version}: {description}")
+        # PRAGMA does not accept bound parameters; version is an int from MIGRATIONS
+        conn.execute(f"PRAGMA user_version = {int(recorded_version)}")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def migrate(conn, verbose=True):
+    """
+    Apply any migrations newer than the database's PRAGMA user_version.
+    Safe to call on every connect: an up-to-date database costs one PRAGMA read.
+    :return: the schema version after migrating
+    """
+    current_version = get_schema_version(conn)
+    pending = [m for m in MIGRATIONS if m[0] > current_version]
+    if pending:
+        _run_steps(conn, pending, verbose)
+    return get_schema_version(conn)
+
+def apply_schema(conn, verbose=True):
+    """
+    Create the tables and re-run every (idempotent) migration step.
+    Used after the Questions table has been dropped and recreated, since dropping a table
+    also drops its indexes while user_version stays unchanged.
+    """
+    conn.execute(SQL_CREATE_TOPICS_TABLE)
+    conn.execute(SQL_CREATE_QUESTIONS_TABLE)
+    _run_steps(conn, MIGRATIONS, verbose)
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    if not os.path.exists(DATABASE_FILE):
+        print(f"Error: Database file '{DATABASE_FILE}' not found.")
+    else:
+        conn = sqlite3.connect(DATABASE_FILE)
+        try:
+            print(f"Schema version before: {get_schema_version(conn)}")
+            print(f"Schema version after:  {migrate(conn)} (latest: {LATEST_SCHEMA_VERSION})")
+        except sqlite3.Error as e:
+            print(f"Error migrating database: {e}")
+        finally:
+            conn.close()
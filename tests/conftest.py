@@ -0,0 +1,37 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # The modules live at the repo root
+
+from db_connection import connect, DatabaseManager
+from quiz_data import STATEMENTS
+from schema_migrations import SQL_CREATE_TOPICS_TABLE, SQL_CREATE_QUESTIONS_TABLE, migrate
+
+TOPIC_NAMES = ("Topic A", "Topic B")
+QUESTIONS_PER_TOPIC = 10
+
+
+def create_bank(db_file, topic_names=TOPIC_NAMES, questions_per_topic=QUESTIONS_PER_TOPIC):
+    """ A migrated database with `questions_per_topic` questions in each topic (correct answer cycles A-E) """
+    conn = connect(db_file, create=True)
+    conn.execute(SQL_CREATE_TOPICS_TABLE); conn.execute(SQL_CREATE_QUESTIONS_TABLE)
+    migrate(conn, verbose=False)
+    conn.executemany("INSERT INTO Topics(name) VALUES(?)", [(name,) for name in topic_names])
+    rows = [(topic_id, f"{name} question {i}?", *(f"{name} {i} option {letter}" for letter in "ABCDE"), "ABCDE"[i % 5])
+            for topic_id, name in enumerate(topic_names, start=1) for i in range(questions_per_topic)]
+    conn.executemany(STATEMENTS['insert_question'], rows)
+    conn.commit(); conn.close()
+    return db_file
+
+
+@pytest.fixture
+def bank_file(tmp_path):
+    return create_bank(str(tmp_path / "bank.db"))
+
+
+@pytest.fixture
+def db(bank_file):
+    manager = DatabaseManager(bank_file)
+    yield manager
+    manager.close()
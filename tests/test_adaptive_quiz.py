@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+from adaptive_quiz import AdaptiveQuizSession, load_difficulty_index
+from quiz_engine import QuizSession
+
+
+def test_adaptive_session_is_answered_one_at_a_time(db):
+    session = AdaptiveQuizSession(load_difficulty_index(db, 1), length=5, rng=random.Random(3))
+    with pytest.raises(RuntimeError):
+        session.select_answer(0, "A")
+
+
+def test_replay_is_a_plain_session_with_the_served_questions(db):
+    session = AdaptiveQuizSession(load_difficulty_index(db, 1), length=4, rng=random.Random(3), shuffle_options=True, seed=11)
+    while not session.finished:
+        session.check_answer("A"); session.next_question()
+    replay = session.replay()
+    assert type(replay) is QuizSession
+    assert [q.id for q in replay.questions] == [q.id for q in session.questions]
+    assert list(replay.option_orders) == list(session.option_orders)
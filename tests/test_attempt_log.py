@@ -0,0 +1,53 @@
+from quiz_engine import QuizSession
+
+
+def finished_session(db, topic_id, answers):
+    session = QuizSession(db.question_cache.get_topic(topic_id))
+    for i, answer in enumerate(answers): session.current_index = i; session.check_answer(answer)
+    return session
+
+
+def count(db, table, where="1"):
+    with db.reader() as conn: return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+
+
+def test_flush_writes_attempts_and_responses(db):
+    log = db.attempt_log
+    log.submit(finished_session(db, 1, "ABC")); log.submit(finished_session(db, 2, "A"))
+    assert log.flush() == 2
+    assert count(db, "Attempts") == 2 and count(db, "Responses") == 20
+    assert log.pending == 0
+
+
+def test_attempt_for_deleted_topic_is_saved_without_topic(db):
+    log = db.attempt_log
+    session = finished_session(db, 1, "ABCDE")
+    with db.write() as conn: conn.execute("DELETE FROM Topics WHERE id = 1") # Deleted while the quiz ran
+    log.submit(session)
+    assert log.flush() == 1
+    assert count(db, "Attempts", "topic_id IS NULL") == 1
+    assert log.pending == 0
+
+
+def test_bad_attempt_is_dropped_and_does_not_block_others(db):
+    log = db.attempt_log
+    good = finished_session(db, 1, "ABCDE")
+    bad = finished_session(db, 2, "ABCDE")
+    bad.answers[0] = "Z" # Violates the Responses.answer CHECK constraint
+    log.submit(good); log.submit(bad); log.submit(finished_session(db, 2, "B"))
+    assert log.flush() == 2
+    assert log.attempts_dropped == 1 and log.pending == 0
+    assert count(db, "Attempts") == 2
+    log.submit(finished_session(db, 1, "A")) # Later attempts are not stuck behind the bad one
+    assert log.flush() == 1 and count(db, "Attempts") == 3
+
+
+def test_busy_database_keeps_batch_queued(db, monkeypatch):
+    import sqlite3
+    log = db.attempt_log
+    log.submit(finished_session(db, 1, "A"))
+    def busy(batch): raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(log, "_write", busy)
+    assert log.flush() == 0 and log.pending == 1
+    monkeypatch.undo()
+    assert log.flush() == 1 and log.pending == 0
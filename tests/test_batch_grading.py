@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from batch_grading import GradeReport, grade_sheets, grade_topic
+
+KEY = bytes([0, 1, 2, 3, 4, 0, 1, 2])
+
+
+def random_sheets(count, length, seed=7):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("ABCDE -?abcde") for _ in range(rng.randint(length - 2, length + 2))) for _ in range(count)]
+
+
+def expected_scores(sheets):
+    """ Reference grading, one response at a time """
+    return [sum(i < len(sheet) and sheet[i].upper() == "ABCDE"[code] for i, code in enumerate(KEY)) for sheet in sheets]
+
+
+def test_pure_python_grading_matches_reference():
+    sheets = random_sheets(200, len(KEY))
+    report = grade_sheets(KEY, sheets, use_numpy=False)
+    assert list(report.scores) == expected_scores(sheets)
+    assert report.question_correct == [sum(len(s) > i and s[i].upper() == "ABCDE"[code] for s in sheets) for i, code in enumerate(KEY)]
+
+
+def test_numpy_grading_matches_pure_python():
+    np = pytest.importorskip("numpy")
+    sheets = random_sheets(500, len(KEY))
+    python_report = grade_sheets(KEY, sheets, use_numpy=False)
+    numpy_report = grade_sheets(KEY, sheets, use_numpy=True)
+    assert numpy_report.scores.tolist() == list(python_report.scores)
+    assert numpy_report.question_correct == python_report.question_correct
+    assert numpy_report.percentages.tolist() == pytest.approx(python_report.percentages)
+    assert numpy_report.passed.tolist() == python_report.passed
+    assert numpy_report.question_rates == python_report.question_rates
+    matrix = np.frombuffer(bytes(b % 5 for b in range(40)), dtype=np.uint8).reshape(5, len(KEY)) # Pre-encoded sheets
+    assert grade_sheets(KEY, matrix).scores.tolist() == list(grade_sheets(KEY, matrix, use_numpy=False).scores)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_no_sheets(use_numpy):
+    if use_numpy: pytest.importorskip("numpy")
+    report = grade_sheets(KEY, [], use_numpy=use_numpy)
+    assert len(report) == 0 and list(report.question_correct) == [0] * len(KEY) and report.question_rates == [None] * len(KEY)
+
+
+def test_empty_key_is_rejected(db):
+    with pytest.raises(ValueError, match="no questions"):
+        grade_sheets(b"", ["ABC"], use_numpy=False)
+    with db.reader() as conn:
+        with pytest.raises(ValueError, match="no questions"):
+            grade_topic(conn, 999, ["ABC"])
+    assert GradeReport([], [3], 0, []).percentages == [0.0]
@@ -0,0 +1,66 @@
+import heapq
+import itertools
+import time
+from types import SimpleNamespace
+
+from db_worker import DBWorker
+from quiz_gui import QuizApp
+
+STALL_BUDGET_MS = 100 # A blocked event loop for longer than this is visible to the user
+
+
+class HeadlessRoot:
+    """ Stand-in for a Tk root: after()/after_cancel() timers, run by run_until() instead of mainloop() """
+    def __init__(self):
+        self._timers = []; self._ids = itertools.count()
+
+    def after(self, ms, callback):
+        timer_id = next(self._ids)
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, timer_id, callback))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._timers = [timer for timer in self._timers if timer[1] != timer_id]; heapq.heapify(self._timers)
+
+    def run_until(self, condition, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            assert time.perf_counter() < deadline, "timed out"
+            due, _, callback = heapq.heappop(self._timers)
+            time.sleep(max(0.0, due - time.perf_counter()))
+            callback()
+
+
+def test_slow_job_does_not_stall_event_loop():
+    root = HeadlessRoot(); worker = DBWorker(root); results = []
+    try:
+        worker.submit(time.sleep, 0.3, on_success=results.append)
+        root.run_until(lambda: results)
+        assert worker.max_stall_ms < STALL_BUDGET_MS
+    finally:
+        worker.shutdown()
+
+
+def test_stall_metric_sees_blocked_event_loop():
+    root = HeadlessRoot(); worker = DBWorker(root); results = []
+    try:
+        worker.submit(lambda: None, on_success=lambda _: time.sleep(0.3)) # Callbacks run on the "Tk" thread
+        worker.submit(int, on_success=results.append)
+        root.run_until(lambda: results and not worker.busy)
+        root.run_until(lambda: worker.max_stall_ms > 0, timeout=1) # Measured on the tick after the stall
+        assert worker.max_stall_ms >= 250
+        worker.reset_stall_metric()
+        assert worker.max_stall_ms == 0
+    finally:
+        worker.shutdown()
+
+
+def test_quiz_topics_load_on_worker(db):
+    root = HeadlessRoot(); worker = DBWorker(root); topics = []
+    try:
+        worker.submit(QuizApp.fetch_topics, SimpleNamespace(db=db), on_success=topics.extend)
+        root.run_until(lambda: topics)
+        assert [topic['name'] for topic in topics] == ["Topic A", "Topic B"]
+        assert worker.max_stall_ms < STALL_BUDGET_MS
+    finally:
+        worker.shutdown()
@@ -0,0 +1,62 @@
+import threading
+from types import SimpleNamespace
+
+import populate_database
+import question_dedup
+from db_connection import connect
+from main_quiz_admin import AdminPanel
+from question import Question
+from question_dedup import DuplicateIndex, question_signature
+
+LONG_TEXT = "Which keyword of the Python language starts the definition of a function that can be called later with arguments"
+
+
+def record(option_a):
+    return {'topic': "Topic A", 'question': LONG_TEXT, 'A': option_a, 'B': "class", 'C': "lambda", 'D': "func", 'E': "define", 'correct': "A"}
+
+
+def test_failed_insert_is_removed_from_index(bank_file):
+    conn = connect(bank_file)
+    conn.execute("CREATE TEMP TRIGGER reject BEFORE INSERT ON Questions WHEN NEW.option_a = 'rejected' "
+                 "BEGIN SELECT RAISE(ABORT, 'rejected by test'); END")
+    index = DuplicateIndex()
+    added, skipped, _ = populate_database.bulk_import_questions(conn, [record("rejected")], duplicate_index=index)
+    assert (added, skipped) == (0, 1)
+    assert len(index) == 0 # The row never made it into the table...
+    added, skipped, _ = populate_database.bulk_import_questions(conn, [record("def")], duplicate_index=index)
+    assert (added, skipped) == (1, 0) # ...so it does not make its near-duplicate a "duplicate"
+    conn.close()
+
+
+def test_admin_index_build_does_not_block_checks(db, monkeypatch):
+    panel = SimpleNamespace(db=db, duplicate_index=None, _duplicate_lock=threading.Lock(), _duplicate_pending=None)
+    panel._job_build_duplicate_index = lambda: AdminPanel._job_build_duplicate_index(panel)
+    question = Question.create(LONG_TEXT, ("def", "class", "lambda", "func", "define"), "A")
+    build = question_dedup.build_duplicate_index
+    def slow_build(conn):
+        index = build(conn)
+        # Meanwhile: a save checks for duplicates (must not wait for the build), then is recorded
+        assert AdminPanel._job_check_duplicates(panel, question, None)[0] == []
+        AdminPanel._update_duplicate_index(panel, 999, question_signature(question.text, question.options))
+        AdminPanel._update_duplicate_index(panel, 1) # And question 1 is deleted
+        return index
+    monkeypatch.setattr(question_dedup, "build_duplicate_index", slow_build)
+    panel._job_build_duplicate_index()
+    assert panel._duplicate_pending is None
+    assert 999 in panel.duplicate_index.signatures and 1 not in panel.duplicate_index.signatures
+    assert AdminPanel._job_check_duplicates(panel, question, None)[0][0][0] == 999
+
+
+def test_lookups_stay_bounded_among_look_alikes():
+    index = DuplicateIndex()
+    signatures = [question_signature(f"{LONG_TEXT} variant {i} of {i * 7}", ("def", "class", "lambda", "func", "define"))
+                  for i in range(2000)]
+    for key, signature in enumerate(signatures):
+        before = index.comparisons
+        matches = index.find_duplicates(signature)
+        assert index.comparisons - before <= index.bands * index.max_band_candidates
+        if not matches: index.add(key, signature)
+    assert len(index) > index.max_band_candidates # Many look-alikes share buckets...
+    before = index.comparisons
+    assert index.find_duplicates(signatures[0], first=True) # ...and a skip check stops at the first match
+    assert index.comparisons - before < index.bands * index.max_band_candidates
@@ -0,0 +1,38 @@
+import populate_database
+from conftest import create_bank
+from db_connection import connect
+from item_stats import fetch_item_stats
+from quiz_data import execute
+from quiz_engine import QuizSession
+
+
+def record_quiz(db, questions, answers):
+    session = QuizSession(questions)
+    for i, answer in enumerate(answers): session.current_index = i; session.check_answer(answer)
+    db.attempt_log.submit(session); db.attempt_log.flush()
+
+
+def test_stats_follow_their_question(db):
+    questions = db.question_cache.get_topic(1)[:3]
+    record_quiz(db, questions, "ABD") # Correct answers cycle A-E: the third answer is wrong
+    with db.reader() as conn:
+        assert [fetch_item_stats(conn, q.id).correct for q in questions] == [1, 1, 0]
+    with db.write() as conn: execute(conn, 'delete_question', (questions[0].id,))
+    with db.reader() as conn:
+        assert fetch_item_stats(conn, questions[0].id) is None
+        assert fetch_item_stats(conn, questions[1].id).responses == 1
+
+
+def test_rebuild_clears_history(tmp_path, monkeypatch):
+    db_file = create_bank(str(tmp_path / "rebuild.db"), topic_names=populate_database.TOPICS[:1])
+    from db_connection import DatabaseManager
+    db = DatabaseManager(db_file)
+    record_quiz(db, db.question_cache.get_topic(1)[:2], "AB")
+    db.close()
+    monkeypatch.setattr(populate_database, "ALL_QUESTIONS_DATA", populate_database.ALL_QUESTIONS_DATA[:3])
+    conn = connect(db_file)
+    populate_database.rebuild_questions(conn)
+    assert conn.execute("SELECT MIN(id) FROM Questions").fetchone()[0] == 1 # Ids start again...
+    assert fetch_item_stats(conn, 1) is None # ...but the old statistics are gone
+    assert conn.execute("SELECT COUNT(*) FROM Responses").fetchone()[0] == 0
+    conn.close()
@@ -0,0 +1,19 @@
+import pytest
+
+from question import Question, QuestionError
+
+
+def test_create_strips_and_normalises():
+    question = Question.create("  What? ", (" a", "b ", "c", "d", "e"), " c ")
+    assert question.text == "What?" and question.options[:2] == ("a", "b") and question.correct_answer == "C"
+
+
+@pytest.mark.parametrize("text, options, correct", [
+    (None, ("a", "b", "c", "d", "e"), "A"), # JSON null question
+    ("What?", ("a", None, "c", "d", "e"), "A"), # JSON null option
+    ("What?", ("a", "b", "c", "d", "e"), None),
+    ("What?", ("a", " ", "c", "d", "e"), "A"),
+])
+def test_create_rejects_missing_fields(text, options, correct):
+    with pytest.raises(QuestionError):
+        Question.create(text, options, correct)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from db_connection import connect
+from question_cache import QuestionCache
+
+
+def test_cache_hit_does_not_wait_for_writer(db):
+    cache = db.question_cache
+    cache.check_interval = 0; cache.get_topic(1) # Cached
+    writing = threading.Event(); done = threading.Event()
+    def long_write():
+        with db.write():
+            writing.set(); done.wait(5)
+    writer = threading.Thread(target=long_write); writer.start()
+    try:
+        writing.wait(5)
+        start = time.perf_counter()
+        assert len(cache.get_topic(1)) == 10
+        assert time.perf_counter() - start < 0.5
+    finally:
+        done.set(); writer.join()
+
+
+def test_external_write_clears_cache(db, bank_file):
+    cache = db.question_cache
+    cache.check_interval = 0
+    first = cache.get_topic(1)[0]
+    other = connect(bank_file)
+    with other: other.execute("UPDATE Questions SET question_text = 'Changed elsewhere' WHERE id = ?", (first.id,))
+    other.close()
+    assert cache.get_topic(1)[0].text == 'Changed elsewhere'
+
+
+def test_busy_writer_at_start_leaves_baseline_unset(db):
+    writing = threading.Event(); done = threading.Event()
+    def long_write():
+        with db.write():
+            writing.set(); done.wait(5)
+    writer = threading.Thread(target=long_write); writer.start()
+    try:
+        writing.wait(5)
+        cache = QuestionCache(db); cache.check_interval = 0
+        assert len(cache.get_topic(1)) == 10 and len(cache) == 0 # No baseline yet, so nothing is kept
+    finally:
+        done.set(); writer.join()
+    cache.get_topic(1); cache.get_topic(1)
+    assert len(cache) == 1 and cache.hits == 1 # The first value became the baseline without clearing anything
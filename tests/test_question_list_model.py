@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from main_quiz_admin import AdminPanel, QuestionListModel
+
+
+class ListboxStandIn:
+    """ Records the Tk listbox operations a patch performs """
+    def __init__(self, rows):
+        self.rows = list(rows); self.operations = 0
+
+    def insert(self, index, text):
+        self.rows.insert(index, text); self.operations += 1
+
+    def delete(self, index):
+        del self.rows[index]; self.operations += 1
+
+
+def loaded_panel(ids, complete=True):
+    model = QuestionListModel(); model.extend(ids); model.complete = complete
+    listbox = ListboxStandIn(AdminPanel._list_row_text(q_id, f"Question {q_id}") for q_id in ids)
+    return SimpleNamespace(list_model=model, question_listbox=listbox, _page_loading=False, _list_row_text=AdminPanel._list_row_text)
+
+
+def test_model_tracks_ids_in_order():
+    model = QuestionListModel(); model.extend([2, 5, 9])
+    assert model.last_id() == 9 and model.index_of(5) == 1 and model.index_of(4) is None
+    assert model.add(12) is None # Last page not loaded yet: the new row arrives with it
+    model.complete = True
+    assert model.add(12) == 3 and model.ids == [2, 5, 9, 12]
+    assert model.remove(5) == 1 and model.ids == [2, 9, 12]
+    assert model.remove(5) is None
+    model.clear()
+    assert model.ids == [] and not model.complete and model.last_id() == 0
+
+
+@pytest.mark.parametrize("size", [10, 100_000])
+def test_saving_patches_one_row_whatever_the_topic_size(size):
+    ids = list(range(1, size + 1))
+    panel = loaded_panel(ids)
+    edited = ids[size // 2]
+    AdminPanel._patch_saved_row(panel, edited, "Edited text", 1, edited)
+    assert panel.question_listbox.rows[size // 2] == f"{edited}: Edited text"
+    AdminPanel._patch_saved_row(panel, None, "New question", 1, size + 1)
+    assert panel.question_listbox.rows[-1] == f"{size + 1}: New question"
+    assert panel.question_listbox.operations == 3 # delete + insert for the edit, one insert for the new row
+    assert panel.list_model.ids == ids + [size + 1] and len(panel.question_listbox.rows) == size + 1
+
+
+def test_unchanged_or_unloaded_rows_are_not_touched():
+    panel = loaded_panel([1, 2, 3], complete=False)
+    AdminPanel._patch_saved_row(panel, 2, "No such row", 0, 2) # UPDATE matched nothing
+    AdminPanel._patch_saved_row(panel, None, "On a later page", 1, 4)
+    panel._page_loading = True; panel.list_model.complete = True
+    AdminPanel._patch_saved_row(panel, None, "In the page being fetched", 1, 5)
+    assert panel.question_listbox.operations == 0 and panel.list_model.ids == [1, 2, 3]
@@ -0,0 +1,63 @@
+import sqlite3
+
+from db_connection import connect
+from question_search import has_full_text_index, search_questions
+from quiz_data import reset_statement_stats, statement_stats
+from schema_migrations import LATEST_SCHEMA_VERSION, migrate
+
+
+class NoFTS5:
+    """ Connection wrapper behaving like an SQLite build without the FTS5 module """
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if "fts5" in sql: raise sqlite3.OperationalError("no such module: fts5")
+        return self.conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def without_fts(conn):
+    for name in ("questions_fts_insert", "questions_fts_delete", "questions_fts_update"):
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("DROP TABLE QuestionsFTS")
+    conn.execute("PRAGMA user_version = 2"); conn.commit()
+
+
+def test_full_text_index_is_retried_until_it_exists(bank_file):
+    conn = connect(bank_file)
+    without_fts(conn)
+    assert migrate(NoFTS5(conn)) == 2 # Later migrations re-run, but v3 is not recorded
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'ItemStats'").fetchone()[0] == 1
+    assert migrate(conn) == LATEST_SCHEMA_VERSION # FTS5 available now
+    assert has_full_text_index(conn) and len(search_questions(conn, "question")) > 0
+    conn.close()
+
+
+def test_like_fallback_matches_wildcards_literally(bank_file):
+    conn = connect(bank_file, row_factory=sqlite3.Row)
+    conn.execute("UPDATE Questions SET question_text = 'Is 100% of a_b enough?' WHERE id = 1")
+    without_fts(conn)
+    assert [row['id'] for row in search_questions(conn, "0%")] == [1]
+    assert [row['id'] for row in search_questions(conn, "a_b")] == [1]
+    assert search_questions(conn, "a%b") == [] # As a wildcard, % would match 'a_b'
+    conn.close()
+
+
+def test_like_fallback_matches_options(bank_file):
+    conn = connect(bank_file, row_factory=sqlite3.Row)
+    without_fts(conn)
+    assert [row['id'] for row in search_questions(conn, "Topic A 3 option C")] == [4] # conftest: option text only
+    topic_b = conn.execute("SELECT id FROM Topics WHERE name = 'Topic B'").fetchone()[0]
+    assert search_questions(conn, "Topic A 3 option C", topic_id=topic_b) == []
+    conn.close()
+
+
+def test_index_checked_once_per_search(bank_file):
+    conn = connect(bank_file)
+    reset_statement_stats()
+    search_questions(conn, "question", topic_id=1)
+    assert {stats.name: stats.calls for stats in statement_stats()}['full_text_index'] == 1
+    conn.close()
@@ -0,0 +1,32 @@
+import pytest
+
+from db_connection import connect
+from question_snapshot import HEADER, QuestionSnapshot, SnapshotError, export_snapshot
+
+
+@pytest.fixture
+def snapshot_file(bank_file, tmp_path):
+    conn = connect(bank_file)
+    path = str(tmp_path / "bank.qbs")
+    export_snapshot(conn, path)
+    conn.close()
+    return path
+
+
+def truncate(path, size):
+    with open(path, 'r+b') as f: f.truncate(size)
+
+
+def test_snapshot_round_trip(snapshot_file):
+    snapshot = QuestionSnapshot(snapshot_file)
+    topic = snapshot.topics()[0]
+    assert topic['name'] == "Topic A" and snapshot.get_topic(topic['id'])[-1].options[-1] == "Topic A 9 option E"
+    snapshot.close()
+
+
+@pytest.mark.parametrize("cut", [lambda size: size - 3, lambda size: HEADER.size + 8], ids=["blob", "record tables"])
+def test_truncated_snapshot_is_rejected(snapshot_file, cut):
+    with open(snapshot_file, 'rb') as f: size = len(f.read())
+    truncate(snapshot_file, cut(size))
+    with pytest.raises(SnapshotError, match="truncated"):
+        QuestionSnapshot(snapshot_file)
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from quiz_server import QuizService
+
+
+async def exchange(service, request):
+    """ Send raw request bytes to a running service; returns everything it answers before closing """
+    server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(request)
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+@pytest.fixture
+def service(bank_file):
+    quiz_service = QuizService(bank_file)
+    yield quiz_service
+    quiz_service.close()
+
+
+def test_topics(service):
+    response = asyncio.run(exchange(service, b"GET /topics HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200") and [topic['name'] for topic in json.loads(body)] == ["Topic A", "Topic B"]
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5", b"1_0"])
+def test_bad_content_length_gets_400(service, length):
+    request = b"POST /sessions HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}"
+    response = asyncio.run(exchange(service, request)) # Returns once the server closes the connection
+    assert response.startswith(b"HTTP/1.1 400") and b"Content-Length" in response
+
+
+@pytest.mark.parametrize("body", [b'{"topic_id": 1e400}', b'{"topic_id": 1000000000000000000000000000000}'])
+def test_unexpected_error_gets_500(service, body):
+    request = b"POST /sessions HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+    response = asyncio.run(exchange(service, request))
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 500") and json.loads(body) == {"error": "Internal server error."}
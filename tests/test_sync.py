@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+from db_connection import connect
+from populate_database import bulk_import_questions, sync_questions
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def source_record(text, option_a="Source option A"):
+    return {'topic': "Topic A", 'question': text, 'A': option_a, 'B': "b", 'C': "c", 'D': "d", 'E': "e", 'correct': "A"}
+
+
+def option_a(conn, text):
+    return conn.execute("SELECT option_a FROM Questions WHERE question_text = ?", (text,)).fetchall()
+
+
+def test_sync_leaves_admin_rows_alone(bank_file):
+    conn = connect(bank_file)
+    counts = sync_questions(conn, [source_record("Topic A question 0?"), source_record("Brand new?")])
+    assert counts['inserted'] == 1 and counts['adopted'] == 0 and counts['kept_unmanaged'] == 1
+    assert option_a(conn, "Topic A question 0?") == [("Topic A 0 option A",)] # Not overwritten, not duplicated
+    counts = sync_questions(conn, [source_record("Brand new?")])
+    assert counts['deleted'] == 0 and counts['unchanged'] == 1
+    assert conn.execute("SELECT COUNT(*) FROM Questions").fetchone()[0] == 21 # Admin rows missing from the source stay
+    conn.close()
+
+
+def test_forced_sync_adopts_matching_rows(bank_file):
+    conn = connect(bank_file)
+    counts = sync_questions(conn, [source_record("Topic A question 0?")], force=True)
+    assert counts['adopted'] == 1
+    assert option_a(conn, "Topic A question 0?") == [("Source option A",)]
+    conn.close()
+
+
+def test_sync_manages_imported_rows(bank_file):
+    conn = connect(bank_file)
+    records = [source_record("Imported one?"), source_record("Imported two?", "Other option A")]
+    assert bulk_import_questions(conn, records)[0] == 2
+    assert bulk_import_questions(conn, records)[0] == 0 # Already in the bank
+    counts = sync_questions(conn, records)
+    assert counts['unchanged'] == 2 and counts['inserted'] == 0 and counts['kept_unmanaged'] == 0
+    conn.close()
+
+
+def test_sync_rewording_keeps_row_id(bank_file):
+    conn = connect(bank_file)
+    sync_questions(conn, [source_record("Old wording?"), source_record("Unrelated?", "Other option A")])
+    (q_id,), = conn.execute("SELECT id FROM Questions WHERE question_text = 'Old wording?'").fetchall()
+    counts = sync_questions(conn, [source_record("New wording?"), source_record("Unrelated?", "Other option A")])
+    assert (counts['updated'], counts['deleted'], counts['inserted']) == (1, 0, 0)
+    assert conn.execute("SELECT id FROM Questions WHERE question_text = 'New wording?'").fetchall() == [(q_id,)]
+    counts = sync_questions(conn, [source_record("New wording?"), source_record("Unrelated?", "Other option A")])
+    assert counts['unchanged'] == 2
+    conn.close()
+
+
+def test_sync_and_import_cannot_be_combined(tmp_path):
+    result = subprocess.run([sys.executable, os.path.join(REPO_ROOT, "populate_database.py"), "--sync", "--import", "bank.csv"],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 2 and "cannot be combined" in result.stderr
@@ -0,0 +1,24 @@
+from main_quiz_admin import VIRTUAL_ROW_HEIGHT, VirtualRowLayout
+
+
+def test_estimated_layout():
+    layout = VirtualRowLayout(100)
+    assert layout.offsets[-1] == 100 * VIRTUAL_ROW_HEIGHT
+    assert list(layout.visible_range(0, 500)) == [0, 1, 2]
+    assert list(layout.visible_range(VIRTUAL_ROW_HEIGHT * 10 + 5, VIRTUAL_ROW_HEIGHT * 11)) == [10]
+    assert list(layout.visible_range(VIRTUAL_ROW_HEIGHT * 99, VIRTUAL_ROW_HEIGHT * 120)) == [99]
+
+
+def test_measured_rows_push_later_rows_down():
+    layout = VirtualRowLayout(10, estimate=100)
+    assert layout.set_height(1, 400) # A long question wraps onto many lines
+    assert not layout.set_height(2, 100) # Already the estimate
+    assert layout.measured == {1, 2}
+    assert layout.offsets[:4] == [0, 100, 500, 600] and layout.offsets[-1] == 1300
+    assert list(layout.visible_range(150, 450)) == [1] # All of the view is row 1, nothing is clipped
+    assert list(layout.visible_range(450, 650)) == [1, 2, 3]
+
+
+def test_empty_layout():
+    layout = VirtualRowLayout(0)
+    assert layout.offsets == [0] and list(layout.visible_range(0, 500)) == []